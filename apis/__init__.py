@@ -1,8 +1,10 @@
 from . import (
     api_utils,
+    db_executor,
     global_db,
     interface,
     local_db,
+    local_library,
     playlist_interface,
     playlist_wrapper,
     spotify,
@@ -1,10 +1,12 @@
 import datetime
 import json
 import logging
+import struct
+import zlib
 from collections import namedtuple
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, MutableMapping, Optional, Union
+from typing import Callable, List, MutableMapping, Optional, Union
 
 import discord
 import lavalink
@@ -19,6 +21,58 @@ from ..utils import PlaylistScope
 log = logging.getLogger("red.cogs.Audio.api.utils")
 _ = Translator("Audio", Path(__file__))
 
+# Compressed rows of the lavalink table are stored as BLOBs starting with this marker,
+# followed by a single format version byte. Plain JSON text rows are still accepted.
+_LAVALINK_DATA_MARKER = b"\x00"
+LAVALINK_DATA_FORMAT_ZLIB = 1
+
+
+def encode_lavalink_data(data: str, version: int = LAVALINK_DATA_FORMAT_ZLIB) -> bytes:
+    """Compress the JSON text of a Lavalink LoadResult for storage."""
+    if version != LAVALINK_DATA_FORMAT_ZLIB:
+        raise ValueError(f"Unknown lavalink data format version: {version}")
+    return _LAVALINK_DATA_MARKER + bytes((version,)) + zlib.compress(data.encode("utf-8"), 6)
+
+
+def decode_lavalink_data(data: Union[str, bytes]) -> str:
+    """Return the JSON text of a stored Lavalink LoadResult, whatever its storage format."""
+    if isinstance(data, str):
+        return data
+    if data[:1] != _LAVALINK_DATA_MARKER:
+        return data.decode("utf-8")
+    version = data[1]
+    if version == LAVALINK_DATA_FORMAT_ZLIB:
+        return zlib.decompress(data[2:]).decode("utf-8")
+    raise ValueError(f"Unknown lavalink data format version: {version}")
+
+
+# Packed rows of the persist_queue table hold only the extras a row has no column for,
+# behind the same marker and version byte. The Lavalink track blob is already stored
+# in track_id, the voice channel in room_id and the enqueue time in time.
+_QUEUE_TRACK_MARKER = b"\x00"
+QUEUE_TRACK_FORMAT_PACKED = 1
+_QUEUE_TRACK_EXTRAS = struct.Struct(">Q")  # requester id, 0 when unknown
+
+
+def encode_queue_track(
+    requester: Optional[int], version: int = QUEUE_TRACK_FORMAT_PACKED
+) -> bytes:
+    """Pack the extras of a persisted queue track for storage."""
+    if version != QUEUE_TRACK_FORMAT_PACKED:
+        raise ValueError(f"Unknown queue track format version: {version}")
+    return _QUEUE_TRACK_MARKER + bytes((version,)) + _QUEUE_TRACK_EXTRAS.pack(int(requester or 0))
+
+
+def decode_queue_track(data: bytes) -> MutableMapping:
+    """Return the extras packed in a persisted queue track."""
+    if data[:1] != _QUEUE_TRACK_MARKER:
+        raise ValueError("Not a packed queue track")
+    version = data[1]
+    if version != QUEUE_TRACK_FORMAT_PACKED:
+        raise ValueError(f"Unknown queue track format version: {version}")
+    (requester,) = _QUEUE_TRACK_EXTRAS.unpack_from(data, 2)
+    return {"requester": requester} if requester else {}
+
 
 @dataclass
 class YouTubeCacheFetchResult:
@@ -40,6 +94,20 @@ class SpotifyCacheFetchResult:
             self.updated_on: datetime.datetime = datetime.datetime.fromtimestamp(self.last_updated)
 
 
+@dataclass
+class SpotifyPlaylistCacheFetchResult:
+    snapshot_id: str
+    tracks: List[MutableMapping]
+    last_updated: int
+
+    def __post_init__(self):
+        if isinstance(self.last_updated, int):
+            self.updated_on: datetime.datetime = datetime.datetime.fromtimestamp(self.last_updated)
+
+        if isinstance(self.tracks, bytes):
+            self.tracks = json.loads(zlib.decompress(self.tracks).decode("utf-8"))
+
+
 @dataclass
 class LavalinkCacheFetchResult:
     query: Optional[MutableMapping]
@@ -49,8 +117,8 @@ class LavalinkCacheFetchResult:
         if isinstance(self.last_updated, int):
             self.updated_on: datetime.datetime = datetime.datetime.fromtimestamp(self.last_updated)
 
-        if isinstance(self.query, str):
-            self.query = json.loads(self.query)
+        if isinstance(self.query, (str, bytes)):
+            self.query = json.loads(decode_lavalink_data(self.query))
 
 
 @dataclass
@@ -59,9 +127,9 @@ class LavalinkCacheFetchForGlobalResult:
     data: MutableMapping
 
     def __post_init__(self):
-        if isinstance(self.data, str):
-            self.data_string = str(self.data)
-            self.data = json.loads(self.data)
+        if isinstance(self.data, (str, bytes)):
+            self.data_string = decode_lavalink_data(self.data)
+            self.data = json.loads(self.data_string)
 
 
 @dataclass
@@ -82,14 +150,34 @@ class PlaylistFetchResult:
 class QueueFetchResult:
     guild_id: int
     room_id: int
-    track: dict = field(default_factory=lambda: {})
-    track_object: lavalink.Track = None
-
-    def __post_init__(self):
-        if isinstance(self.track, str):
-            self.track = json.loads(self.track)
-        if self.track:
-            self.track_object = lavalink.Track(self.track)
+    track: Union[str, bytes, dict] = field(default_factory=lambda: {})
+    track_id: Optional[str] = None
+    time: int = 0
+    decode_track: Optional[Callable[[str], MutableMapping]] = field(
+        default=None, repr=False, compare=False
+    )
+    _track_object: Optional[lavalink.Track] = field(default=None, init=False, repr=False)
+
+    @property
+    def track_object(self) -> Optional[lavalink.Track]:
+        """The queued track, only decoded the first time it is used.
+
+        Packed rows are rebuilt from ``track_id`` with ``decode_track``,
+        which restores every ``info`` field Lavalink encodes in the track.
+        """
+        if self._track_object is None and self.track:
+            if isinstance(self.track, bytes):
+                data = self.decode_track(self.track_id)
+                data["extras"] = {
+                    "enqueue_time": self.time,
+                    "vc": self.room_id,
+                    **decode_queue_track(self.track),
+                }
+                self.track = data
+            elif isinstance(self.track, str):
+                self.track = json.loads(self.track)
+            self._track_object = lavalink.Track(self.track)
+        return self._track_object
 
 
 def standardize_scope(scope: str) -> str:
@@ -0,0 +1,128 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import logging
+from pathlib import Path
+
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Tuple, Union
+
+from redbot.core.i18n import Translator
+from redbot.core.utils.dbtools import APSWConnectionWrapper
+
+from ..errors import DatabaseError
+from ..sql_statements import PRAGMA_WAL_CHECKPOINT
+
+log = logging.getLogger("red.cogs.Audio.api.DatabaseExecutor")
+_ = Translator("Audio", Path(__file__))
+
+Bindings = Optional[Union[Mapping[str, Any], Tuple[Any, ...]]]
+
+_DELETE_CHUNK_SIZE = 500
+
+
+class DatabaseExecutor:
+    """Serialises all access to the Audio database through one long-lived worker thread.
+
+    Every table wrapper shares a single instance of this class,
+    so statements are never run on the event loop and never spawn their own threads.
+    """
+
+    def __init__(self, conn: APSWConnectionWrapper):
+        self.connection = conn
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="Audio-DB"
+        )
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable in the database worker and await its result."""
+        if self._closed:
+            raise DatabaseError("The database executor has been closed.")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def _execute(self, statement: str, values: Bindings = None) -> None:
+        self.connection.cursor().execute(statement, values)
+
+    def _executemany(self, statement: str, values: Iterable[Bindings]) -> None:
+        with self.connection.transaction() as transaction:
+            transaction.executemany(statement, values)
+
+    def _execute_batch(self, batches: List[Tuple[str, Iterable[Bindings]]]) -> None:
+        with self.connection.transaction() as transaction:
+            for statement, values in batches:
+                transaction.executemany(statement, values)
+
+    def _execute_changes(self, statement: str, values: Bindings = None) -> int:
+        self.connection.cursor().execute(statement, values)
+        return self.connection.changes()
+
+    def _fetchone(self, statement: str, values: Bindings = None) -> Optional[Tuple]:
+        return self.connection.cursor().execute(statement, values).fetchone()
+
+    def _fetchall(self, statement: str, values: Bindings = None) -> List[Tuple]:
+        return self.connection.cursor().execute(statement, values).fetchall()
+
+    async def execute(self, statement: str, values: Bindings = None) -> None:
+        """Execute a statement that does not return rows."""
+        await self.run(self._execute, statement, values)
+
+    async def execute_changes(self, statement: str, values: Bindings = None) -> int:
+        """Execute a statement and return how many rows it inserted, updated or deleted."""
+        return await self.run(self._execute_changes, statement, values)
+
+    async def executemany(self, statement: str, values: Iterable[Bindings]) -> None:
+        """Execute a statement once per set of bindings inside a single transaction.
+
+        ``values`` is consumed in the worker thread, so it may be a lazy iterable.
+        """
+        await self.run(self._executemany, statement, values)
+
+    async def execute_batch(self, batches: Iterable[Tuple[str, Iterable[Bindings]]]) -> None:
+        """Run several ``executemany`` calls inside one transaction, in the order given."""
+        await self.run(self._execute_batch, list(batches))
+
+    async def fetchone(self, statement: str, values: Bindings = None) -> Optional[Tuple]:
+        """Execute a statement and return its first row."""
+        return await self.run(self._fetchone, statement, values)
+
+    async def fetchall(self, statement: str, values: Bindings = None) -> List[Tuple]:
+        """Execute a statement and return every row."""
+        return await self.run(self._fetchall, statement, values)
+
+    async def delete_chunked(
+        self,
+        statement: str,
+        values: Optional[Mapping[str, Any]] = None,
+        chunk_size: int = _DELETE_CHUNK_SIZE,
+    ) -> int:
+        """Run a ``DELETE ... LIMIT :limit`` statement until it stops removing rows.
+
+        Every chunk is its own short transaction, so other statements are not held up
+        behind one long write lock. Returns the number of rows deleted.
+        """
+        values = {**(values or {}), "limit": chunk_size}
+        deleted = 0
+        while True:
+            changes = await self.run(self._execute_changes, statement, values)
+            deleted += changes
+            if changes < chunk_size:
+                return deleted
+
+    async def checkpoint(self) -> Optional[Tuple]:
+        """Checkpoint the write-ahead log into the database file and truncate it."""
+        return await self.run(self._fetchone, PRAGMA_WAL_CHECKPOINT)
+
+    async def close(self) -> None:
+        """Wait for pending statements, then close the connection and stop the worker."""
+        if self._closed:
+            return
+        with contextlib.suppress(Exception):
+            await self.run(self.connection.close)
+        self._closed = True
+        self._executor.shutdown(wait=False)
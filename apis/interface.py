@@ -8,7 +8,18 @@ import time
 
 from collections import namedtuple
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable, List, MutableMapping, Optional, Tuple, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+from urllib.parse import parse_qsl
 
 import aiohttp
 import discord
@@ -20,15 +31,16 @@ from redbot.core.bot import Red
 from redbot.core.commands import Cog, Context
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
-from redbot.core.utils.dbtools import APSWConnectionWrapper
 
 from ..audio_dataclasses import Query
 from ..audio_logging import IS_DEBUG, debug_exc_log
 from ..errors import DatabaseError, SpotifyFetchError, TrackEnqueueError, YouTubeApiError
-from ..utils import CacheLevel, Notifier
+from ..utils import CacheLevel, Notifier, ordered_map
 from .api_utils import LavalinkCacheFetchForGlobalResult
+from .db_executor import DatabaseExecutor
 from .global_db import GlobalCacheWrapper
 from .local_db import LocalCacheWrapper
+from .local_library import LocalLibraryIndex
 from .persist_queue_wrapper import QueueInterface
 from .playlist_interface import get_playlist
 from .playlist_wrapper import PlaylistWrapper
@@ -41,6 +53,12 @@ if TYPE_CHECKING:
 _ = Translator("Audio", Path(__file__))
 log = logging.getLogger("red.cogs.Audio.api.AudioAPIInterface")
 _TOP_100_US = "https://www.youtube.com/playlist?list=PL4fGSI1pDJn5rWitrRWFKdm-ulaFiIyoK"
+# Number of Spotify tracks whose cached YouTube URLs are looked up in one query.
+_SPOTIFY_PAGE_SIZE = 100
+# Number of Spotify playlist pages fetched at once.
+_SPOTIFY_PAGE_CONCURRENCY = 5
+# Attempts made at each Spotify playlist page before the whole load fails.
+_SPOTIFY_PAGE_ATTEMPTS = 3
 # TODO: Get random from global Cache
 
 
@@ -55,7 +73,7 @@ class AudioAPIInterface:
         bot: Red,
         config: Config,
         session: aiohttp.ClientSession,
-        conn: APSWConnectionWrapper,
+        conn: DatabaseExecutor,
         cog: Union["Audio", Cog],
     ):
         self.bot = bot
@@ -67,18 +85,29 @@ class AudioAPIInterface:
         self.local_cache_api = LocalCacheWrapper(self.bot, self.config, self.conn, self.cog)
         self.global_cache_api = GlobalCacheWrapper(self.bot, self.config, session, self.cog)
         self.persistent_queue_api = QueueInterface(self.bot, self.config, self.conn, self.cog)
+        self.local_library_api = LocalLibraryIndex(self.bot, self.config, self.conn, self.cog)
         self._session: aiohttp.ClientSession = session
         self._tasks: MutableMapping = {}
         self._lock: asyncio.Lock = asyncio.Lock()
+        self._inflight_loads: MutableMapping[Tuple[str, bool], asyncio.Future] = {}
+        self.coalesced_loads: int = 0
 
     async def initialize(self) -> None:
         """Initialises the Local Cache connection."""
         await self.local_cache_api.lavalink.init()
         await self.persistent_queue_api.init()
+        await self.local_library_api.init()
+        await self.local_cache_api.negative.load()
+        self.local_cache_api.write_queue.start()
+        self.local_library_api.start()
+        self.local_cache_api.lavalink.compression = await self.config.cache_compression()
+        if self.local_cache_api.lavalink.compression:
+            self.local_cache_api.lavalink.start_compression_migration()
 
-    def close(self) -> None:
+    async def close(self) -> None:
         """Closes the Local Cache connection."""
-        self.local_cache_api.lavalink.close()
+        await self.local_library_api.close()
+        await self.local_cache_api.lavalink.close()
 
     async def get_random_track_from_db(self, tries=0) -> Optional[MutableMapping]:
         """Get a random track from the local database and return it."""
@@ -88,7 +117,7 @@ class AudioAPIInterface:
             date = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=7)
             date_timestamp = int(date.timestamp())
             query_data["day"] = date_timestamp
-            max_age = await self.config.cache_age()
+            max_age = (await self.cog.get_global_settings()).cache_age
             maxage = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(
                 days=max_age
             )
@@ -118,23 +147,7 @@ class AudioAPIInterface:
 
         if not data:
             return
-        if action_type == "insert" and isinstance(data, list):
-            for table, d in data:
-                if table == "lavalink":
-                    await self.local_cache_api.lavalink.insert(d)
-                elif table == "youtube":
-                    await self.local_cache_api.youtube.insert(d)
-                elif table == "spotify":
-                    await self.local_cache_api.spotify.insert(d)
-        elif action_type == "update" and isinstance(data, dict):
-            for table, d in data:
-                if table == "lavalink":
-                    await self.local_cache_api.lavalink.update(data)
-                elif table == "youtube":
-                    await self.local_cache_api.youtube.update(data)
-                elif table == "spotify":
-                    await self.local_cache_api.spotify.update(data)
-        elif action_type == "global" and isinstance(data, list):
+        if action_type == "global" and isinstance(data, list):
             await asyncio.gather(*[self.global_cache_api.update_global(**d) for d in data])
 
     async def run_tasks(self, ctx: Optional[commands.Context] = None, message_id=None) -> None:
@@ -169,10 +182,10 @@ class AudioAPIInterface:
             if IS_DEBUG:
                 log.debug("Running pending writes to database")
             try:
-                tasks: MutableMapping = {"update": [], "insert": [], "global": []}
+                tasks: MutableMapping = {"global": []}
                 async for k, task in AsyncIter(self._tasks.items()):
                     async for t, args in AsyncIter(task.items()):
-                        tasks[t].append(args)
+                        tasks[t].extend(args)
                 self._tasks = {}
                 coro_tasks = [self.route_tasks(a, tasks[a]) for a in tasks]
 
@@ -183,12 +196,23 @@ class AudioAPIInterface:
             else:
                 if IS_DEBUG:
                     log.debug("Completed pending writes to database have finished")
+            await self.local_cache_api.write_queue.close()
 
     def append_task(self, ctx: commands.Context, event: str, task: Tuple, _id: int = None) -> None:
-        """Add a task to the cache to be run later."""
+        """Add a task to the cache to be run later.
+
+        Local cache writes go straight to the shared write-behind queue,
+        only global API updates are kept per message.
+        """
+        if event == "insert":
+            self.local_cache_api.write_queue.insert(*task)
+            return
+        elif event == "update":
+            self.local_cache_api.write_queue.update(*task)
+            return
         lock_id = _id or ctx.message.id
         if lock_id not in self._tasks:
-            self._tasks[lock_id] = {"update": [], "insert": [], "global": []}
+            self._tasks[lock_id] = {"global": []}
         self._tasks[lock_id][event].append(task)
 
     async def fetch_spotify_query(
@@ -212,78 +236,101 @@ class AudioAPIInterface:
         youtube_cache = CacheLevel.set_youtube().is_subset(current_cache_level)
         youtube_api_error = None
         global_api = self.cog.global_api_user.get("can_read")
-        async for track in AsyncIter(tracks):
+        valid_tracks = []
+        for track in tracks:
             if isinstance(track, str):
                 break
             elif isinstance(track, dict) and track.get("error", {}).get("message") == "invalid id":
                 continue
-            (
-                song_url,
-                track_info,
-                uri,
-                artist_name,
-                track_name,
-                _id,
-                _type,
-            ) = await self.spotify_api.get_spotify_track_info(track, ctx)
+            valid_tracks.append(track)
 
-            database_entries.append(
-                {
-                    "id": _id,
-                    "type": _type,
-                    "uri": uri,
-                    "track_name": track_name,
-                    "artist_name": artist_name,
-                    "song_url": song_url,
-                    "track_info": track_info,
-                    "last_updated": time_now,
-                    "last_fetched": time_now,
-                }
-            )
-            if skip_youtube is False:
-                val = None
-                if youtube_cache:
-                    try:
-                        (val, last_update) = await self.local_cache_api.youtube.fetch_one(
-                            {"track": track_info}
-                        )
-                    except Exception as exc:
-                        debug_exc_log(
-                            log, exc, "Failed to fetch %r from YouTube table", track_info
-                        )
+        async def resolve_track(
+            item: Tuple[Tuple[str, ...], Optional[str]],
+        ) -> Tuple[MutableMapping, Optional[str], Optional[str]]:
+            """Returns the database entry, the matched URL and any YouTube API error."""
+            (track_data, val) = item
+            (song_url, track_info, track_uri, artist_name, track_name, _id, _type) = track_data
+            database_entry = {
+                "id": _id,
+                "type": _type,
+                "uri": track_uri,
+                "track_name": track_name,
+                "artist_name": artist_name,
+                "song_url": song_url,
+                "track_info": track_info,
+                "last_updated": time_now,
+                "last_fetched": time_now,
+            }
+            if skip_youtube is not False:
+                return database_entry, track_info, None
+            if val is None:
+                try:
+                    val = await self.fetch_youtube_query(
+                        ctx, track_info, current_cache_level=current_cache_level
+                    )
+                except YouTubeApiError as err:
+                    return database_entry, None, err.message
+            if youtube_cache and val:
+                task = ("update", ("youtube", {"track": track_info}))
+                self.append_task(ctx, *task)
+            return database_entry, val, None
 
-                if val is None:
-                    try:
-                        val = await self.fetch_youtube_query(
-                            ctx, track_info, current_cache_level=current_cache_level
-                        )
-                    except YouTubeApiError as err:
-                        val = None
-                        youtube_api_error = err.message
-                if youtube_cache and val:
-                    task = ("update", ("youtube", {"track": track_info}))
-                    self.append_task(ctx, *task)
+        # Tracks are resolved concurrently but handled here strictly in playlist order.
+        resolved_tracks = ordered_map(
+            resolve_track,
+            self._iter_spotify_track_info(
+                ctx, valid_tracks, youtube_cache=youtube_cache and skip_youtube is False
+            ),
+            (await self.cog.get_global_settings()).spotify_resolve_concurrency,
+        )
+        try:
+            async for database_entry, val, track_api_error in resolved_tracks:
+                database_entries.append(database_entry)
+                if track_api_error:
+                    youtube_api_error = track_api_error
                 if val:
                     youtube_urls.append(val)
-            else:
-                youtube_urls.append(track_info)
-            track_count += 1
-            if notifier is not None and ((track_count % 2 == 0) or (track_count == total_tracks)):
-                await notifier.notify_user(current=track_count, total=total_tracks, key="youtube")
-            if notifier is not None and (youtube_api_error and not global_api):
-                error_embed = discord.Embed(
-                    colour=await ctx.embed_colour(),
-                    title=_("Failing to get tracks, skipping remaining."),
-                )
-                await notifier.update_embed(error_embed)
-                break
-            elif notifier is not None and (youtube_api_error and global_api):
-                continue
+                track_count += 1
+                if notifier is not None and (
+                    (track_count % 2 == 0) or (track_count == total_tracks)
+                ):
+                    await notifier.notify_user(
+                        current=track_count, total=total_tracks, key="youtube"
+                    )
+                if notifier is not None and (youtube_api_error and not global_api):
+                    error_embed = discord.Embed(
+                        colour=await ctx.embed_colour(),
+                        title=_("Failing to get tracks, skipping remaining."),
+                    )
+                    await notifier.update_embed(error_embed)
+                    break
+        finally:
+            await resolved_tracks.aclose()
         if CacheLevel.set_spotify().is_subset(current_cache_level):
             task = ("insert", ("spotify", database_entries))
             self.append_task(ctx, *task)
         return youtube_urls
 
+    async def _iter_spotify_track_info(
+        self, ctx: commands.Context, tracks: List[MutableMapping], youtube_cache: bool
+    ) -> AsyncIterator[Tuple[Tuple[str, ...], Optional[str]]]:
+        """Yield the track info of each Spotify track along with its cached YouTube URL.
+
+        The YouTube table is queried once per page of tracks rather than once per track.
+        """
+        for start in range(0, len(tracks), _SPOTIFY_PAGE_SIZE):
+            page = [
+                await self.spotify_api.get_spotify_track_info(track, ctx)
+                for track in tracks[start : start + _SPOTIFY_PAGE_SIZE]
+            ]
+            cached_urls = {}
+            if youtube_cache:
+                cached_urls = await self.local_cache_api.youtube.fetch_many(
+                    track_data[1] for track_data in page
+                )
+            for track_data in page:
+                yield track_data, cached_urls.get(track_data[1])
+
     async def fetch_from_spotify_api(
         self,
         query_type: str,
@@ -295,6 +342,16 @@ class AudioAPIInterface:
     ) -> Union[List[MutableMapping], List[str]]:
         """Gets track info from spotify API."""
 
+        snapshot_id = None
+        if recursive is False and query_type != "track":
+            (snapshot_id, cached_tracks) = await self._fetch_cached_spotify_tracks(query_type, uri)
+            if cached_tracks is not None:
+                if notifier:
+                    await notifier.notify_user(
+                        current=len(cached_tracks), total=len(cached_tracks), key="spotify"
+                    )
+                return cached_tracks
+
         if recursive is False:
             (call, params) = self.spotify_api.spotify_format_call(query_type, uri)
             results = await self.spotify_api.make_get_call(call, params)
@@ -319,39 +376,145 @@ class AudioAPIInterface:
             return results
         tracks = []
         track_count = 0
+        # Items seen, including unavailable tracks, to tell whether every page was read
+        item_count = 0
         total_tracks = results.get("tracks", results).get("total", 1)
-        while True:
-            new_tracks: List = []
+
+        def page_tracks(page: MutableMapping) -> List[MutableMapping]:
             if query_type == "track":
-                new_tracks = results
-                tracks.append(new_tracks)
-            elif query_type == "album":
-                tracks_raw = results.get("tracks", results).get("items", [])
-                if tracks_raw:
-                    new_tracks = tracks_raw
-                    tracks.extend(new_tracks)
-            else:
-                tracks_raw = results.get("tracks", results).get("items", [])
-                if tracks_raw:
-                    new_tracks = [k["track"] for k in tracks_raw if k.get("track")]
-                    tracks.extend(new_tracks)
+                return [page]
+            tracks_raw = page.get("tracks", page).get("items", [])
+            if query_type == "album":
+                return tracks_raw
+            return [k["track"] for k in tracks_raw if k.get("track")]
+
+        async def add_page(page: MutableMapping) -> None:
+            nonlocal track_count, item_count
+            item_count += len(page.get("tracks", page).get("items", [page]))
+            new_tracks = page_tracks(page)
+            tracks.extend(new_tracks)
             track_count += len(new_tracks)
             if notifier:
                 await notifier.notify_user(current=track_count, total=total_tracks, key="spotify")
-            try:
-                if results.get("next") is not None:
-                    results = await self.fetch_from_spotify_api(
-                        query_type, uri, results["next"], params, notifier=notifier
-                    )
-                    continue
-                else:
-                    break
-            except KeyError:
-                raise SpotifyFetchError(
-                    _("This doesn't seem to be a valid Spotify playlist/album URL or code.")
+
+        await add_page(results)
+        next_page = results.get("tracks", results).get("next")
+        if query_type == "track" or next_page is None:
+            await self._finish_spotify_tracks(
+                query_type, uri, snapshot_id, tracks, item_count, total_tracks, ctx
+            )
+            return tracks
+
+        # Every remaining offset is known from the first page, so the remaining pages
+        # are fetched concurrently and then added in order.
+        (page_call, __, page_query) = next_page.partition("?")
+        page_params = dict(parse_qsl(page_query))
+        try:
+            limit = int(page_params["limit"])
+            offsets = range(int(page_params["offset"]), total_tracks, max(limit, 1))
+        except (KeyError, ValueError):
+            raise SpotifyFetchError(
+                _("This doesn't seem to be a valid Spotify playlist/album URL or code.")
+            )
+
+        async def fetch_page(offset: int) -> MutableMapping:
+            # A failed page must not leave a hole in the middle of the track list
+            for attempt in range(_SPOTIFY_PAGE_ATTEMPTS):
+                if attempt:
+                    await asyncio.sleep(attempt)
+                page = await self.fetch_from_spotify_api(
+                    query_type, uri, page_call, dict(page_params, offset=offset)
                 )
+                if "items" in page.get("tracks", page):
+                    return page
+            raise SpotifyFetchError(
+                _("Spotify did not return every track of this playlist, please try again later.")
+            )
+
+        pages = ordered_map(fetch_page, offsets, _SPOTIFY_PAGE_CONCURRENCY)
+        try:
+            async for page in pages:
+                await add_page(page)
+        finally:
+            await pages.aclose()
+        await self._finish_spotify_tracks(
+            query_type, uri, snapshot_id, tracks, item_count, total_tracks, ctx
+        )
         return tracks
 
+    async def _finish_spotify_tracks(
+        self,
+        query_type: str,
+        uri: str,
+        snapshot_id: Optional[str],
+        tracks: List[MutableMapping],
+        item_count: int,
+        total_tracks: int,
+        ctx: Optional[Context],
+    ) -> None:
+        """Cache a complete track list, or tell the user that only part of it was loaded."""
+        if query_type == "track" or item_count >= total_tracks:
+            self._cache_spotify_tracks(query_type, uri, snapshot_id, tracks)
+            return
+        log.debug(
+            "Spotify returned %d of %d items for %s:%s, not caching it",
+            item_count,
+            total_tracks,
+            query_type,
+            uri,
+        )
+        if ctx is not None:
+            await self.cog.send_embed_msg(
+                ctx,
+                title=_("Playlist Partially Loaded"),
+                description=_(
+                    "Spotify only returned {num} of {total} tracks, the rest will be missing."
+                ).format(num=item_count, total=total_tracks),
+            )
+
+    async def _fetch_cached_spotify_tracks(
+        self, query_type: str, uri: str
+    ) -> Tuple[Optional[str], Optional[List[MutableMapping]]]:
+        """Return the current snapshot id of a playlist or album and its cached tracks.
+
+        Albums never change, so they share an empty snapshot id and only expire with the cache age.
+        The snapshot id is ``None`` when the Spotify cache is disabled or it could not be fetched.
+        """
+        current_cache_level = CacheLevel((await self.cog.get_global_settings()).cache_level)
+        if not CacheLevel.set_spotify().is_subset(current_cache_level):
+            return None, None
+        if query_type == "album":
+            snapshot_id = ""
+        else:
+            snapshot_id = await self.spotify_api.get_playlist_snapshot_id(uri)
+            if snapshot_id is None:
+                return None, None
+        cache_uri = f"spotify:{query_type}:{uri}"
+        try:
+            tracks = await self.local_cache_api.spotify_playlist.fetch_one(cache_uri, snapshot_id)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to fetch '%s' from Spotify playlist table", cache_uri)
+            tracks = None
+        if tracks is not None:
+            self.local_cache_api.write_queue.update("spotify_playlist", {"uri": cache_uri})
+        return snapshot_id, tracks
+
+    def _cache_spotify_tracks(
+        self, query_type: str, uri: str, snapshot_id: Optional[str], tracks: List[MutableMapping]
+    ) -> None:
+        """Queue the tracks of a playlist or album to be cached under ``snapshot_id``."""
+        if snapshot_id is None or not tracks:
+            return
+        time_now = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
+        entry = {
+            "uri": f"spotify:{query_type}:{uri}",
+            "snapshot_id": snapshot_id,
+            "tracks": tracks,
+            "last_updated": time_now,
+            "last_fetched": time_now,
+        }
+        self.local_cache_api.write_queue.insert("spotify_playlist", [entry])
+
     async def spotify_query(
         self,
         ctx: commands.Context,
@@ -379,7 +542,7 @@ class AudioAPIInterface:
         List[str]
             List of Youtube URLs.
         """
-        current_cache_level = CacheLevel(await self.config.cache_level())
+        current_cache_level = CacheLevel((await self.cog.get_global_settings()).cache_level)
         cache_enabled = CacheLevel.set_spotify().is_subset(current_cache_level)
         if query_type == "track" and cache_enabled:
             try:
@@ -422,6 +585,7 @@ class AudioAPIInterface:
         notifier: Optional[Notifier] = None,
         forced: bool = False,
         query_global: bool = True,
+        first_track: Optional[asyncio.Event] = None,
     ) -> List[lavalink.Track]:
         """Queries the Database then falls back to Spotify and YouTube APIs then Enqueued matched
         tracks.
@@ -446,28 +610,33 @@ class AudioAPIInterface:
             Whether or not to query the global API.
         forced: bool
             Ignore Cache and make a fetch from API.
+        first_track: asyncio.Event
+            Set as soon as the first track has been enqueued.
         Returns
         -------
         List[str]
             List of Youtube URLs.
         """
         await self.global_cache_api._get_api_key()
-        globaldb_toggle = self.cog.global_api_user.get("can_read")
-        global_entry = globaldb_toggle and query_global
         track_list: List = []
         has_not_allowed = False
-        youtube_api_error = None
-        skip_youtube_api = False
+        enqueued_tracks = 0
+        pending_enqueue: List[lavalink.Track] = []
+
+        def dispatch_enqueued() -> None:
+            if pending_enqueue:
+                self.bot.dispatch(
+                    "red_audio_tracks_enqueue", player.guild, list(pending_enqueue), ctx.author
+                )
+                pending_enqueue.clear()
+
         try:
-            current_cache_level = CacheLevel(await self.config.cache_level())
-            guild_data = await self.config.guild(ctx.guild).all()
-            enqueued_tracks = 0
-            consecutive_fails = 0
+            guild_data = await self.cog.get_guild_settings(ctx.guild.id)
             queue_dur = await self.cog.queue_duration(ctx)
             queue_total_duration = self.cog.format_time(queue_dur)
             before_queue_length = len(player.queue)
             tracks_from_spotify = await self.fetch_from_spotify_api(
-                query_type, uri, params=None, notifier=notifier
+                query_type, uri, params=None, notifier=notifier, ctx=ctx
             )
             total_tracks = len(tracks_from_spotify)
             if total_tracks < 1 and notifier is not None:
@@ -479,194 +648,81 @@ class AudioAPIInterface:
                 await notifier.update_embed(embed3)
 
                 return track_list
-            database_entries = []
-            time_now = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
-            youtube_cache = CacheLevel.set_youtube().is_subset(current_cache_level)
-            spotify_cache = CacheLevel.set_spotify().is_subset(current_cache_level)
-            async for track_count, track in AsyncIter(tracks_from_spotify).enumerate(start=1):
-                (
-                    song_url,
-                    track_info,
-                    uri,
-                    artist_name,
-                    track_name,
-                    _id,
-                    _type,
-                ) = await self.spotify_api.get_spotify_track_info(track, ctx)
-
-                database_entries.append(
-                    {
-                        "id": _id,
-                        "type": _type,
-                        "uri": uri,
-                        "track_name": track_name,
-                        "artist_name": artist_name,
-                        "song_url": song_url,
-                        "track_info": track_info,
-                        "last_updated": time_now,
-                        "last_fetched": time_now,
-                    }
-                )
-                val = None
-                llresponse = None
-                if youtube_cache:
-                    try:
-                        (val, last_updated) = await self.local_cache_api.youtube.fetch_one(
-                            {"track": track_info}
-                        )
-                    except Exception as exc:
-                        debug_exc_log(
-                            log, exc, "Failed to fetch %r from YouTube table", track_info
-                        )
-                should_query_global = globaldb_toggle and query_global and val is None
-                if should_query_global:
-                    llresponse = await self.global_cache_api.get_spotify(track_name, artist_name)
-                    if llresponse:
-                        if llresponse.get("loadType") == "V2_COMPACT":
-                            llresponse["loadType"] = "V2_COMPAT"
-                        llresponse = LoadResult(llresponse)
-                    val = llresponse or None
-                if val is None and not skip_youtube_api:
-                    try:
-                        val = await self.fetch_youtube_query(
-                            ctx, track_info, current_cache_level=current_cache_level
-                        )
-                    except YouTubeApiError as err:
-                        val = None
-                        youtube_api_error = err.message
-                        skip_youtube_api = True
-                if not youtube_api_error:
-                    if youtube_cache and val and llresponse is None:
-                        task = ("update", ("youtube", {"track": track_info}))
-                        self.append_task(ctx, *task)
-
-                    if isinstance(llresponse, LoadResult):
-                        track_object = llresponse.tracks
-                    elif val:
-                        result = None
-                        if should_query_global:
-                            llresponse = await self.global_cache_api.get_call(val)
-                            if llresponse:
-                                if llresponse.get("loadType") == "V2_COMPACT":
-                                    llresponse["loadType"] = "V2_COMPAT"
-                                llresponse = LoadResult(llresponse)
-                            result = llresponse or None
-                        if not result:
-                            try:
-                                (result, called_api) = await self.fetch_track(
-                                    ctx,
-                                    player,
-                                    Query.process_input(val, self.cog.local_folder_current_path),
-                                    forced=forced,
-                                    should_query_global=not should_query_global,
-                                )
-                            except (RuntimeError, aiohttp.ServerDisconnectedError):
-                                lock(ctx, False)
-                                error_embed = discord.Embed(
-                                    colour=await ctx.embed_colour(),
-                                    title=_(
-                                        "The connection was reset while loading the playlist."
-                                    ),
+            resolved_tracks = self.iter_spotify_tracks(
+                ctx,
+                tracks_from_spotify,
+                player,
+                notifier=notifier,
+                forced=forced,
+                query_global=query_global,
+            )
+            try:
+                async for single_track in resolved_tracks:
+                    query = Query.process_input(single_track, self.cog.local_folder_current_path)
+                    if not await self.cog.is_query_allowed(
+                        self.config,
+                        ctx,
+                        f"{single_track.title} {single_track.author} {single_track.uri} {query}",
+                        query_obj=query,
+                    ):
+                        has_not_allowed = True
+                        if IS_DEBUG:
+                            log.debug(
+                                "Query is not allowed in %r (%d)", ctx.guild.name, ctx.guild.id
+                            )
+                        continue
+                    track_list.append(single_track)
+                    if enqueue:
+                        if len(player.queue) >= 10000:
+                            continue
+                        if guild_data.maxlength > 0:
+                            if self.cog.is_track_length_allowed(
+                                single_track, guild_data.maxlength
+                            ):
+                                enqueued_tracks += 1
+                                single_track.extras.update(
+                                    {
+                                        "enqueue_time": int(time.time()),
+                                        "vc": player.channel.id,
+                                        "requester": ctx.author.id,
+                                        "persist_in_bulk": True,
+                                    }
                                 )
-                                if notifier is not None:
-                                    await notifier.update_embed(error_embed)
-                                break
-                            except asyncio.TimeoutError:
-                                lock(ctx, False)
-                                error_embed = discord.Embed(
-                                    colour=await ctx.embed_colour(),
-                                    title=_("Player timeout, skipping remaining tracks."),
+                                player.add(ctx.author, single_track)
+                                pending_enqueue.append(single_track)
+                                self.bot.dispatch(
+                                    "red_audio_track_enqueue",
+                                    player.guild,
+                                    single_track,
+                                    ctx.author,
                                 )
-                                if notifier is not None:
-                                    await notifier.update_embed(error_embed)
-                                break
-                        track_object = result.tracks
-                    else:
-                        track_object = []
-                else:
-                    track_object = []
-                if (track_count % 2 == 0) or (track_count == total_tracks):
-                    key = "lavalink"
-                    seconds = "???"
-                    second_key = None
-                    if notifier is not None:
-                        await notifier.notify_user(
-                            current=track_count,
-                            total=total_tracks,
-                            key=key,
-                            seconds_key=second_key,
-                            seconds=seconds,
-                        )
-
-                if (youtube_api_error and not global_entry) or consecutive_fails >= (
-                    20 if global_entry else 10
-                ):
-                    error_embed = discord.Embed(
-                        colour=await ctx.embed_colour(),
-                        title=_("Failing to get tracks, skipping remaining."),
-                    )
-                    if notifier is not None:
-                        await notifier.update_embed(error_embed)
-                    if youtube_api_error:
-                        lock(ctx, False)
-                        raise SpotifyFetchError(message=youtube_api_error)
-                    break
-                if not track_object:
-                    consecutive_fails += 1
-                    continue
-                consecutive_fails = 0
-                single_track = track_object[0]
-                query = Query.process_input(single_track, self.cog.local_folder_current_path)
-                if not await self.cog.is_query_allowed(
-                    self.config,
-                    ctx,
-                    f"{single_track.title} {single_track.author} {single_track.uri} {query}",
-                    query_obj=query,
-                ):
-                    has_not_allowed = True
-                    if IS_DEBUG:
-                        log.debug("Query is not allowed in %r (%d)", ctx.guild.name, ctx.guild.id)
-                    continue
-                track_list.append(single_track)
-                if enqueue:
-                    if len(player.queue) >= 10000:
-                        continue
-                    if guild_data["maxlength"] > 0:
-                        if self.cog.is_track_length_allowed(single_track, guild_data["maxlength"]):
+                        else:
                             enqueued_tracks += 1
                             single_track.extras.update(
                                 {
                                     "enqueue_time": int(time.time()),
                                     "vc": player.channel.id,
                                     "requester": ctx.author.id,
+                                    "persist_in_bulk": True,
                                 }
                             )
                             player.add(ctx.author, single_track)
+                            pending_enqueue.append(single_track)
                             self.bot.dispatch(
-                                "red_audio_track_enqueue",
-                                player.guild,
-                                single_track,
-                                ctx.author,
+                                "red_audio_track_enqueue", player.guild, single_track, ctx.author
                             )
-                    else:
-                        enqueued_tracks += 1
-                        single_track.extras.update(
-                            {
-                                "enqueue_time": int(time.time()),
-                                "vc": player.channel.id,
-                                "requester": ctx.author.id,
-                            }
-                        )
-                        player.add(ctx.author, single_track)
-                        self.bot.dispatch(
-                            "red_audio_track_enqueue",
-                            player.guild,
-                            single_track,
-                            ctx.author,
-                        )
+                        if len(pending_enqueue) >= _SPOTIFY_PAGE_SIZE:
+                            dispatch_enqueued()
 
-                    if not player.current:
-                        await player.play()
+                        if not player.current:
+                            # Persist the track before it starts, or it is never marked played
+                            dispatch_enqueued()
+                            await player.play()
+                        if first_track is not None and enqueued_tracks:
+                            first_track.set()
+            finally:
+                await resolved_tracks.aclose()
+            dispatch_enqueued()
             if enqueue and tracks_from_spotify:
                 if total_tracks > enqueued_tracks:
                     maxlength_msg = _(" {bad_tracks} tracks cannot be queued.").format(
@@ -682,7 +738,7 @@ class AudioAPIInterface:
                         num=enqueued_tracks, maxlength_msg=maxlength_msg
                     ),
                 )
-                if not guild_data["shuffle"] and queue_dur > 0:
+                if not guild_data.shuffle and queue_dur > 0:
                     embed.set_footer(
                         text=_(
                             "{time} until start of playlist"
@@ -703,17 +759,189 @@ class AudioAPIInterface:
                     )
                 )
             player.maybe_shuffle()
-
-            if spotify_cache:
-                task = ("insert", ("spotify", database_entries))
-                self.append_task(ctx, *task)
+        except asyncio.CancelledError:
+            if notifier is not None:
+                embed = discord.Embed(
+                    colour=await ctx.embed_colour(),
+                    title=_("Stopped loading the playlist."),
+                    description=_("Added {num} tracks to the queue.").format(num=enqueued_tracks),
+                )
+                await notifier.update_embed(embed)
+            raise
         except Exception as exc:
+            dispatch_enqueued()
             lock(ctx, False)
             raise exc
         finally:
             lock(ctx, False)
         return track_list
 
+    async def iter_spotify_tracks(
+        self,
+        ctx: commands.Context,
+        tracks_from_spotify: List[MutableMapping],
+        player: lavalink.Player,
+        notifier: Optional[Notifier] = None,
+        forced: bool = False,
+        query_global: bool = True,
+    ) -> AsyncIterator[lavalink.Track]:
+        """Match Spotify tracks to Lavalink tracks, yielding each match in playlist order.
+
+        Stops early once too many tracks in a row fail to match,
+        raises :class:`SpotifyFetchError` when the YouTube API is unusable.
+        """
+        globaldb_toggle = self.cog.global_api_user.get("can_read")
+        global_entry = globaldb_toggle and query_global
+        youtube_api_error = None
+        skip_youtube_api = False
+        consecutive_fails = 0
+        total_tracks = len(tracks_from_spotify)
+        current_cache_level = CacheLevel((await self.cog.get_global_settings()).cache_level)
+        database_entries = []
+        time_now = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
+        youtube_cache = CacheLevel.set_youtube().is_subset(current_cache_level)
+        spotify_cache = CacheLevel.set_spotify().is_subset(current_cache_level)
+
+        async def resolve_track(
+            item: Tuple[Tuple[str, ...], Optional[str]],
+        ) -> Tuple[MutableMapping, Tuple[lavalink.Track, ...], Optional[str], Optional[str]]:
+            """Returns the database entry, matched tracks, YouTube API error and stop reason."""
+            nonlocal skip_youtube_api
+            (track_data, val) = item
+            (song_url, track_info, track_uri, artist_name, track_name, _id, _type) = track_data
+            database_entry = {
+                "id": _id,
+                "type": _type,
+                "uri": track_uri,
+                "track_name": track_name,
+                "artist_name": artist_name,
+                "song_url": song_url,
+                "track_info": track_info,
+                "last_updated": time_now,
+                "last_fetched": time_now,
+            }
+            llresponse = None
+            known_miss = self.local_cache_api.negative.get("youtube", track_info)
+            should_query_global = (
+                globaldb_toggle and query_global and val is None and not known_miss
+            )
+            if should_query_global:
+                llresponse = await self.global_cache_api.get_spotify(track_name, artist_name)
+                if llresponse:
+                    if llresponse.get("loadType") == "V2_COMPACT":
+                        llresponse["loadType"] = "V2_COMPAT"
+                    llresponse = LoadResult(llresponse)
+                val = llresponse or None
+            if val is None and not skip_youtube_api:
+                try:
+                    val = await self.fetch_youtube_query(
+                        ctx, track_info, current_cache_level=current_cache_level
+                    )
+                except YouTubeApiError as err:
+                    skip_youtube_api = True
+                    return database_entry, (), err.message, None
+            if youtube_cache and val and llresponse is None:
+                task = ("update", ("youtube", {"track": track_info}))
+                self.append_task(ctx, *task)
+
+            if isinstance(llresponse, LoadResult):
+                return database_entry, llresponse.tracks, None, None
+            elif not val:
+                return database_entry, (), None, None
+            result = None
+            if should_query_global:
+                llresponse = await self.global_cache_api.get_call(val)
+                if llresponse:
+                    if llresponse.get("loadType") == "V2_COMPACT":
+                        llresponse["loadType"] = "V2_COMPAT"
+                    llresponse = LoadResult(llresponse)
+                result = llresponse or None
+            if not result:
+                try:
+                    (result, called_api) = await self.fetch_track(
+                        ctx,
+                        player,
+                        Query.process_input(val, self.cog.local_folder_current_path),
+                        forced=forced,
+                        should_query_global=not should_query_global,
+                    )
+                except (RuntimeError, aiohttp.ServerDisconnectedError):
+                    return (
+                        database_entry,
+                        (),
+                        None,
+                        _("The connection was reset while loading the playlist."),
+                    )
+                except asyncio.TimeoutError:
+                    return (
+                        database_entry,
+                        (),
+                        None,
+                        _("Player timeout, skipping remaining tracks."),
+                    )
+            return database_entry, result.tracks, None, None
+
+        # Tracks are resolved concurrently but handled here strictly in playlist order.
+        resolved_tracks = ordered_map(
+            resolve_track,
+            self._iter_spotify_track_info(ctx, tracks_from_spotify, youtube_cache=youtube_cache),
+            (await self.cog.get_global_settings()).spotify_resolve_concurrency,
+        )
+        track_count = 0
+        try:
+            async for (
+                database_entry,
+                track_object,
+                track_api_error,
+                stop_reason,
+            ) in resolved_tracks:
+                track_count += 1
+                database_entries.append(database_entry)
+                if stop_reason:
+                    error_embed = discord.Embed(colour=await ctx.embed_colour(), title=stop_reason)
+                    if notifier is not None:
+                        await notifier.update_embed(error_embed)
+                    break
+                if track_api_error and not youtube_api_error:
+                    youtube_api_error = track_api_error
+                if youtube_api_error:
+                    track_object = ()
+                if (track_count % 2 == 0) or (track_count == total_tracks):
+                    key = "lavalink"
+                    seconds = "???"
+                    second_key = None
+                    if notifier is not None:
+                        await notifier.notify_user(
+                            current=track_count,
+                            total=total_tracks,
+                            key=key,
+                            seconds_key=second_key,
+                            seconds=seconds,
+                        )
+
+                if (youtube_api_error and not global_entry) or consecutive_fails >= (
+                    20 if global_entry else 10
+                ):
+                    error_embed = discord.Embed(
+                        colour=await ctx.embed_colour(),
+                        title=_("Failing to get tracks, skipping remaining."),
+                    )
+                    if notifier is not None:
+                        await notifier.update_embed(error_embed)
+                    if youtube_api_error:
+                        raise SpotifyFetchError(message=youtube_api_error)
+                    break
+                if not track_object:
+                    consecutive_fails += 1
+                    continue
+                consecutive_fails = 0
+                yield track_object[0]
+        finally:
+            await resolved_tracks.aclose()
+            if spotify_cache and database_entries:
+                task = ("insert", ("spotify", database_entries))
+                self.append_task(ctx, *task)
+
     async def fetch_youtube_query(
         self,
         ctx: commands.Context,
@@ -721,7 +949,11 @@ class AudioAPIInterface:
         current_cache_level: CacheLevel = CacheLevel.all(),
     ) -> Optional[str]:
         """Call the Youtube API and returns the youtube URL that the query matched."""
+        if self.local_cache_api.negative.get("youtube", track_info):
+            return None
         track_url = await self.youtube_api.get_call(track_info)
+        if not track_url:
+            self.local_cache_api.negative.add("youtube", track_info, "NO_YOUTUBE_MATCH")
         if CacheLevel.set_youtube().is_subset(current_cache_level) and track_url:
             time_now = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
             task = (
@@ -745,7 +977,7 @@ class AudioAPIInterface:
         self, ctx: commands.Context, track_info: str
     ) -> Optional[str]:
         """Gets an YouTube URL from for the query."""
-        current_cache_level = CacheLevel(await self.config.cache_level())
+        current_cache_level = CacheLevel((await self.cog.get_global_settings()).cache_level)
         cache_enabled = CacheLevel.set_youtube().is_subset(current_cache_level)
         val = None
         if cache_enabled:
@@ -799,18 +1031,71 @@ class AudioAPIInterface:
         Tuple[lavalink.LoadResult, bool]
             Tuple with the Load result and whether or not the API was called.
         """
-        current_cache_level = CacheLevel(await self.config.cache_level())
-        cache_enabled = CacheLevel.set_lavalink().is_subset(current_cache_level)
-        val = None
         query = Query.process_input(query, self.cog.local_folder_current_path)
         query_string = str(query)
+        prefer_lyrics = await self.cog.get_lyrics_status(ctx)
+        if prefer_lyrics and query.is_youtube and query.is_search:
+            query_string = f"{query} - lyrics"
+        if forced or lazy or query.is_local:
+            return await self._load_track(
+                ctx, player, query, query_string, forced, lazy, should_query_global
+            )
+
+        # Concurrent lookups of the same query share a single load instead of each
+        # hitting the caches and the APIs on their own.
+        key = (query_string, should_query_global)
+        while (inflight := self._inflight_loads.get(key)) is not None:
+            try:
+                (results, called_api) = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The call we were waiting on was cancelled, join the next one or load it.
+            else:
+                self.coalesced_loads += 1
+                if IS_DEBUG:
+                    log.debug("Coalesced lookup of %r with an in-flight load", query_string)
+                return LoadResult(dict(results._raw)), False
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_loads[key] = future
+        try:
+            result = await self._load_track(
+                ctx, player, query, query_string, forced, lazy, should_query_global
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved in case nobody else was waiting on it.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight_loads.get(key) is future:
+                del self._inflight_loads[key]
+
+    async def _load_track(
+        self,
+        ctx: commands.Context,
+        player: lavalink.Player,
+        query: Query,
+        query_string: str,
+        forced: bool,
+        lazy: bool,
+        should_query_global: bool,
+    ) -> Tuple[LoadResult, bool]:
+        """Load ``query_string`` from the caches or the APIs, see :meth:`fetch_track`."""
+        current_cache_level = CacheLevel((await self.cog.get_global_settings()).cache_level)
+        cache_enabled = CacheLevel.set_lavalink().is_subset(current_cache_level)
+        val = None
         globaldb_toggle = self.cog.global_api_user.get("can_read")
         valid_global_entry = False
         results = None
         called_api = False
-        prefer_lyrics = await self.cog.get_lyrics_status(ctx)
-        if prefer_lyrics and query.is_youtube and query.is_search:
-            query_string = f"{query} - lyrics"
         if cache_enabled and not forced and not query.is_local:
             try:
                 (val, last_updated) = await self.local_cache_api.lavalink.fetch_one(
@@ -832,9 +1117,15 @@ class AudioAPIInterface:
                 called_api = False
             else:
                 val = None
+        negative_reason = None
+        if not val and not forced and not query.is_local:
+            negative_reason = self.local_cache_api.negative.get("lavalink", query_string)
+            if negative_reason and IS_DEBUG:
+                log.debug("Skipping %r, it recently failed with %s", query_string, negative_reason)
         if (
             globaldb_toggle
             and not val
+            and not negative_reason
             and should_query_global
             and not forced
             and not query.is_local
@@ -872,6 +1163,9 @@ class AudioAPIInterface:
                 # If cached value has an invalid entry make a new call so that it gets updated
                 results, called_api = await self.fetch_track(ctx, player, query, forced=True)
             valid_global_entry = False
+        elif negative_reason:
+            results = LoadResult({"loadType": negative_reason, "playlistInfo": {}, "tracks": []})
+            called_api = False
         else:
             if IS_DEBUG:
                 log.debug("Querying Lavalink api for %r", query_string)
@@ -885,6 +1179,13 @@ class AudioAPIInterface:
         if results is None:
             results = LoadResult({"loadType": "LOAD_FAILED", "playlistInfo": {}, "tracks": []})
             valid_global_entry = False
+        if called_api and not query.is_local:
+            if results.has_error:
+                self.local_cache_api.negative.add("lavalink", query_string, "LOAD_FAILED")
+            elif not results.tracks:
+                self.local_cache_api.negative.add("lavalink", query_string, "NO_MATCHES")
+            elif forced:
+                await self.local_cache_api.negative.discard("lavalink", query_string)
         update_global = (
             globaldb_toggle and not valid_global_entry and self.global_cache_api.has_api_key
         )
@@ -934,8 +1235,8 @@ class AudioAPIInterface:
 
     async def autoplay(self, player: lavalink.Player, playlist_api: PlaylistWrapper):
         """Enqueue a random track."""
-        autoplaylist = await self.config.guild(player.guild).autoplaylist()
-        current_cache_level = CacheLevel(await self.config.cache_level())
+        autoplaylist = (await self.cog.get_guild_settings(player.guild.id)).autoplaylist
+        current_cache_level = CacheLevel((await self.cog.get_global_settings()).cache_level)
         cache_enabled = CacheLevel.set_lavalink().is_subset(current_cache_level)
         notify_channel_id = player.fetch("notify_channel")
         playlist = None
@@ -1017,10 +1318,12 @@ class AudioAPIInterface:
                 await self.config.guild_from_id(
                     guild_id=player.guild.id
                 ).currently_auto_playing_in.set([notify_channel_id, player.channel.id])
+                self.cog.invalidate_settings_cache(player.guild.id)
             else:
                 await self.config.guild_from_id(
                     guild_id=player.guild.id
                 ).currently_auto_playing_in.set([])
+                self.cog.invalidate_settings_cache(player.guild.id)
             if not player.current:
                 await player.play()
 
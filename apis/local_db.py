@@ -1,46 +1,83 @@
-import concurrent
+import asyncio
 import contextlib
 import datetime
+import json
 import logging
 import random
 import time
+import zlib
 from pathlib import Path
 
 from types import SimpleNamespace
-from typing import TYPE_CHECKING, Callable, List, MutableMapping, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from redbot.core import Config
 from redbot.core.bot import Red
 from redbot.core.commands import Cog
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
-from redbot.core.utils.dbtools import APSWConnectionWrapper
 
-from ..audio_logging import debug_exc_log
+from ..audio_logging import IS_DEBUG, debug_exc_log
 from ..sql_statements import (
     LAVALINK_CREATE_INDEX,
     LAVALINK_CREATE_TABLE,
+    LAVALINK_CREATE_TIME_INDEXES,
     LAVALINK_DELETE_OLD_ENTRIES,
     LAVALINK_FETCH_ALL_ENTRIES_GLOBAL,
+    LAVALINK_FETCH_UNCOMPRESSED,
     LAVALINK_QUERY,
     LAVALINK_QUERY_ALL,
+    LAVALINK_QUERY_MANY,
     LAVALINK_QUERY_LAST_FETCHED_RANDOM,
+    LAVALINK_QUERY_LAST_FETCHED_RANDOM_FALLBACK,
+    LAVALINK_QUERY_ROWID_BOUNDS,
     LAVALINK_UPDATE,
+    LAVALINK_UPDATE_DATA,
     LAVALINK_UPSERT,
+    NEGATIVE_CACHE_CREATE_TABLE,
+    NEGATIVE_CACHE_DELETE,
+    NEGATIVE_CACHE_DELETE_ALL,
+    NEGATIVE_CACHE_DELETE_EXPIRED,
+    NEGATIVE_CACHE_QUERY_ALL,
+    NEGATIVE_CACHE_UPSERT,
     SPOTIFY_CREATE_INDEX,
     SPOTIFY_CREATE_TABLE,
+    SPOTIFY_CREATE_TIME_INDEXES,
+    SPOTIFY_CREATE_URI_INDEX,
     SPOTIFY_DELETE_OLD_ENTRIES,
+    SPOTIFY_PLAYLIST_CREATE_TABLE,
+    SPOTIFY_PLAYLIST_DELETE_OLD_ENTRIES,
+    SPOTIFY_PLAYLIST_QUERY,
+    SPOTIFY_PLAYLIST_UPDATE,
+    SPOTIFY_PLAYLIST_UPSERT,
     SPOTIFY_QUERY,
     SPOTIFY_QUERY_ALL,
+    SPOTIFY_QUERY_MANY,
     SPOTIFY_QUERY_LAST_FETCHED_RANDOM,
+    SPOTIFY_QUERY_LAST_FETCHED_RANDOM_FALLBACK,
+    SPOTIFY_QUERY_ROWID_BOUNDS,
     SPOTIFY_UPDATE,
     SPOTIFY_UPSERT,
     YOUTUBE_CREATE_INDEX,
     YOUTUBE_CREATE_TABLE,
+    YOUTUBE_CREATE_TIME_INDEXES,
     YOUTUBE_DELETE_OLD_ENTRIES,
     YOUTUBE_QUERY,
     YOUTUBE_QUERY_ALL,
+    YOUTUBE_QUERY_MANY,
     YOUTUBE_QUERY_LAST_FETCHED_RANDOM,
+    YOUTUBE_QUERY_LAST_FETCHED_RANDOM_FALLBACK,
+    YOUTUBE_QUERY_ROWID_BOUNDS,
     YOUTUBE_UPDATE,
     YOUTUBE_UPSERT,
     PRAGMA_FETCH_user_version,
@@ -49,12 +86,16 @@ from ..sql_statements import (
     PRAGMA_SET_temp_store,
     PRAGMA_SET_user_version,
 )
+from ..utils import LRUCache, task_callback
 from .api_utils import (
     LavalinkCacheFetchForGlobalResult,
     LavalinkCacheFetchResult,
     SpotifyCacheFetchResult,
+    SpotifyPlaylistCacheFetchResult,
     YouTubeCacheFetchResult,
+    encode_lavalink_data,
 )
+from .db_executor import DatabaseExecutor
 
 if TYPE_CHECKING:
     from .. import Audio
@@ -62,13 +103,44 @@ if TYPE_CHECKING:
 
 log = logging.getLogger("red.cogs.Audio.api.LocalDB")
 _ = Translator("Audio", Path(__file__))
+
+# Random cache picks: single rowid probes, then probes over windows of rowids
+_RANDOM_PROBES = 16
+_RANDOM_WINDOW = 1000
+_RANDOM_WINDOW_PROBES = 4
+
 _SCHEMA_VERSION = 3
+# Unique columns of each table, used to coalesce pending upserts of the same row.
+_TABLE_KEYS = {
+    "lavalink": ("query",),
+    "youtube": ("track_info", "track_url"),
+    "spotify": ("id", "type", "uri"),
+    "spotify_playlist": ("uri",),
+    "negative": ("source", "query"),
+}
+# How long, in seconds, each kind of failed lookup is remembered before retrying it.
+_NEGATIVE_CACHE_TTL = {
+    "LOAD_FAILED": 120,
+    "NO_MATCHES": 1800,
+    "NO_YOUTUBE_MATCH": 3600,
+}
+
+
+def _trim_spotify_track(track: MutableMapping) -> MutableMapping:
+    if not isinstance(track, dict) or "error" in track:
+        return track
+    return {
+        "name": track.get("name"),
+        "artists": [{"name": artist.get("name")} for artist in track.get("artists", [])[:1]],
+        "external_urls": {"spotify": track.get("external_urls", {}).get("spotify")},
+        "uri": track.get("uri"),
+        "id": track.get("id"),
+        "type": track.get("type"),
+    }
 
 
 class BaseWrapper:
-    def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
-    ):
+    def __init__(self, bot: Red, config: Config, conn: DatabaseExecutor, cog: Union["Audio", Cog]):
         self.bot = bot
         self.config = config
         self.database = conn
@@ -80,68 +152,88 @@ class BaseWrapper:
         self.statement.get_user_version = PRAGMA_FETCH_user_version
         self.fetch_result: Optional[Callable] = None
         self.cog = cog
+        # Column used to look an entry up, and the matching column in upserted rows.
+        self.lookup_key: Optional[str] = None
+        self.row_key: Optional[str] = None
+        self.front_cache: LRUCache = LRUCache()
 
     async def init(self) -> None:
         """Initialize the local cache"""
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(self.database.cursor().execute, self.statement.pragma_temp_store)
-            executor.submit(self.database.cursor().execute, self.statement.pragma_journal_mode)
-            executor.submit(self.database.cursor().execute, self.statement.pragma_read_uncommitted)
-            executor.submit(self.maybe_migrate)
-            executor.submit(self.database.cursor().execute, LAVALINK_CREATE_TABLE)
-            executor.submit(self.database.cursor().execute, LAVALINK_CREATE_INDEX)
-            executor.submit(self.database.cursor().execute, YOUTUBE_CREATE_TABLE)
-            executor.submit(self.database.cursor().execute, YOUTUBE_CREATE_INDEX)
-            executor.submit(self.database.cursor().execute, SPOTIFY_CREATE_TABLE)
-            executor.submit(self.database.cursor().execute, SPOTIFY_CREATE_INDEX)
-            await self.clean_up_old_entries()
-
-    def close(self) -> None:
+        await self.database.execute(self.statement.pragma_temp_store)
+        await self.database.execute(self.statement.pragma_journal_mode)
+        await self.database.execute(self.statement.pragma_read_uncommitted)
+        await self.maybe_migrate()
+        await self.database.execute(LAVALINK_CREATE_TABLE)
+        await self.database.execute(LAVALINK_CREATE_INDEX)
+        await self.database.execute(LAVALINK_CREATE_TIME_INDEXES)
+        await self.database.execute(YOUTUBE_CREATE_TABLE)
+        await self.database.execute(YOUTUBE_CREATE_INDEX)
+        await self.database.execute(YOUTUBE_CREATE_TIME_INDEXES)
+        await self.database.execute(SPOTIFY_CREATE_TABLE)
+        await self.database.execute(SPOTIFY_CREATE_INDEX)
+        await self.database.execute(SPOTIFY_CREATE_TIME_INDEXES)
+        await self.database.execute(SPOTIFY_CREATE_URI_INDEX)
+        await self.database.execute(SPOTIFY_PLAYLIST_CREATE_TABLE)
+        await self.database.execute(NEGATIVE_CACHE_CREATE_TABLE)
+        await self.clean_up_old_entries()
+
+    async def close(self) -> None:
         """Close the connection with the local cache"""
         with contextlib.suppress(Exception):
-            self.database.close()
+            await self.database.close()
 
-    async def clean_up_old_entries(self) -> None:
-        """Delete entries older than x in the local cache tables"""
-        max_age = await self.config.cache_age()
+    async def clean_up_old_entries(self) -> int:
+        """Delete entries older than x in the local cache tables, returning how many were removed"""
+        max_age = (await self.cog.get_global_settings()).cache_age
         maxage = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(days=max_age)
         maxage_int = int(time.mktime(maxage.timetuple()))
         values = {"maxage": maxage_int}
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(self.database.cursor().execute, LAVALINK_DELETE_OLD_ENTRIES, values)
-            executor.submit(self.database.cursor().execute, YOUTUBE_DELETE_OLD_ENTRIES, values)
-            executor.submit(self.database.cursor().execute, SPOTIFY_DELETE_OLD_ENTRIES, values)
+        deleted = 0
+        try:
+            deleted += await self.database.delete_chunked(LAVALINK_DELETE_OLD_ENTRIES, values)
+            deleted += await self.database.delete_chunked(YOUTUBE_DELETE_OLD_ENTRIES, values)
+            deleted += await self.database.delete_chunked(SPOTIFY_DELETE_OLD_ENTRIES, values)
+            deleted += await self.database.delete_chunked(
+                SPOTIFY_PLAYLIST_DELETE_OLD_ENTRIES, values
+            )
+            deleted += await self.database.delete_chunked(
+                NEGATIVE_CACHE_DELETE_EXPIRED, {"now": int(time.time())}
+            )
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to clean up old entries from database")
+        return deleted
 
-    def maybe_migrate(self) -> None:
+    async def maybe_migrate(self) -> None:
         """Maybe migrate Database schema for the local cache"""
         current_version = 0
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [executor.submit(self.database.cursor().execute, self.statement.get_user_version)]
-            ):
-                try:
-                    row_result = future.result()
-                    current_version = row_result.fetchone()
-                    break
-                except Exception as exc:
-                    debug_exc_log(log, exc, "Failed to completed fetch from database")
-            if isinstance(current_version, tuple):
-                current_version = current_version[0]
-            if current_version == _SCHEMA_VERSION:
-                return
-            executor.submit(
-                self.database.cursor().execute,
-                self.statement.set_user_version,
-                {"version": _SCHEMA_VERSION},
-            )
+        try:
+            current_version = await self.database.fetchone(self.statement.get_user_version)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to completed fetch from database")
+        if isinstance(current_version, tuple):
+            current_version = current_version[0]
+        if current_version == _SCHEMA_VERSION:
+            return
+        await self.database.execute(self.statement.set_user_version, {"version": _SCHEMA_VERSION})
+
+    def encode_row(self, row: MutableMapping) -> MutableMapping:
+        """Convert a row to its storage format, this runs in the database worker"""
+        return row
+
+    def invalidate(self, values: Iterable[MutableMapping]) -> None:
+        """Drop upserted rows from the in-memory front cache"""
+        if self.row_key is None:
+            return
+        for entry in values:
+            self.front_cache.pop(entry.get(self.row_key))
 
     async def insert(self, values: List[MutableMapping]) -> None:
         """Insert an entry into the local cache"""
         try:
-            with self.database.transaction() as transaction:
-                transaction.executemany(self.statement.upsert, values)
+            await self.database.executemany(self.statement.upsert, map(self.encode_row, values))
         except Exception as exc:
             debug_exc_log(log, exc, "Error during table insert")
+        self.invalidate(values)
 
     async def update(self, values: MutableMapping) -> None:
         """Update an entry of the local cache"""
@@ -149,36 +241,86 @@ class BaseWrapper:
         try:
             time_now = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
             values["last_fetched"] = time_now
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                executor.submit(self.database.cursor().execute, self.statement.update, values)
+            await self.database.execute(self.statement.update, values)
         except Exception as exc:
             debug_exc_log(log, exc, "Error during table update")
 
+    async def _get_maxage(self) -> int:
+        """Timestamp before which cached entries are considered stale"""
+        max_age = (await self.cog.get_global_settings()).cache_age
+        maxage = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(days=max_age)
+        return int(time.mktime(maxage.timetuple()))
+
     async def _fetch_one(
         self, values: MutableMapping
     ) -> Optional[
-        Union[LavalinkCacheFetchResult, SpotifyCacheFetchResult, YouTubeCacheFetchResult]
+        Union[
+            LavalinkCacheFetchResult,
+            SpotifyCacheFetchResult,
+            SpotifyPlaylistCacheFetchResult,
+            YouTubeCacheFetchResult,
+        ]
     ]:
         """Get an entry from the local cache"""
-        max_age = await self.config.cache_age()
-        maxage = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(days=max_age)
-        maxage_int = int(time.mktime(maxage.timetuple()))
+        maxage_int = await self._get_maxage()
         values.update({"maxage": maxage_int})
+        key = values.get(self.lookup_key) if self.lookup_key else None
+        if key is not None:
+            cached = self.front_cache.get(key)
+            if cached is not None:
+                if cached.last_updated > maxage_int:
+                    return cached
+                self.front_cache.pop(key)
         row = None
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [executor.submit(self.database.cursor().execute, self.statement.get_one, values)]
-            ):
-                try:
-                    row_result = future.result()
-                    row = row_result.fetchone()
-                except Exception as exc:
-                    debug_exc_log(log, exc, "Failed to completed fetch from database")
+        try:
+            row = await self.database.fetchone(self.statement.get_one, values)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to completed fetch from database")
         if not row:
             return None
         if self.fetch_result is None:
             return None
-        return self.fetch_result(*row)
+        result = self.fetch_result(*row)
+        if key is not None:
+            size = sum(len(column) for column in row if isinstance(column, (str, bytes)))
+            self.front_cache.put(key, result, size=size)
+        return result
+
+    async def _fetch_many(
+        self, keys: Iterable[str]
+    ) -> Dict[
+        str, Union[LavalinkCacheFetchResult, SpotifyCacheFetchResult, YouTubeCacheFetchResult]
+    ]:
+        """Get the entries for several lookup keys from the local cache with a single query"""
+        output = {}
+        if self.fetch_result is None:
+            return output
+        maxage_int = await self._get_maxage()
+        missing = []
+        for key in dict.fromkeys(keys):
+            cached = self.front_cache.get(key)
+            if cached is not None:
+                if cached.last_updated > maxage_int:
+                    output[key] = cached
+                    continue
+                self.front_cache.pop(key)
+            missing.append(key)
+        if not missing:
+            return output
+        row_result = []
+        try:
+            row_result = await self.database.fetchall(
+                self.statement.get_many, {"keys": json.dumps(missing), "maxage": maxage_int}
+            )
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to completed fetch from database")
+        for key, *row in row_result:
+            if key in output:
+                continue
+            result = output[key] = self.fetch_result(*row)
+            size = sum(len(column) for column in row if isinstance(column, (str, bytes)))
+            self.front_cache.put(key, result, size=size)
+        return output
 
     async def _fetch_all(
         self, values: MutableMapping
@@ -188,18 +330,36 @@ class BaseWrapper:
         row_result = []
         if self.fetch_result is None:
             return []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [executor.submit(self.database.cursor().execute, self.statement.get_all, values)]
-            ):
-                try:
-                    row_result = future.result()
-                except Exception as exc:
-                    debug_exc_log(log, exc, "Failed to completed fetch from database")
+        try:
+            row_result = await self.database.fetchall(self.statement.get_all, values)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to completed fetch from database")
         async for row in AsyncIter(row_result):
             output.append(self.fetch_result(*row))
         return output
 
+    def _sample_random(self, values: MutableMapping) -> Optional[Tuple]:
+        """Pick a qualifying row by seeking to random rowids.
+
+        Single rowid probes are retried on a miss, which is uniform over the qualifying rows.
+        When they keep missing, rows are chosen from bounded rowid windows instead;
+        that favours rows in sparsely populated windows, but never scans more than a window.
+        If the windows miss as well, a random offset into the ``last_fetched`` index is used,
+        so a row is always returned when one qualifies.
+        """
+        cursor = self.database.connection.cursor()
+        low, high = cursor.execute(self.statement.get_rowid_bounds).fetchone()
+        if low is None:
+            return None
+        for window in (1,) * _RANDOM_PROBES + (_RANDOM_WINDOW,) * _RANDOM_WINDOW_PROBES:
+            start = random.randint(low - window + 1, high)
+            rows = cursor.execute(
+                self.statement.get_random, dict(values, rowid=start, window=window)
+            ).fetchall()
+            if rows:
+                return random.choice(rows)
+        return cursor.execute(self.statement.get_random_fallback, values).fetchone()
+
     async def _fetch_random(
         self, values: MutableMapping
     ) -> Optional[
@@ -207,23 +367,10 @@ class BaseWrapper:
     ]:
         """Get a random entry from the local cache"""
         row = None
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [
-                    executor.submit(
-                        self.database.cursor().execute, self.statement.get_random, values
-                    )
-                ]
-            ):
-                try:
-                    row_result = future.result()
-                    rows = row_result.fetchall()
-                    if rows:
-                        row = random.choice(rows)
-                    else:
-                        row = None
-                except Exception as exc:
-                    debug_exc_log(log, exc, "Failed to completed random fetch from database")
+        try:
+            row = await self.database.run(self._sample_random, values)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to completed random fetch from database")
         if not row:
             return None
         if self.fetch_result is None:
@@ -232,16 +379,20 @@ class BaseWrapper:
 
 
 class YouTubeTableWrapper(BaseWrapper):
-    def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
-    ):
+    def __init__(self, bot: Red, config: Config, conn: DatabaseExecutor, cog: Union["Audio", Cog]):
         super().__init__(bot, config, conn, cog)
         self.statement.upsert = YOUTUBE_UPSERT
         self.statement.update = YOUTUBE_UPDATE
         self.statement.get_one = YOUTUBE_QUERY
         self.statement.get_all = YOUTUBE_QUERY_ALL
+        self.statement.get_many = YOUTUBE_QUERY_MANY
         self.statement.get_random = YOUTUBE_QUERY_LAST_FETCHED_RANDOM
+        self.statement.get_random_fallback = YOUTUBE_QUERY_LAST_FETCHED_RANDOM_FALLBACK
+        self.statement.get_rowid_bounds = YOUTUBE_QUERY_ROWID_BOUNDS
         self.fetch_result = YouTubeCacheFetchResult
+        self.lookup_key = "track"
+        self.row_key = "track_info"
+        self.front_cache = LRUCache(max_entries=10000, max_bytes=4 * 1024 * 1024)
 
     async def fetch_one(
         self, values: MutableMapping
@@ -252,6 +403,13 @@ class YouTubeTableWrapper(BaseWrapper):
             return None, None
         return result.query, result.updated_on
 
+    async def fetch_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Get several entries from the Youtube table, keyed by track info"""
+        results = await self._fetch_many(keys)
+        return {
+            key: result.query for key, result in results.items() if isinstance(result.query, str)
+        }
+
     async def fetch_all(self, values: MutableMapping) -> List[YouTubeCacheFetchResult]:
         """Get all entries from the Youtube table"""
         result = await self._fetch_all(values)
@@ -268,16 +426,20 @@ class YouTubeTableWrapper(BaseWrapper):
 
 
 class SpotifyTableWrapper(BaseWrapper):
-    def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
-    ):
+    def __init__(self, bot: Red, config: Config, conn: DatabaseExecutor, cog: Union["Audio", Cog]):
         super().__init__(bot, config, conn, cog)
         self.statement.upsert = SPOTIFY_UPSERT
         self.statement.update = SPOTIFY_UPDATE
         self.statement.get_one = SPOTIFY_QUERY
         self.statement.get_all = SPOTIFY_QUERY_ALL
+        self.statement.get_many = SPOTIFY_QUERY_MANY
         self.statement.get_random = SPOTIFY_QUERY_LAST_FETCHED_RANDOM
+        self.statement.get_random_fallback = SPOTIFY_QUERY_LAST_FETCHED_RANDOM_FALLBACK
+        self.statement.get_rowid_bounds = SPOTIFY_QUERY_ROWID_BOUNDS
         self.fetch_result = SpotifyCacheFetchResult
+        self.lookup_key = "uri"
+        self.row_key = "uri"
+        self.front_cache = LRUCache(max_entries=10000, max_bytes=4 * 1024 * 1024)
 
     async def fetch_one(
         self, values: MutableMapping
@@ -288,6 +450,13 @@ class SpotifyTableWrapper(BaseWrapper):
             return None, None
         return result.query, result.updated_on
 
+    async def fetch_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Get several entries from the Spotify table, keyed by URI"""
+        results = await self._fetch_many(keys)
+        return {
+            key: result.query for key, result in results.items() if isinstance(result.query, str)
+        }
+
     async def fetch_all(self, values: MutableMapping) -> List[SpotifyCacheFetchResult]:
         """Get all entries from the Spotify table"""
         result = await self._fetch_all(values)
@@ -303,19 +472,106 @@ class SpotifyTableWrapper(BaseWrapper):
         return result.query
 
 
+class SpotifyPlaylistTableWrapper(BaseWrapper):
+    """Track lists of Spotify playlists and albums, keyed by URI and playlist snapshot."""
+
+    def __init__(self, bot: Red, config: Config, conn: DatabaseExecutor, cog: Union["Audio", Cog]):
+        super().__init__(bot, config, conn, cog)
+        self.statement.upsert = SPOTIFY_PLAYLIST_UPSERT
+        self.statement.update = SPOTIFY_PLAYLIST_UPDATE
+        self.statement.get_one = SPOTIFY_PLAYLIST_QUERY
+        self.fetch_result = SpotifyPlaylistCacheFetchResult
+        self.lookup_key = "uri"
+        self.row_key = "uri"
+        self.front_cache = LRUCache(max_entries=50, max_bytes=8 * 1024 * 1024)
+
+    def encode_row(self, row: MutableMapping) -> MutableMapping:
+        """Trim the tracks down to the fields Audio uses and compress them"""
+        tracks = [_trim_spotify_track(track) for track in row["tracks"]]
+        return dict(row, tracks=zlib.compress(json.dumps(tracks).encode("utf-8"), 6))
+
+    async def fetch_one(self, uri: str, snapshot_id: str) -> Optional[List[MutableMapping]]:
+        """Get the tracks of a Spotify playlist or album, if they were cached at ``snapshot_id``"""
+        result = await self._fetch_one({"uri": uri})
+        if not result or result.snapshot_id != snapshot_id or not isinstance(result.tracks, list):
+            return None
+        return list(result.tracks)
+
+
 class LavalinkTableWrapper(BaseWrapper):
-    def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
-    ):
+    def __init__(self, bot: Red, config: Config, conn: DatabaseExecutor, cog: Union["Audio", Cog]):
         super().__init__(bot, config, conn, cog)
         self.statement.upsert = LAVALINK_UPSERT
         self.statement.update = LAVALINK_UPDATE
         self.statement.get_one = LAVALINK_QUERY
         self.statement.get_all = LAVALINK_QUERY_ALL
+        self.statement.get_many = LAVALINK_QUERY_MANY
         self.statement.get_random = LAVALINK_QUERY_LAST_FETCHED_RANDOM
+        self.statement.get_random_fallback = LAVALINK_QUERY_LAST_FETCHED_RANDOM_FALLBACK
+        self.statement.get_rowid_bounds = LAVALINK_QUERY_ROWID_BOUNDS
         self.statement.get_all_global = LAVALINK_FETCH_ALL_ENTRIES_GLOBAL
         self.fetch_result = LavalinkCacheFetchResult
         self.fetch_for_global: Optional[Callable] = LavalinkCacheFetchForGlobalResult
+        self.lookup_key = "query"
+        self.row_key = "query"
+        self.front_cache = LRUCache(max_entries=2000, max_bytes=32 * 1024 * 1024)
+        self.statement.get_uncompressed = LAVALINK_FETCH_UNCOMPRESSED
+        self.statement.update_data = LAVALINK_UPDATE_DATA
+        self.compression = True
+        self._compression_task: Optional[asyncio.Task] = None
+
+    def encode_row(self, row: MutableMapping) -> MutableMapping:
+        """Compress the data column of a row if compression is enabled"""
+        if self.compression and isinstance(row.get("data"), str):
+            row = dict(row, data=encode_lavalink_data(row["data"]))
+        return row
+
+    def _compress_chunk(self, last_rowid: int, chunk_size: int) -> Tuple[int, int]:
+        connection = self.database.connection
+        rows = (
+            connection.cursor()
+            .execute(self.statement.get_uncompressed, {"rowid": last_rowid, "limit": chunk_size})
+            .fetchall()
+        )
+        if not rows:
+            return last_rowid, 0
+        with connection.transaction() as transaction:
+            transaction.executemany(
+                self.statement.update_data,
+                ({"rowid": rowid, "data": encode_lavalink_data(data)} for rowid, data in rows),
+            )
+        return rows[-1][0], len(rows)
+
+    async def compress_existing_entries(self, chunk_size: int = 100, delay: float = 1.0) -> None:
+        """Recompress plain JSON rows in small chunks, yielding to other queries in between"""
+        last_rowid = 0
+        total = 0
+        while self.compression:
+            try:
+                last_rowid, count = await self.database.run(
+                    self._compress_chunk, last_rowid, chunk_size
+                )
+            except Exception as exc:
+                debug_exc_log(log, exc, "Failed to compress Lavalink cache entries")
+                break
+            if not count:
+                break
+            total += count
+            await asyncio.sleep(delay)
+        if total:
+            log.info("Compressed %d existing Lavalink cache entries", total)
+
+    def start_compression_migration(self) -> None:
+        """Start recompressing existing entries in the background"""
+        if self._compression_task is None or self._compression_task.done():
+            self._compression_task = asyncio.create_task(self.compress_existing_entries())
+            self._compression_task.add_done_callback(task_callback)
+
+    async def close(self) -> None:
+        """Close the connection with the local cache"""
+        if self._compression_task is not None:
+            self._compression_task.cancel()
+        await super().close()
 
     async def fetch_one(
         self, values: MutableMapping
@@ -324,7 +580,18 @@ class LavalinkTableWrapper(BaseWrapper):
         result = await self._fetch_one(values)
         if not result or not isinstance(result.query, dict):
             return None, None
-        return result.query, result.updated_on
+        # The parsed entry is shared through the front cache, callers mutate the top level keys.
+        return dict(result.query), result.updated_on
+
+    async def fetch_many(self, keys: Iterable[str]) -> Dict[str, MutableMapping]:
+        """Get several entries from the Lavalink table, keyed by query"""
+        results = await self._fetch_many(keys)
+        # Copies for the same reason as in fetch_one.
+        return {
+            key: dict(result.query)
+            for key, result in results.items()
+            if isinstance(result.query, dict)
+        }
 
     async def fetch_all(self, values: MutableMapping) -> List[LavalinkCacheFetchResult]:
         """Get all entries from the Lavalink table"""
@@ -346,29 +613,245 @@ class LavalinkTableWrapper(BaseWrapper):
         row_result = []
         if self.fetch_for_global is None:
             return []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [executor.submit(self.database.cursor().execute, self.statement.get_all_global)]
-            ):
-                try:
-                    row_result = future.result()
-                except Exception as exc:
-                    debug_exc_log(log, exc, "Failed to completed fetch from database")
+        try:
+            row_result = await self.database.fetchall(self.statement.get_all_global)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to completed fetch from database")
         async for row in AsyncIter(row_result):
             output.append(self.fetch_for_global(*row))
         return output
 
 
-class LocalCacheWrapper:
-    """Wraps all table apis into 1 object representing the local cache"""
+class NegativeCacheWrapper(BaseWrapper):
+    """Remembers lookups that failed or found nothing, so they are not retried right away.
+
+    Entries are kept in memory and written through to the ``negative_cache`` table,
+    which is loaded back into memory on startup.
+    """
+
+    def __init__(self, bot: Red, config: Config, conn: DatabaseExecutor, cog: Union["Audio", Cog]):
+        super().__init__(bot, config, conn, cog)
+        self.statement.upsert = NEGATIVE_CACHE_UPSERT
+        self.statement.get_all = NEGATIVE_CACHE_QUERY_ALL
+        self.statement.delete = NEGATIVE_CACHE_DELETE
+        self.statement.delete_all = NEGATIVE_CACHE_DELETE_ALL
+        self.front_cache = LRUCache(max_entries=20000)
+        self.persist = True
+        self.write_queue: Optional["CacheWriteQueue"] = None
+
+    async def load(self) -> None:
+        """Load every unexpired entry from the negative_cache table"""
+        try:
+            rows = await self.database.fetchall(self.statement.get_all, {"now": int(time.time())})
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to load negative cache from database")
+            return
+        for source, query, reason, expires_at in rows:
+            self.front_cache.put((source, query), (reason, expires_at))
+
+    def get(self, source: str, query: str) -> Optional[str]:
+        """Return why the last lookup of ``query`` on ``source`` failed, if it has not expired"""
+        entry = self.front_cache.get((source, query))
+        if entry is None:
+            return None
+        reason, expires_at = entry
+        if expires_at <= time.time():
+            self.front_cache.pop((source, query))
+            return None
+        return reason
+
+    def add(self, source: str, query: str, reason: str) -> None:
+        """Remember that looking up ``query`` on ``source`` failed for ``reason``"""
+        expires_at = int(time.time()) + _NEGATIVE_CACHE_TTL.get(reason, 120)
+        self.front_cache.put((source, query), (reason, expires_at))
+        if self.persist and self.write_queue is not None:
+            self.write_queue.insert(
+                "negative",
+                [{"source": source, "query": query, "reason": reason, "expires_at": expires_at}],
+            )
+
+    async def discard(self, source: str, query: str) -> None:
+        """Forget a failed lookup, i.e. once it succeeded
+
+        The row is deleted even when the entry has already left memory,
+        after any pending write of it is dropped.
+        """
+        self.front_cache.pop((source, query))
+        if self.persist:
+            if self.write_queue is not None:
+                await self.write_queue.discard("negative", [(source, query)])
+            try:
+                await self.database.execute(
+                    self.statement.delete, {"source": source, "query": query}
+                )
+            except Exception as exc:
+                debug_exc_log(log, exc, "Failed to delete negative cache entry")
+
+    async def purge(self) -> int:
+        """Forget every failed lookup, returning how many were in memory"""
+        if self.write_queue is not None:
+            await self.write_queue.discard("negative")
+        count = len(self.front_cache)
+        self.front_cache.clear()
+        try:
+            await self.database.execute(self.statement.delete_all)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to purge negative cache")
+        return count
+
+
+class CacheWriteQueue:
+    """Write-behind buffer for the local cache tables.
+
+    Inserts and ``last_fetched`` touches from every guild are coalesced in memory
+    and committed together in a single transaction, either every ``interval`` seconds
+    or as soon as ``flush_threshold`` rows are pending.
+    """
 
     def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
+        self,
+        cache: "LocalCacheWrapper",
+        interval: float = 5.0,
+        flush_threshold: int = 500,
+        max_pending: int = 10000,
     ):
+        self.cache = cache
+        self.interval = interval
+        self.flush_threshold = flush_threshold
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._inserts: Dict[str, Dict[Tuple, MutableMapping]] = {t: {} for t in _TABLE_KEYS}
+        self._touches: Dict[str, Dict[Tuple, MutableMapping]] = {t: {} for t in _TABLE_KEYS}
+        self._pending = 0
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    def _add(self, buffer: Dict[Tuple, MutableMapping], key: Tuple, values: MutableMapping):
+        if key not in buffer:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending += 1
+        buffer[key] = values
+        if self._pending >= self.flush_threshold:
+            self._wakeup.set()
+
+    def insert(self, table: str, values: List[MutableMapping]) -> None:
+        """Queue rows to be upserted into ``table``."""
+        keys = _TABLE_KEYS[table]
+        buffer = self._inserts[table]
+        for entry in values:
+            self._add(buffer, tuple(entry.get(k) for k in keys), entry)
+
+    def update(self, table: str, values: MutableMapping) -> None:
+        """Queue a ``last_fetched`` touch for the row matching ``values``."""
+        values = dict(values)
+        values["last_fetched"] = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
+        key = tuple(sorted((k, v) for k, v in values.items() if k != "last_fetched"))
+        self._add(self._touches[table], key, values)
+
+    async def discard(self, table: str, keys: Optional[Iterable[Tuple]] = None) -> None:
+        """Drop the pending inserts for ``table``, only those matching ``keys`` if given.
+
+        A flush already in progress is awaited first, so its rows are committed by then.
+        """
+        async with self._flush_lock:
+            buffer = self._inserts[table]
+            if keys is None:
+                self._pending -= len(buffer)
+                self._inserts[table] = {}
+                return
+            for key in keys:
+                if buffer.pop(key, None) is not None:
+                    self._pending -= 1
+
+    async def flush(self) -> None:
+        """Commit every pending write in one transaction."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            inserts, touches, pending = self._inserts, self._touches, self._pending
+            self._inserts = {t: {} for t in _TABLE_KEYS}
+            self._touches = {t: {} for t in _TABLE_KEYS}
+            self._pending = 0
+            self._wakeup.clear()
+            batches = []
+            for table, rows in inserts.items():
+                if rows:
+                    wrapper = getattr(self.cache, table)
+                    batches.append(
+                        (wrapper.statement.upsert, map(wrapper.encode_row, rows.values()))
+                    )
+            for table, rows in touches.items():
+                if rows:
+                    batches.append((getattr(self.cache, table).statement.update, rows.values()))
+            try:
+                await self.cache.database.execute_batch(batches)
+            except Exception as exc:
+                debug_exc_log(log, exc, "Failed to flush %d pending cache writes", pending)
+            else:
+                for table, rows in inserts.items():
+                    getattr(self.cache, table).invalidate(rows.values())
+                if IS_DEBUG:
+                    log.debug("Flushed %d pending cache writes", pending)
+
+    async def _flush_loop(self) -> None:
+        while not self._closing:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            await self.flush()
+
+    async def close(self) -> None:
+        """Stop the flush loop and drain every pending write."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+        if self.dropped:
+            log.debug("%d cache writes were dropped while the write queue was full", self.dropped)
+
+
+class LocalCacheWrapper:
+    """Wraps all table apis into 1 object representing the local cache"""
+
+    def __init__(self, bot: Red, config: Config, conn: DatabaseExecutor, cog: Union["Audio", Cog]):
         self.bot = bot
         self.config = config
         self.database = conn
         self.cog = cog
         self.lavalink: LavalinkTableWrapper = LavalinkTableWrapper(bot, config, conn, self.cog)
         self.spotify: SpotifyTableWrapper = SpotifyTableWrapper(bot, config, conn, self.cog)
+        self.spotify_playlist: SpotifyPlaylistTableWrapper = SpotifyPlaylistTableWrapper(
+            bot, config, conn, self.cog
+        )
         self.youtube: YouTubeTableWrapper = YouTubeTableWrapper(bot, config, conn, self.cog)
+        self.negative: NegativeCacheWrapper = NegativeCacheWrapper(bot, config, conn, self.cog)
+        self.write_queue: CacheWriteQueue = CacheWriteQueue(self)
+        self.negative.write_queue = self.write_queue
+
+    def clear_front_cache(self) -> None:
+        """Empty the in-memory front cache of every table"""
+        for table in (self.lavalink, self.spotify, self.spotify_playlist, self.youtube):
+            table.front_cache.clear()
+
+    def front_cache_stats(self) -> MutableMapping[str, LRUCache]:
+        """The in-memory front cache of every table, keyed by table name"""
+        return {
+            "lavalink": self.lavalink.front_cache,
+            "spotify": self.spotify.front_cache,
+            "youtube": self.youtube.front_cache,
+        }
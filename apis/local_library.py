@@ -0,0 +1,352 @@
+import asyncio
+import contextlib
+import functools
+import logging
+import os
+import time
+from pathlib import Path
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, AbstractSet, Dict, List, Optional, Tuple, Union
+
+from redbot.core import Config
+from redbot.core.bot import Red
+from redbot.core.commands import Cog
+from redbot.core.i18n import Translator
+
+from ..audio_dataclasses import LocalPath
+from ..audio_logging import IS_DEBUG, debug_exc_log
+from ..sql_statements import (
+    LOCAL_LIBRARY_CREATE_FOLDERS_TABLE,
+    LOCAL_LIBRARY_CREATE_TRACKS_TABLE,
+    LOCAL_LIBRARY_FOLDERS_DELETE,
+    LOCAL_LIBRARY_FOLDERS_QUERY_ALL,
+    LOCAL_LIBRARY_FOLDERS_UPSERT,
+    LOCAL_LIBRARY_TRACKS_DELETE_FOLDER,
+    LOCAL_LIBRARY_TRACKS_INSERT,
+    LOCAL_LIBRARY_TRACKS_QUERY_ALL,
+)
+from ..utils import SearchIndex, task_callback
+from .db_executor import DatabaseExecutor
+
+log = logging.getLogger("red.cogs.Audio.api.LocalLibrary")
+_ = Translator("Audio", Path(__file__))
+
+if TYPE_CHECKING:
+    from .. import Audio
+
+# Seconds between two background rescans of the localtracks folder.
+_REFRESH_INTERVAL = 300
+# Lookups rescan first when the last scan finished more than this many seconds ago.
+_STALE_AFTER = 30
+
+_Folders = Dict[str, Tuple[str, ...]]
+
+
+def _scan_library(
+    root: str,
+    mtimes: Dict[str, int],
+    subfolders: _Folders,
+    tracks: _Folders,
+    extensions: AbstractSet[str],
+) -> Tuple[Dict[str, int], Dict[str, Optional[str]], _Folders, _Folders, List[str]]:
+    """Walk ``root`` once, only listing the folders whose mtime changed since the last scan.
+
+    Returns the mtime, parent, subfolders and track names of every folder,
+    followed by the folders that had to be listed again.
+    This runs in a worker thread.
+    """
+    new_mtimes: Dict[str, int] = {}
+    new_parents: Dict[str, Optional[str]] = {}
+    new_subfolders: _Folders = {}
+    new_tracks: _Folders = {}
+    changed: List[str] = []
+    visited = set()
+    stack: List[Tuple[str, Optional[str]]] = [(root, None)]
+    while stack:
+        (folder, parent) = stack.pop()
+        try:
+            stat = os.stat(folder)
+        except OSError:
+            continue
+        # Symlinked folders are followed, but never twice
+        if (stat.st_dev, stat.st_ino) in visited:
+            continue
+        visited.add((stat.st_dev, stat.st_ino))
+        if mtimes.get(folder) == stat.st_mtime_ns and folder in subfolders:
+            children = subfolders[folder]
+            names = tracks.get(folder, ())
+        else:
+            found_children = []
+            found_names = []
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        # Hidden entries were never matched by the glob walk either
+                        if entry.name.startswith("."):
+                            continue
+                        with contextlib.suppress(OSError):
+                            if entry.is_dir():
+                                found_children.append(entry.path)
+                            elif os.path.splitext(entry.name)[1] in extensions and entry.is_file():
+                                found_names.append(entry.name)
+            except OSError:
+                continue
+            children = tuple(found_children)
+            names = tuple(found_names)
+            changed.append(folder)
+        new_mtimes[folder] = stat.st_mtime_ns
+        new_parents[folder] = parent
+        new_subfolders[folder] = children
+        new_tracks[folder] = names
+        stack.extend((child, folder) for child in children)
+    return new_mtimes, new_parents, new_subfolders, new_tracks, changed
+
+
+class LocalLibraryIndex:
+    """Index of the folders and tracks inside the localtracks folder.
+
+    The index is kept in memory and mirrored to the ``local_library_*`` tables,
+    so a restart only has to list the folders that changed while the bot was offline.
+    """
+
+    def __init__(self, bot: Red, config: Config, conn: DatabaseExecutor, cog: Union["Audio", Cog]):
+        self.bot = bot
+        self.database = conn
+        self.config = config
+        self.cog = cog
+        self.statement = SimpleNamespace()
+        self.statement.create_folders_table = LOCAL_LIBRARY_CREATE_FOLDERS_TABLE
+        self.statement.create_tracks_table = LOCAL_LIBRARY_CREATE_TRACKS_TABLE
+        self.statement.upsert_folder = LOCAL_LIBRARY_FOLDERS_UPSERT
+        self.statement.delete_folder = LOCAL_LIBRARY_FOLDERS_DELETE
+        self.statement.get_folders = LOCAL_LIBRARY_FOLDERS_QUERY_ALL
+        self.statement.insert_track = LOCAL_LIBRARY_TRACKS_INSERT
+        self.statement.delete_folder_tracks = LOCAL_LIBRARY_TRACKS_DELETE_FOLDER
+        self.statement.get_tracks = LOCAL_LIBRARY_TRACKS_QUERY_ALL
+
+        self.extensions = frozenset(LocalPath._all_music_ext)
+        self.root: Optional[str] = None
+        self.last_scan: Optional[float] = None
+        self._mtimes: Dict[str, int] = {}
+        self._parents: Dict[str, Optional[str]] = {}
+        self._subfolders: _Folders = {}
+        self._tracks: _Folders = {}
+        # Track names by path, only built by the first search
+        self.search_index: Optional[SearchIndex] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def init(self) -> None:
+        """Create the index tables and load the last known state of the library"""
+        await self.database.execute(self.statement.create_folders_table)
+        await self.database.execute(self.statement.create_tracks_table)
+        try:
+            folders = await self.database.fetchall(self.statement.get_folders)
+            tracks = await self.database.fetchall(self.statement.get_tracks)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to load the local library index from database")
+            return
+        subfolders: Dict[str, List[str]] = {}
+        for path, parent, mtime in folders:
+            self._mtimes[path] = mtime
+            self._parents[path] = parent
+            subfolders.setdefault(path, [])
+            if parent is not None:
+                subfolders.setdefault(parent, []).append(path)
+        names: Dict[str, List[str]] = {}
+        for folder, name in tracks:
+            names.setdefault(folder, []).append(name)
+        self._subfolders = {k: tuple(v) for k, v in subfolders.items()}
+        self._tracks = {k: tuple(v) for k, v in names.items()}
+
+    def start(self) -> None:
+        """Start refreshing the index in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+            self._task.add_done_callback(task_callback)
+
+    async def close(self) -> None:
+        """Stop the background refresh"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await self.rescan()
+            await asyncio.sleep(_REFRESH_INTERVAL)
+
+    async def _get_root(self) -> str:
+        current_path = self.cog.local_folder_current_path
+        if current_path is None:
+            current_path = Path(await self.config.localpath())
+        return str(LocalPath(None, current_path).localtrack_folder.absolute())
+
+    async def rescan(self, max_age: Optional[float] = None) -> None:
+        """Bring the index up to date with the localtracks folder.
+
+        Nothing is done if the last scan of the same folder finished less than ``max_age``
+        seconds ago, concurrent callers wait for the scan already running.
+        """
+        async with self._lock:
+            root = await self._get_root()
+            if (
+                max_age is not None
+                and self.root == root
+                and self.last_scan is not None
+                and time.monotonic() - self.last_scan < max_age
+            ):
+                return
+            started = time.monotonic()
+            loop = asyncio.get_running_loop()
+            try:
+                (mtimes, parents, subfolders, tracks, changed) = await loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        _scan_library,
+                        root,
+                        self._mtimes,
+                        self._subfolders,
+                        self._tracks,
+                        self.extensions,
+                    ),
+                )
+            except Exception as exc:
+                debug_exc_log(log, exc, "Failed to scan the localtracks folder")
+                return
+            removed = [folder for folder in self._mtimes if folder not in mtimes]
+            previous_tracks = self._tracks
+            self._mtimes = mtimes
+            self._parents = parents
+            self._subfolders = subfolders
+            self._tracks = tracks
+            if self.root != root:
+                self.search_index = None
+            self.root = root
+            self.last_scan = time.monotonic()
+            if IS_DEBUG:
+                log.debug(
+                    "Scanned %d local folders in %.2fs, %d changed and %d removed",
+                    len(mtimes),
+                    self.last_scan - started,
+                    len(changed),
+                    len(removed),
+                )
+            if changed or removed:
+                if self.search_index is not None:
+                    await loop.run_in_executor(
+                        None,
+                        functools.partial(
+                            self._update_search_index, previous_tracks, [*removed, *changed]
+                        ),
+                    )
+                await self._persist(changed, removed)
+
+    async def _persist(self, changed: List[str], removed: List[str]) -> None:
+        # Tracks are rewritten per folder, in the same transaction as the folder mtime,
+        # so a folder is never stored as up to date while its tracks are not.
+        # The rows are only built in the database worker.
+        (mtimes, parents, tracks) = (self._mtimes, self._parents, self._tracks)
+        batches = [
+            (
+                self.statement.delete_folder_tracks,
+                ({"folder": folder} for folder in (*removed, *changed)),
+            ),
+            (self.statement.delete_folder, ({"path": folder} for folder in removed)),
+            (
+                self.statement.upsert_folder,
+                (
+                    {"path": folder, "parent": parents[folder], "mtime": mtimes[folder]}
+                    for folder in changed
+                ),
+            ),
+            (
+                self.statement.insert_track,
+                (
+                    {"folder": folder, "name": name}
+                    for folder in changed
+                    for name in tracks[folder]
+                ),
+            ),
+        ]
+        try:
+            await self.database.execute_batch(batches)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to save the local library index")
+
+    def _build_search_index(self) -> SearchIndex:
+        search_index = SearchIndex()
+        for folder, names in self._tracks.items():
+            if folder != self.root:
+                for name in names:
+                    search_index.add(os.path.join(folder, name), name)
+        return search_index
+
+    def _update_search_index(self, previous_tracks: _Folders, folders: List[str]) -> None:
+        for folder in folders:
+            for name in previous_tracks.get(folder, ()):
+                self.search_index.discard(os.path.join(folder, name))
+            if folder != self.root:
+                for name in self._tracks.get(folder, ()):
+                    self.search_index.add(os.path.join(folder, name), name)
+
+    def _children(self, folder: str) -> List[str]:
+        # Symlinks back into the tree and unreadable folders were not scanned
+        return [child for child in self._subfolders.get(folder, ()) if child in self._mtimes]
+
+    def _walk(self, folder: str) -> List[str]:
+        folders = []
+        stack = self._children(folder)
+        while stack:
+            current = stack.pop()
+            folders.append(current)
+            stack.extend(self._children(current))
+        return folders
+
+    async def folders(self, folder: str, recursive: bool = False) -> Optional[List[str]]:
+        """The paths of the folders inside ``folder``.
+
+        Returns ``None`` if ``folder`` is not part of the index.
+        """
+        await self.rescan(max_age=_STALE_AFTER)
+        if folder not in self._subfolders:
+            return None
+        return self._walk(folder) if recursive else self._children(folder)
+
+    async def tracks(self, folder: str, recursive: bool = False) -> Optional[List[str]]:
+        """The paths of the tracks inside ``folder``.
+
+        Tracks placed directly in the localtracks folder are left out, as they are not part
+        of an album. Returns ``None`` if ``folder`` is not part of the index.
+        """
+        await self.rescan(max_age=_STALE_AFTER)
+        if folder not in self._subfolders:
+            return None
+        folders = [folder, *self._walk(folder)] if recursive else [folder]
+        return [
+            os.path.join(current, name)
+            for current in folders
+            if current != self.root
+            for name in self._tracks.get(current, ())
+        ]
+
+    async def search(
+        self, folder: str, words: str, limit: int = 50, score_cutoff: int = 0
+    ) -> Optional[List[str]]:
+        """The paths of the tracks whose name best matches ``words``, best first.
+
+        Only the localtracks folder itself can be searched, ``None`` is returned for any
+        other ``folder``. Tracks placed directly in it are left out like in :meth:`tracks`.
+        """
+        await self.rescan(max_age=_STALE_AFTER)
+        async with self._lock:
+            if folder != self.root:
+                return None
+            if self.search_index is None:
+                loop = asyncio.get_running_loop()
+                self.search_index = await loop.run_in_executor(None, self._build_search_index)
+            results = await self.search_index.search(words, limit=limit, score_cutoff=score_cutoff)
+        return [path for (path, name, score) in results]
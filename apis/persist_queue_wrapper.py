@@ -1,11 +1,10 @@
-import concurrent
 import json
 import logging
 import time
 from pathlib import Path
 
 from types import SimpleNamespace
-from typing import TYPE_CHECKING, List, Union
+from typing import TYPE_CHECKING, List, MutableMapping, Optional, Union
 
 import lavalink
 
@@ -14,7 +13,6 @@ from redbot.core.bot import Red
 from redbot.core.commands import Cog
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
-from redbot.core.utils.dbtools import APSWConnectionWrapper
 
 from ..audio_logging import debug_exc_log
 from ..sql_statements import (
@@ -24,7 +22,11 @@ from ..sql_statements import (
     PERSIST_QUEUE_DELETE_SCHEDULED,
     PERSIST_QUEUE_DROP_TABLE,
     PERSIST_QUEUE_FETCH_ALL,
+    PERSIST_QUEUE_FETCH_GUILD,
+    PERSIST_QUEUE_FETCH_GUILD_IDS,
+    PERSIST_QUEUE_FETCH_JSON_ROWS,
     PERSIST_QUEUE_PLAYED,
+    PERSIST_QUEUE_UPDATE_TRACK,
     PERSIST_QUEUE_UPSERT,
     PRAGMA_FETCH_user_version,
     PRAGMA_SET_journal_mode,
@@ -32,19 +34,20 @@ from ..sql_statements import (
     PRAGMA_SET_temp_store,
     PRAGMA_SET_user_version,
 )
-from .api_utils import QueueFetchResult
+from .api_utils import QueueFetchResult, encode_queue_track
+from .db_executor import DatabaseExecutor
 
 log = logging.getLogger("red.cogs.Audio.api.PersistQueueWrapper")
 _ = Translator("Audio", Path(__file__))
 
+_PACK_CHUNK_SIZE = 500
+
 if TYPE_CHECKING:
     from .. import Audio
 
 
 class QueueInterface:
-    def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
-    ):
+    def __init__(self, bot: Red, config: Config, conn: DatabaseExecutor, cog: Union["Audio", Cog]):
         self.bot = bot
         self.database = conn
         self.config = config
@@ -64,73 +67,168 @@ class QueueInterface:
         self.statement.drop_table = PERSIST_QUEUE_DROP_TABLE
 
         self.statement.get_all = PERSIST_QUEUE_FETCH_ALL
+        self.statement.get_guild_ids = PERSIST_QUEUE_FETCH_GUILD_IDS
+        self.statement.get_guild = PERSIST_QUEUE_FETCH_GUILD
         self.statement.get_player = PERSIST_QUEUE_PLAYED
+        self.statement.get_json_rows = PERSIST_QUEUE_FETCH_JSON_ROWS
+        self.statement.update_track = PERSIST_QUEUE_UPDATE_TRACK
 
     async def init(self) -> None:
         """Initialize the PersistQueue table"""
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(self.database.cursor().execute, self.statement.pragma_temp_store)
-            executor.submit(self.database.cursor().execute, self.statement.pragma_journal_mode)
-            executor.submit(self.database.cursor().execute, self.statement.pragma_read_uncommitted)
-            executor.submit(self.database.cursor().execute, self.statement.create_table)
-            executor.submit(self.database.cursor().execute, self.statement.create_index)
+        await self.database.execute(self.statement.pragma_temp_store)
+        await self.database.execute(self.statement.pragma_journal_mode)
+        await self.database.execute(self.statement.pragma_read_uncommitted)
+        await self.database.execute(self.statement.create_table)
+        await self.database.execute(self.statement.create_index)
+        await self.pack_existing_entries()
+
+    async def pack_existing_entries(self) -> None:
+        """Rewrite queue rows still stored as JSON text in the packed format."""
+        try:
+            packed = await self.database.run(self._pack_json_rows, _PACK_CHUNK_SIZE)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to pack persisted queue rows")
+            return
+        if packed:
+            log.info("Packed %d persisted queue rows", packed)
+
+    def _pack_json_rows(self, chunk_size: int) -> int:
+        # Runs in the database worker, one transaction per chunk
+        connection = self.database.connection
+        packed = 0
+        while True:
+            rows = (
+                connection.cursor()
+                .execute(self.statement.get_json_rows, {"limit": chunk_size})
+                .fetchall()
+            )
+            if not rows:
+                return packed
+            with connection.transaction() as transaction:
+                transaction.executemany(
+                    self.statement.update_track,
+                    (
+                        {"rowid": rowid, "track": encode_queue_track(self._json_requester(track))}
+                        for rowid, track in rows
+                    ),
+                )
+            packed += len(rows)
+
+    @staticmethod
+    def _json_requester(track: str) -> Optional[int]:
+        try:
+            return json.loads(track).get("extras", {}).get("requester")
+        except Exception:
+            return None
 
     async def fetch_all(self) -> List[QueueFetchResult]:
         """Fetch all playlists"""
         output = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [
-                    executor.submit(
-                        self.database.cursor().execute,
-                        self.statement.get_all,
-                    )
-                ]
-            ):
-                try:
-                    row_result = future.result()
-                except Exception as exc:
-                    debug_exc_log(log, exc, "Failed to complete playlist fetch from database")
-                    return []
+        try:
+            row_result = await self.database.fetchall(self.statement.get_all)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to complete playlist fetch from database")
+            return []
 
         async for index, row in AsyncIter(row_result).enumerate(start=1):
-            output.append(QueueFetchResult(*row))
+            output.append(QueueFetchResult(*row, decode_track=self.cog.decode_track))
         return output
 
+    async def fetch_guild_ids(self) -> List[int]:
+        """Fetch the id of every guild with a persisted queue, in ascending order"""
+        try:
+            row_result = await self.database.fetchall(self.statement.get_guild_ids)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to fetch persisted queue guilds from database")
+            return []
+        return [guild_id for (guild_id,) in row_result]
+
+    async def fetch_guild(self, guild_id: int) -> List[QueueFetchResult]:
+        """Fetch the persisted queue of a guild in enqueue order.
+
+        Tracks are only decoded once their ``track_object`` is used.
+        """
+        try:
+            row_result = await self.database.fetchall(
+                self.statement.get_guild, {"guild_id": guild_id}
+            )
+        except Exception as exc:
+            debug_exc_log(
+                log, exc, "Failed to fetch persisted queue of %d from database", guild_id
+            )
+            return []
+        return [QueueFetchResult(*row, decode_track=self.cog.decode_track) for row in row_result]
+
     async def played(self, guild_id: int, track_id: str) -> None:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(
-                self.database.cursor().execute,
-                PERSIST_QUEUE_PLAYED,
-                {"guild_id": guild_id, "track_id": track_id},
+        try:
+            await self.database.execute(
+                PERSIST_QUEUE_PLAYED, {"guild_id": guild_id, "track_id": track_id}
             )
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to mark track as played in persistent queue")
 
-    async def delete_scheduled(self):
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(self.database.cursor().execute, PERSIST_QUEUE_DELETE_SCHEDULED)
+    async def delete_scheduled(self) -> int:
+        """Delete played tracks in chunks, returning how many were removed"""
+        try:
+            return await self.database.delete_chunked(PERSIST_QUEUE_DELETE_SCHEDULED)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to delete played tracks from persistent queue")
+            return 0
 
     async def drop(self, guild_id: int):
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(
-                self.database.cursor().execute, PERSIST_QUEUE_BULK_PLAYED, ({"guild_id": guild_id})
-            )
+        try:
+            await self.database.execute(PERSIST_QUEUE_BULK_PLAYED, ({"guild_id": guild_id}))
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to drop persistent queue for %d", guild_id)
 
     async def enqueued(self, guild_id: int, room_id: int, track: lavalink.Track):
         enqueue_time = track.extras.get("enqueue_time", 0)
         if enqueue_time == 0:
-            track.extras["enqueue_time"] = int(time.time())
-        track_identifier = track.track_identifier
-        track = self.cog.track_to_json(track)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(
-                self.database.cursor().execute,
+            enqueue_time = track.extras["enqueue_time"] = int(time.time())
+        try:
+            await self.database.execute(
+                PERSIST_QUEUE_UPSERT, self._queue_row(guild_id, room_id, track, enqueue_time)
+            )
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to add track to persistent queue")
+
+    async def enqueued_many(self, guild_id: int, tracks: List[lavalink.Track]):
+        """Add a batch of tracks to the persistent queue in a single transaction.
+
+        The room of each track is read from its ``vc`` extra.
+        """
+        rows = []
+        for track in tracks:
+            enqueue_time = track.extras.get("enqueue_time", 0)
+            if enqueue_time == 0:
+                enqueue_time = track.extras["enqueue_time"] = int(time.time())
+            rows.append((track.extras["vc"], track, enqueue_time))
+        try:
+            # The rows are serialised in the database worker rather than on the event loop
+            await self.database.executemany(
                 PERSIST_QUEUE_UPSERT,
-                {
-                    "guild_id": int(guild_id),
-                    "room_id": int(room_id),
-                    "played": False,
-                    "time": enqueue_time,
-                    "track": json.dumps(track),
-                    "track_id": track_identifier,
-                },
+                (
+                    self._queue_row(guild_id, room_id, track, enqueue_time)
+                    for room_id, track, enqueue_time in rows
+                ),
             )
+        except Exception as exc:
+            # A failure here loses a whole playlist load, so do not hide it behind --debug
+            log.warning(
+                "Failed to add %d tracks to the persistent queue of %d",
+                len(rows),
+                guild_id,
+                exc_info=exc,
+            )
+
+    def _queue_row(
+        self, guild_id: int, room_id: int, track: lavalink.Track, enqueue_time: int
+    ) -> MutableMapping:
+        return {
+            "guild_id": int(guild_id),
+            "room_id": int(room_id),
+            "played": False,
+            "time": enqueue_time,
+            "track": encode_queue_track(track.extras.get("requester")),
+            "track_id": track.track_identifier,
+        }
@@ -1,7 +1,7 @@
 import logging
 from pathlib import Path
 
-from typing import List, MutableMapping, Optional, Union
+from typing import Iterable, List, MutableMapping, Optional, Set, Union
 
 import discord
 import lavalink
@@ -48,6 +48,8 @@ class Playlist:
         self.id = playlist_id
         self.name = name
         self.url = playlist_url
+        # Playlists matched by name are fetched without their tracks until they are needed
+        self.tracks_loaded = tracks is not None
         self.tracks = tracks or []
         self.tracks_obj = [lavalink.Track(data=track) for track in self.tracks]
         self.playlist_api = playlist_api
@@ -73,11 +75,18 @@ class Playlist:
 
         for item in list(data.keys()):
             setattr(self, item, data[item])
-        await self.save()
+        if "tracks" in data:
+            self.tracks_obj = [lavalink.Track(data=track) for track in self.tracks]
+            self.tracks_loaded = True
+        await self.save(include_tracks="tracks" in data)
         return self
 
-    async def save(self):
-        """Saves a Playlist."""
+    async def save(self, include_tracks: bool = True):
+        """Saves a Playlist.
+
+        With ``include_tracks`` False, or when the tracks were never loaded,
+        only the playlist details are written.
+        """
         scope, scope_id = self.config_scope
         await self.playlist_api.upsert(
             scope,
@@ -86,9 +95,71 @@ class Playlist:
             scope_id=scope_id,
             author_id=self.author_id,
             playlist_url=self.url,
-            tracks=self.tracks,
+            tracks=self.tracks if include_tracks and self.tracks_loaded else None,
+        )
+
+    async def load_tracks(self) -> None:
+        """Read the tracks of a Playlist that was fetched without them."""
+        if self.tracks_loaded:
+            return
+        scope, scope_id = self.config_scope
+        self.tracks = await self.playlist_api.fetch_tracks(scope, int(self.id), scope_id)
+        self.tracks_obj = [lavalink.Track(data=track) for track in self.tracks]
+        self.tracks_loaded = True
+
+    async def count_tracks(self) -> int:
+        """Count the tracks of the Playlist, reading them only if they are already loaded."""
+        if self.tracks_loaded:
+            return len(self.tracks)
+        scope, scope_id = self.config_scope
+        return await self.playlist_api.count_tracks(scope, int(self.id), scope_id)
+
+    async def existing_identifiers(self, identifiers: Iterable[str]) -> Set[str]:
+        """Return which of these track identifiers are already in the Playlist."""
+        if self.tracks_loaded:
+            return {track.track_identifier for track in self.tracks_obj}.intersection(identifiers)
+        scope, scope_id = self.config_scope
+        return await self.playlist_api.existing_identifiers(
+            scope, int(self.id), scope_id, identifiers
         )
 
+    async def append_tracks(self, tracks: List[MutableMapping]):
+        """Adds tracks to the end of the Playlist, writing only the new tracks."""
+        scope, scope_id = self.config_scope
+        await self.playlist_api.append_tracks(scope, int(self.id), scope_id, tracks)
+        self.tracks.extend(tracks)
+        self.tracks_obj.extend(lavalink.Track(data=track) for track in tracks)
+
+    async def remove_track_at(self, index: int) -> bool:
+        """Removes the track at ``index`` from the Playlist."""
+        scope, scope_id = self.config_scope
+        removed = await self.playlist_api.remove_track_at(scope, int(self.id), scope_id, index)
+        if removed and index < len(self.tracks):
+            del self.tracks[index]
+            del self.tracks_obj[index]
+        return removed
+
+    async def remove_uri(self, uri: str) -> int:
+        """Removes every track with this URI from the Playlist, returning how many were removed."""
+        scope, scope_id = self.config_scope
+        removed = await self.playlist_api.remove_uri(scope, int(self.id), scope_id, uri)
+        self.tracks = [track for track in self.tracks if track["info"]["uri"] != uri]
+        self.tracks_obj = [lavalink.Track(data=track) for track in self.tracks]
+        return removed
+
+    async def remove_duplicates(self) -> int:
+        """Keeps only the first copy of every track, returning how many were removed."""
+        scope, scope_id = self.config_scope
+        removed = await self.playlist_api.remove_duplicates(scope, int(self.id), scope_id)
+        seen = set()
+        self.tracks = [
+            track
+            for track in self.tracks
+            if not (track.get("track") in seen or seen.add(track.get("track")))
+        ]
+        self.tracks_obj = [lavalink.Track(data=track) for track in self.tracks]
+        return removed
+
     def to_json(self) -> MutableMapping:
         """Transform the object to a dict.
         Returns
@@ -352,6 +423,7 @@ async def get_playlist(
     playlist_api: PlaylistWrapper,
     guild: Union[discord.Guild, int] = None,
     author: Union[discord.abc.User, int] = None,
+    include_tracks: bool = True,
 ) -> Playlist:
     """
     Gets the playlist with the associated playlist number.
@@ -369,6 +441,8 @@ async def get_playlist(
         The ID of the user to get the playlist from if scope is USERPLAYLIST.
     bot: Red
         The bot's instance.
+    include_tracks: bool
+        Whether to read the playlist's tracks. Without them the playlist can only be appended to.
     Returns
     -------
     Playlist
@@ -385,7 +459,9 @@ async def get_playlist(
         Trying to access the User scope without an user id.
     """
     scope_standard, scope_id = prepare_config_scope(bot, scope, author, guild)
-    playlist_data = await playlist_api.fetch(scope_standard, playlist_number, scope_id)
+    playlist_data = await playlist_api.fetch(
+        scope_standard, playlist_number, scope_id, include_tracks=include_tracks
+    )
 
     if not (playlist_data and playlist_data.playlist_id):
         raise RuntimeError(f"That playlist does not exist for the following scope: {scope}")
@@ -468,6 +544,7 @@ async def get_all_playlist_converter(
     arg: str,
     guild: Union[discord.Guild, int] = None,
     author: Union[discord.abc.User, int] = None,
+    include_tracks: bool = True,
 ) -> List[Playlist]:
     """
     Gets all playlist for the specified scope.
@@ -485,6 +562,8 @@ async def get_all_playlist_converter(
         The value to lookup.
     playlist_api: PlaylistWrapper
         The Playlist API interface.
+    include_tracks: bool
+        Whether to read the tracks of the matched playlists.
     Returns
     -------
     list
@@ -500,7 +579,7 @@ async def get_all_playlist_converter(
     """
     scope_standard, scope_id = prepare_config_scope(bot, scope, author, guild)
     playlists = await playlist_api.fetch_all_converter(
-        scope_standard, playlist_name=arg, playlist_id=arg
+        scope_standard, playlist_name=arg, playlist_id=arg, include_tracks=include_tracks
     )
     playlist_list = []
     async for playlist in AsyncIter(playlists):
@@ -1,20 +1,19 @@
-import concurrent
 import json
 import logging
 from pathlib import Path
 
 from types import SimpleNamespace
-from typing import List, MutableMapping, Optional
+from typing import Iterable, Iterator, List, MutableMapping, Optional, Set, Tuple
 
 from redbot.core import Config
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
-from redbot.core.utils.dbtools import APSWConnectionWrapper
 
 from ..audio_logging import debug_exc_log
 from ..sql_statements import (
     HANDLE_DISCORD_DATA_DELETION_QUERY,
+    PLAYLIST_CLEAR_JSON_TRACKS,
     PLAYLIST_CREATE_INDEX,
     PLAYLIST_CREATE_TABLE,
     PLAYLIST_DELETE,
@@ -24,6 +23,19 @@ from ..sql_statements import (
     PLAYLIST_FETCH_ALL,
     PLAYLIST_FETCH_ALL_CONVERTER,
     PLAYLIST_FETCH_ALL_WITH_FILTER,
+    PLAYLIST_FETCH_JSON_TRACKS,
+    PLAYLIST_TRACKS_COUNT,
+    PLAYLIST_TRACKS_CREATE_CLEANUP_TRIGGER,
+    PLAYLIST_TRACKS_CREATE_INDEX,
+    PLAYLIST_TRACKS_CREATE_TABLE,
+    PLAYLIST_TRACKS_DELETE_ALL,
+    PLAYLIST_TRACKS_DELETE_AT,
+    PLAYLIST_TRACKS_DELETE_DUPLICATES,
+    PLAYLIST_TRACKS_DELETE_URI,
+    PLAYLIST_TRACKS_FETCH,
+    PLAYLIST_TRACKS_FETCH_EXISTING_IDENTIFIERS,
+    PLAYLIST_TRACKS_INSERT,
+    PLAYLIST_TRACKS_NEXT_POSITION,
     PLAYLIST_UPSERT,
     PRAGMA_FETCH_user_version,
     PRAGMA_SET_journal_mode,
@@ -33,13 +45,17 @@ from ..sql_statements import (
 )
 from ..utils import PlaylistScope
 from .api_utils import PlaylistFetchResult
+from .db_executor import DatabaseExecutor
 
 log = logging.getLogger("red.cogs.Audio.api.Playlists")
 _ = Translator("Audio", Path(__file__))
 
+# Playlists moved from the JSON tracks column per worker transaction
+_MIGRATION_CHUNK_SIZE = 25
+
 
 class PlaylistWrapper:
-    def __init__(self, bot: Red, config: Config, conn: APSWConnectionWrapper):
+    def __init__(self, bot: Red, config: Config, conn: DatabaseExecutor):
         self.bot = bot
         self.database = conn
         self.config = config
@@ -64,14 +80,110 @@ class PlaylistWrapper:
 
         self.statement.drop_user_playlists = HANDLE_DISCORD_DATA_DELETION_QUERY
 
+        self.statement.get_json_tracks = PLAYLIST_FETCH_JSON_TRACKS
+        self.statement.clear_json_tracks = PLAYLIST_CLEAR_JSON_TRACKS
+        self.statement.create_tracks_table = PLAYLIST_TRACKS_CREATE_TABLE
+        self.statement.create_tracks_index = PLAYLIST_TRACKS_CREATE_INDEX
+        self.statement.create_tracks_trigger = PLAYLIST_TRACKS_CREATE_CLEANUP_TRIGGER
+        self.statement.insert_track = PLAYLIST_TRACKS_INSERT
+        self.statement.next_track_position = PLAYLIST_TRACKS_NEXT_POSITION
+        self.statement.get_tracks = PLAYLIST_TRACKS_FETCH
+        self.statement.count_tracks = PLAYLIST_TRACKS_COUNT
+        self.statement.get_existing_identifiers = PLAYLIST_TRACKS_FETCH_EXISTING_IDENTIFIERS
+        self.statement.delete_tracks = PLAYLIST_TRACKS_DELETE_ALL
+        self.statement.delete_track_at = PLAYLIST_TRACKS_DELETE_AT
+        self.statement.delete_track_uri = PLAYLIST_TRACKS_DELETE_URI
+        self.statement.delete_track_duplicates = PLAYLIST_TRACKS_DELETE_DUPLICATES
+
     async def init(self) -> None:
-        """Initialize the Playlist table."""
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(self.database.cursor().execute, self.statement.pragma_temp_store)
-            executor.submit(self.database.cursor().execute, self.statement.pragma_journal_mode)
-            executor.submit(self.database.cursor().execute, self.statement.pragma_read_uncommitted)
-            executor.submit(self.database.cursor().execute, self.statement.create_table)
-            executor.submit(self.database.cursor().execute, self.statement.create_index)
+        """Initialize the Playlist tables."""
+        await self.database.execute(self.statement.pragma_temp_store)
+        await self.database.execute(self.statement.pragma_journal_mode)
+        await self.database.execute(self.statement.pragma_read_uncommitted)
+        await self.database.execute(self.statement.create_table)
+        await self.database.execute(self.statement.create_index)
+        await self.create_tracks_table()
+        await self.migrate_json_tracks()
+
+    async def create_tracks_table(self) -> None:
+        """Create the playlist_tracks table, its index and its cleanup trigger."""
+        await self.database.execute(self.statement.create_tracks_table)
+        await self.database.execute(self.statement.create_tracks_index)
+        await self.database.execute(self.statement.create_tracks_trigger)
+
+    async def migrate_json_tracks(self) -> None:
+        """Move the tracks of playlists still stored in the JSON column to playlist_tracks."""
+        try:
+            migrated = await self.database.run(self._migrate_json_tracks, _MIGRATION_CHUNK_SIZE)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to migrate playlist tracks")
+            return
+        if migrated:
+            log.info("Moved the tracks of %d playlists to the playlist_tracks table", migrated)
+
+    def _migrate_json_tracks(self, chunk_size: int) -> int:
+        # Runs in the database worker, one transaction per chunk
+        connection = self.database.connection
+        migrated = 0
+        last_rowid = 0
+        while True:
+            rows = (
+                connection.cursor()
+                .execute(
+                    self.statement.get_json_tracks, {"rowid": last_rowid, "limit": chunk_size}
+                )
+                .fetchall()
+            )
+            if not rows:
+                return migrated
+            last_rowid = rows[-1][0]
+            with connection.transaction() as transaction:
+                for _rowid, scope_type, playlist_id, scope_id, tracks in rows:
+                    key = {
+                        "scope_type": scope_type,
+                        "playlist_id": playlist_id,
+                        "scope_id": scope_id,
+                    }
+                    try:
+                        track_rows = list(self._track_rows(key, json.loads(tracks)))
+                    except (AttributeError, TypeError, ValueError):
+                        # Keep the JSON so the tracks can still be recovered by hand
+                        log.warning(
+                            "Skipping the migration of playlist %s (scope %s, %s):"
+                            " its tracks are not a valid JSON track list",
+                            playlist_id,
+                            scope_type,
+                            scope_id,
+                        )
+                        continue
+                    transaction.execute(self.statement.delete_tracks, key)
+                    transaction.executemany(self.statement.insert_track, track_rows)
+                    transaction.execute(self.statement.clear_json_tracks, key)
+                    migrated += 1
+
+    @staticmethod
+    def _track_rows(
+        key: MutableMapping, tracks: Iterable[MutableMapping], start: int = 0
+    ) -> Iterator[MutableMapping]:
+        for position, track in enumerate(tracks or [], start=start):
+            yield {
+                **key,
+                "position": position,
+                "identifier": track.get("track") or "",
+                "uri": (track.get("info") or {}).get("uri"),
+                "data": json.dumps({k: v for k, v in track.items() if k != "track"}),
+            }
+
+    @staticmethod
+    def _track_from_row(identifier: str, data: str) -> MutableMapping:
+        return {"track": identifier, **json.loads(data)}
+
+    def _key(self, scope: str, playlist_id: int, scope_id: int) -> MutableMapping:
+        return {
+            "scope_type": self.get_scope_type(scope),
+            "playlist_id": int(playlist_id),
+            "scope_id": int(scope_id),
+        }
 
     @staticmethod
     def get_scope_type(scope: str) -> int:
@@ -85,35 +197,29 @@ class PlaylistWrapper:
         return table
 
     async def fetch(
-        self, scope: str, playlist_id: int, scope_id: int
+        self, scope: str, playlist_id: int, scope_id: int, include_tracks: bool = True
     ) -> Optional[PlaylistFetchResult]:
-        """Fetch a single playlist."""
+        """Fetch a single playlist, without its tracks if ``include_tracks`` is False."""
         scope_type = self.get_scope_type(scope)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [
-                    executor.submit(
-                        self.database.cursor().execute,
-                        self.statement.get_one,
-                        (
-                            {
-                                "playlist_id": playlist_id,
-                                "scope_id": scope_id,
-                                "scope_type": scope_type,
-                            }
-                        ),
-                    )
-                ]
-            ):
-                try:
-                    row_result = future.result()
-                except Exception as exc:
-                    debug_exc_log(log, exc, "Failed to complete playlist fetch from database")
-                    return None
-            row = row_result.fetchone()
-            if row:
-                row = PlaylistFetchResult(*row)
+        try:
+            row = await self.database.fetchone(
+                self.statement.get_one,
+                (
+                    {
+                        "playlist_id": playlist_id,
+                        "scope_id": scope_id,
+                        "scope_type": scope_type,
+                    }
+                ),
+            )
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to complete playlist fetch from database")
+            return None
+        if row:
+            row = PlaylistFetchResult(*row)
+            if row.tracks is None and include_tracks:
+                row.tracks = await self.fetch_tracks(scope, row.playlist_id, row.scope_id)
         return row
 
     async def fetch_all(
@@ -121,52 +227,35 @@ class PlaylistWrapper:
     ) -> List[PlaylistFetchResult]:
         """Fetch all playlists."""
         scope_type = self.get_scope_type(scope)
-        output = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        try:
             if author_id is not None:
-                for future in concurrent.futures.as_completed(
-                    [
-                        executor.submit(
-                            self.database.cursor().execute,
-                            self.statement.get_all_with_filter,
-                            (
-                                {
-                                    "scope_type": scope_type,
-                                    "scope_id": scope_id,
-                                    "author_id": author_id,
-                                }
-                            ),
-                        )
-                    ]
-                ):
-                    try:
-                        row_result = future.result()
-                    except Exception as exc:
-                        debug_exc_log(log, exc, "Failed to complete playlist fetch from database")
-                        return []
+                row_result = await self.database.fetchall(
+                    self.statement.get_all_with_filter,
+                    (
+                        {
+                            "scope_type": scope_type,
+                            "scope_id": scope_id,
+                            "author_id": author_id,
+                        }
+                    ),
+                )
             else:
-                for future in concurrent.futures.as_completed(
-                    [
-                        executor.submit(
-                            self.database.cursor().execute,
-                            self.statement.get_all,
-                            ({"scope_type": scope_type, "scope_id": scope_id}),
-                        )
-                    ]
-                ):
-                    try:
-                        row_result = future.result()
-                    except Exception as exc:
-                        debug_exc_log(log, exc, "Failed to complete playlist fetch from database")
-                        return []
-        async for row in AsyncIter(row_result):
-            output.append(PlaylistFetchResult(*row))
-        return output
+                row_result = await self.database.fetchall(
+                    self.statement.get_all,
+                    ({"scope_type": scope_type, "scope_id": scope_id}),
+                )
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to complete playlist fetch from database")
+            return []
+        return await self._with_tracks(scope_type, row_result)
 
     async def fetch_all_converter(
-        self, scope: str, playlist_name, playlist_id
+        self, scope: str, playlist_name, playlist_id, include_tracks: bool = True
     ) -> List[PlaylistFetchResult]:
-        """Fetch all playlists with the specified filter."""
+        """Fetch all playlists with the specified filter.
+
+        Tracks kept in playlist_tracks are not read when ``include_tracks`` is False.
+        """
         scope_type = self.get_scope_type(scope)
         try:
             playlist_id = int(playlist_id)
@@ -174,62 +263,149 @@ class PlaylistWrapper:
             debug_exc_log(log, exc, "Failed converting playlist_id to int")
             playlist_id = -1
 
-        output = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [
-                    executor.submit(
-                        self.database.cursor().execute,
-                        self.statement.get_all_converter,
-                        (
-                            {
-                                "scope_type": scope_type,
-                                "playlist_name": playlist_name,
-                                "playlist_id": playlist_id,
-                            }
-                        ),
-                    )
-                ]
-            ):
-                try:
-                    row_result = future.result()
-                except Exception as exc:
-                    debug_exc_log(log, exc, "Failed to complete fetch from database")
-                    return []
-
-            async for row in AsyncIter(row_result):
-                output.append(PlaylistFetchResult(*row))
+        try:
+            row_result = await self.database.fetchall(
+                self.statement.get_all_converter,
+                (
+                    {
+                        "scope_type": scope_type,
+                        "playlist_name": playlist_name,
+                        "playlist_id": playlist_id,
+                    }
+                ),
+            )
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to complete fetch from database")
+            return []
+        if not include_tracks:
+            return [PlaylistFetchResult(*row) async for row in AsyncIter(row_result)]
+        return await self._with_tracks(scope_type, row_result)
+
+    async def _with_tracks(self, scope_type: int, rows: List[Tuple]) -> List[PlaylistFetchResult]:
+        """Build fetch results, reading the tracks of every playlist in one worker call."""
+        output = [PlaylistFetchResult(*row) async for row in AsyncIter(rows)]
+        keys = [
+            {
+                "scope_type": scope_type,
+                "playlist_id": result.playlist_id,
+                "scope_id": result.scope_id,
+            }
+            for result in output
+            if result.tracks is None
+        ]
+        try:
+            tracks = await self.database.run(self._fetch_tracks_many, keys)
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to fetch playlist tracks from database")
+            return []
+        tracks = iter(tracks)
+        for result in output:
+            if result.tracks is None:
+                result.tracks = next(tracks)
         return output
 
+    def _fetch_tracks_many(self, keys: List[MutableMapping]) -> List[List[MutableMapping]]:
+        cursor = self.database.connection.cursor()
+        return [
+            [
+                self._track_from_row(*row)
+                for row in cursor.execute(
+                    self.statement.get_tracks, {**key, "limit": -1, "offset": 0}
+                ).fetchall()
+            ]
+            for key in keys
+        ]
+
+    async def fetch_tracks(
+        self, scope: str, playlist_id: int, scope_id: int, offset: int = 0, limit: int = -1
+    ) -> List[MutableMapping]:
+        """Fetch the tracks of a playlist in order, a page at a time when ``limit`` is set."""
+        rows = await self.database.fetchall(
+            self.statement.get_tracks,
+            {**self._key(scope, playlist_id, scope_id), "limit": limit, "offset": offset},
+        )
+        return [self._track_from_row(*row) for row in rows]
+
+    async def count_tracks(self, scope: str, playlist_id: int, scope_id: int) -> int:
+        """Count the tracks of a playlist without reading them."""
+        (count,) = await self.database.fetchone(
+            self.statement.count_tracks, self._key(scope, playlist_id, scope_id)
+        )
+        return count
+
+    async def existing_identifiers(
+        self, scope: str, playlist_id: int, scope_id: int, identifiers: Iterable[str]
+    ) -> Set[str]:
+        """Return which of ``identifiers`` are already in a playlist without reading its tracks."""
+        rows = await self.database.fetchall(
+            self.statement.get_existing_identifiers,
+            {
+                **self._key(scope, playlist_id, scope_id),
+                "identifiers": json.dumps(list(identifiers)),
+            },
+        )
+        return {identifier for (identifier,) in rows}
+
+    async def append_tracks(
+        self, scope: str, playlist_id: int, scope_id: int, tracks: List[MutableMapping]
+    ) -> None:
+        """Add tracks to the end of a playlist without rewriting the existing ones."""
+        await self.database.run(
+            self._append_tracks, self._key(scope, playlist_id, scope_id), tracks
+        )
+
+    def _append_tracks(self, key: MutableMapping, tracks: List[MutableMapping]) -> None:
+        with self.database.connection.transaction() as transaction:
+            (start,) = transaction.execute(self.statement.next_track_position, key).fetchone()
+            transaction.executemany(
+                self.statement.insert_track, self._track_rows(key, tracks, start)
+            )
+
+    async def remove_track_at(
+        self, scope: str, playlist_id: int, scope_id: int, index: int
+    ) -> bool:
+        """Remove the track at ``index``, returning whether there was one."""
+        removed = await self.database.execute_changes(
+            self.statement.delete_track_at,
+            {**self._key(scope, playlist_id, scope_id), "index": index},
+        )
+        return bool(removed)
+
+    async def remove_uri(self, scope: str, playlist_id: int, scope_id: int, uri: str) -> int:
+        """Remove every track with this URI, returning how many were removed."""
+        return await self.database.execute_changes(
+            self.statement.delete_track_uri,
+            {**self._key(scope, playlist_id, scope_id), "uri": uri},
+        )
+
+    async def remove_duplicates(self, scope: str, playlist_id: int, scope_id: int) -> int:
+        """Keep only the first copy of every track, returning how many were removed."""
+        return await self.database.execute_changes(
+            self.statement.delete_track_duplicates,
+            self._key(scope, playlist_id, scope_id),
+        )
+
     async def delete(self, scope: str, playlist_id: int, scope_id: int):
         """Deletes a single playlists."""
         scope_type = self.get_scope_type(scope)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(
-                self.database.cursor().execute,
-                self.statement.delete,
-                ({"playlist_id": playlist_id, "scope_id": scope_id, "scope_type": scope_type}),
-            )
+        await self.database.execute(
+            self.statement.delete,
+            ({"playlist_id": playlist_id, "scope_id": scope_id, "scope_type": scope_type}),
+        )
 
-    async def delete_scheduled(self):
-        """Clean up database from all deleted playlists."""
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(self.database.cursor().execute, self.statement.delete_scheduled)
+    async def delete_scheduled(self) -> int:
+        """Clean up database from all deleted playlists, returning how many were removed."""
+        return await self.database.delete_chunked(self.statement.delete_scheduled)
 
     async def drop(self, scope: str):
         """Delete all playlists in a scope."""
         scope_type = self.get_scope_type(scope)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(
-                self.database.cursor().execute,
-                self.statement.delete_scope,
-                ({"scope_type": scope_type}),
-            )
+        await self.database.execute(self.statement.delete_scope, ({"scope_type": scope_type}))
 
     async def create_table(self):
-        """Create the playlist table."""
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(self.database.cursor().execute, PLAYLIST_CREATE_TABLE)
+        """Create the playlist tables."""
+        await self.database.execute(PLAYLIST_CREATE_TABLE)
+        await self.create_tracks_table()
 
     async def upsert(
         self,
@@ -239,29 +415,34 @@ class PlaylistWrapper:
         scope_id: int,
         author_id: int,
         playlist_url: Optional[str],
-        tracks: List[MutableMapping],
+        tracks: Optional[List[MutableMapping]],
     ):
-        """Insert or update a playlist into the database."""
+        """Insert or update a playlist into the database.
+
+        The stored tracks are replaced by ``tracks``, or left alone when it is ``None``.
+        """
         scope_type = self.get_scope_type(scope)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(
-                self.database.cursor().execute,
+        batches = [
+            (
                 self.statement.upsert,
-                {
-                    "scope_type": str(scope_type),
-                    "playlist_id": int(playlist_id),
-                    "playlist_name": str(playlist_name),
-                    "scope_id": int(scope_id),
-                    "author_id": int(author_id),
-                    "playlist_url": playlist_url,
-                    "tracks": json.dumps(tracks),
-                },
+                [
+                    {
+                        "scope_type": str(scope_type),
+                        "playlist_id": int(playlist_id),
+                        "playlist_name": str(playlist_name),
+                        "scope_id": int(scope_id),
+                        "author_id": int(author_id),
+                        "playlist_url": playlist_url,
+                    }
+                ],
             )
+        ]
+        if tracks is not None:
+            key = self._key(scope, playlist_id, scope_id)
+            batches.append((self.statement.delete_tracks, [key]))
+            batches.append((self.statement.insert_track, self._track_rows(key, tracks)))
+            batches.append((self.statement.clear_json_tracks, [key]))
+        await self.database.execute_batch(batches)
 
     async def handle_playlist_user_id_deletion(self, user_id: int):
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(
-                self.database.cursor().execute,
-                self.statement.drop_user_playlists,
-                {"user_id": user_id},
-            )
+        await self.database.execute(self.statement.drop_user_playlists, {"user_id": user_id})
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import contextlib
 import json
@@ -30,6 +31,10 @@ TOKEN_ENDPOINT = "https://accounts.spotify.com/api/token"
 ALBUMS_ENDPOINT = "https://api.spotify.com/v1/albums"
 TRACKS_ENDPOINT = "https://api.spotify.com/v1/tracks"
 PLAYLISTS_ENDPOINT = "https://api.spotify.com/v1/playlists"
+# How many times a request is retried after Spotify answers with 429 Too Many Requests.
+_RATE_LIMIT_RETRIES = 3
+# Longest Retry-After, in seconds, worth waiting for; a longer one fails the request instead.
+_RATE_LIMIT_MAX_WAIT = 30
 
 
 class SpotifyWrapper:
@@ -99,11 +104,24 @@ class SpotifyWrapper:
         """Make a GET request to the spotify API."""
         if params is None:
             params = {}
-        async with self.session.request("GET", url, params=params, headers=headers) as r:
-            data = await r.json(loads=json.loads)
-            if r.status != 200:
-                log.debug("Issue making GET request to %r: [%d] %r", url, r.status, data)
-            return data
+        for attempt in range(_RATE_LIMIT_RETRIES + 1):
+            async with self.session.request("GET", url, params=params, headers=headers) as r:
+                data = await r.json(loads=json.loads)
+                if r.status != 429 or attempt == _RATE_LIMIT_RETRIES:
+                    if r.status != 200:
+                        log.debug("Issue making GET request to %r: [%d] %r", url, r.status, data)
+                    return data
+                try:
+                    retry_after = max(int(r.headers.get("Retry-After", 1)), 1)
+                except ValueError:
+                    retry_after = 1
+                if retry_after > _RATE_LIMIT_MAX_WAIT:
+                    log.debug(
+                        "Rate limited by Spotify on %r for %ds, not retrying", url, retry_after
+                    )
+                    return data
+            log.debug("Rate limited by Spotify on %r, retrying in %ds", url, retry_after)
+            await asyncio.sleep(retry_after)
 
     async def update_token(self, new_token: Mapping[str, str]):
         self._token = new_token
@@ -164,6 +182,11 @@ class SpotifyWrapper:
         token = await self.get_access_token()
         return await self.get(url, params=params, headers={"Authorization": f"Bearer {token}"})
 
+    async def get_playlist_snapshot_id(self, key: str) -> Optional[str]:
+        """Get the current snapshot id of a Spotify playlist."""
+        result = await self.make_get_call(f"{PLAYLISTS_ENDPOINT}/{key}", {"fields": "snapshot_id"})
+        return result.get("snapshot_id")
+
     async def get_categories(self, ctx: Context = None) -> List[MutableMapping]:
         """Get the spotify categories."""
         country_code = await self.get_country_code(ctx=ctx)
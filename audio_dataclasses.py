@@ -1,4 +1,5 @@
 import contextlib
+import copy
 import glob
 import logging
 import ntpath
@@ -25,6 +26,8 @@ import lavalink
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
 
+from .utils import LRUCache
+
 _ = Translator("Audio", Path(__file__))
 
 _RE_REMOVE_START: Final[Pattern] = re.compile(r"^(sc|list) ")
@@ -34,7 +37,10 @@ _RE_SPOTIFY_URL: Final[Pattern] = re.compile(r"(http[s]?://)?(open\.spotify\.com
 _RE_SPOTIFY_TIMESTAMP: Final[Pattern] = re.compile(r"#(\d+):(\d+)")
 _RE_SOUNDCLOUD_TIMESTAMP: Final[Pattern] = re.compile(r"#t=(\d+):(\d+)s?")
 _RE_TWITCH_TIMESTAMP: Final[Pattern] = re.compile(r"\?t=(\d+)h(\d+)m(\d+)s")
+_RE_URL_SCHEME: Final[Pattern] = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.\-]*://")
 _PATH_SEPS: Final[Tuple[str, str]] = (posixpath.sep, ntpath.sep)
+# Parsed remote queries, keyed on the input, the local tracks folder and the extra arguments
+_QUERY_CACHE: Final[LRUCache] = LRUCache(max_entries=4096)
 
 _FULLY_SUPPORTED_MUSIC_EXT: Final[Tuple[str, ...]] = (".mp3", ".flac", ".ogg")
 _PARTIALLY_SUPPORTED_MUSIC_EXT: Tuple[str, ...] = (
@@ -89,6 +95,8 @@ class LocalPath:
     `localtracks`.
     """
 
+    __slots__ = ("_localtrack_folder", "_path", "localtrack_folder", "path", "_parent", "_hash")
+
     _all_music_ext = _FULLY_SUPPORTED_MUSIC_EXT + _PARTIALLY_SUPPORTED_MUSIC_EXT
 
     def __init__(self, path, localtrack_folder, **kwargs):
@@ -99,7 +107,6 @@ class LocalPath:
         elif path is not None:
             path = str(path)
 
-        self.cwd = Path.cwd()
         _lt_folder = Path(self._localtrack_folder) if self._localtrack_folder else self.cwd
         _path = Path(path) if path else self.cwd
         if _lt_folder.parts[-1].lower() == "localtracks" and not kwargs.get("forced"):
@@ -124,14 +131,29 @@ class LocalPath:
                     path = path.replace(f"localtracks{sep}", "", 1)
             self.path = self.localtrack_folder.joinpath(path) if path else self.localtrack_folder
 
+    @property
+    def cwd(self) -> Path:
+        return Path.cwd()
+
+    @property
+    def parent(self) -> Optional[Path]:
+        """The folder of this track, or the path itself if it is a folder.
+
+        Only looked up on disk the first time it is needed.
+        """
+        try:
+            return self._parent
+        except AttributeError:
+            pass
         try:
             if self.path.is_file():
                 parent = self.path.parent
             else:
                 parent = self.path
-            self.parent = Path(parent)
+            self._parent = Path(parent)
         except OSError:
-            self.parent = None
+            self._parent = None
+        return self._parent
 
     @property
     def name(self):
@@ -324,11 +346,47 @@ class Query:
     Use: Query.process_input(query, localtrack_folder) to generate the Query object.
     """
 
+    __slots__ = (
+        "_raw",
+        "_local_folder_current_path",
+        "valid",
+        "is_local",
+        "is_spotify",
+        "is_youtube",
+        "is_soundcloud",
+        "is_bandcamp",
+        "is_vimeo",
+        "is_mixer",
+        "is_twitch",
+        "is_other",
+        "is_pornhub",
+        "is_playlist",
+        "is_album",
+        "is_search",
+        "is_stream",
+        "single_track",
+        "id",
+        "invoked_from",
+        "local_name",
+        "search_subfolders",
+        "spotify_uri",
+        "uri",
+        "is_url",
+        "start_time",
+        "track_index",
+        "local_track_path",
+        "track",
+        "_lavalink_query",
+        "_hash",
+    )
+
     def __init__(self, query: Union[LocalPath, str], local_folder_current_path: Path, **kwargs):
         query = kwargs.get("queryforced", query)
         self._raw: Union[LocalPath, str] = query
         self._local_folder_current_path = local_folder_current_path
-        _localtrack: LocalPath = LocalPath(query, local_folder_current_path)
+        _localtrack: Optional[LocalPath] = None
+        if not kwargs.get("remote", False):
+            _localtrack = LocalPath(query, local_folder_current_path)
 
         self.valid: bool = query != "InvalidQueryPlaceHolderName"
         self.is_local: bool = kwargs.get("local", False)
@@ -360,7 +418,11 @@ class Query:
             self.is_youtube = False
             self.is_soundcloud = True
 
-        if (_localtrack.is_file() or _localtrack.is_dir()) and _localtrack.exists():
+        if (
+            _localtrack is not None
+            and (_localtrack.is_file() or _localtrack.is_dir())
+            and _localtrack.exists()
+        ):
             self.local_track_path: Optional[LocalPath] = _localtrack
             self.track: str = str(_localtrack.absolute())
             self.is_local: bool = True
@@ -369,34 +431,8 @@ class Query:
             self.local_track_path: Optional[LocalPath] = None
             self.track: str = str(query)
 
-        self.lavalink_query: str = self._get_query()
-
         if self.is_playlist or self.is_album:
             self.single_track = False
-        self._hash = hash(
-            (
-                self.valid,
-                self.is_local,
-                self.is_spotify,
-                self.is_youtube,
-                self.is_soundcloud,
-                self.is_bandcamp,
-                self.is_vimeo,
-                self.is_mixer,
-                self.is_twitch,
-                self.is_other,
-                self.is_playlist,
-                self.is_album,
-                self.is_search,
-                self.is_stream,
-                self.single_track,
-                self.id,
-                self.spotify_uri,
-                self.start_time,
-                self.track_index,
-                self.uri,
-            )
-        )
 
     def __str__(self):
         return str(self.lavalink_query)
@@ -424,9 +460,12 @@ class Query:
         if not query:
             query = "InvalidQueryPlaceHolderName"
         possible_values = {}
+        # Searches can never be local tracks, so they skip the filesystem
+        remote = False
 
         if isinstance(query, str):
             query = query.strip("<>")
+            remote = "ytsearch:" in query or "scsearch:" in query
             while "ytsearch:" in query:
                 query = query.replace("ytsearch:", "")
             while "scsearch:" in query:
@@ -440,13 +479,43 @@ class Query:
             possible_values["stream"] = query.is_stream
             query = query.uri
 
+        cache_key = None
+        if isinstance(query, str):
+            # Neither can URLs nor Spotify URIs
+            remote = remote or query.startswith("spotify:") or bool(_RE_URL_SCHEME.match(query))
+        if remote:
+            # Only remote inputs are cached, local ones depend on what is on disk right now
+            cache_key = (
+                query,
+                possible_values.get("stream"),
+                str(_local_folder_current_path),
+                tuple(sorted(kwargs.items())),
+            )
+            try:
+                cached = _QUERY_CACHE.get(cache_key)
+            except TypeError:
+                cache_key = cached = None
+            if cached is not None:
+                return copy.copy(cached)
+
         possible_values.update(dict(**kwargs))
-        possible_values.update(cls._parse(query, _local_folder_current_path, **kwargs))
-        return cls(query, _local_folder_current_path, **possible_values)
+        possible_values.update(
+            cls._parse(query, _local_folder_current_path, remote=remote, **kwargs)
+        )
+        possible_values["remote"] = remote
+        result = cls(query, _local_folder_current_path, **possible_values)
+        if cache_key is not None:
+            _QUERY_CACHE.put(cache_key, copy.copy(result))
+        return result
 
     @staticmethod
-    def _parse(track, _local_folder_current_path: Path, **kwargs) -> MutableMapping:
-        """Parse a track into all the relevant metadata."""
+    def _parse(
+        track, _local_folder_current_path: Path, remote: bool = False, **kwargs
+    ) -> MutableMapping:
+        """Parse a track into all the relevant metadata.
+
+        ``remote`` inputs are known not to be local tracks and are not looked up on disk.
+        """
         returning: MutableMapping = {}
         if (
             type(track) == type(LocalPath)
@@ -487,8 +556,8 @@ class Query:
                 track = _RE_REMOVE_START.sub("", track, 1)
                 returning["queryforced"] = track
 
-            _localtrack = LocalPath(track, _local_folder_current_path)
-            if _localtrack.exists():
+            _localtrack = None if remote else LocalPath(track, _local_folder_current_path)
+            if _localtrack is not None and _localtrack.exists():
                 if _localtrack.is_file():
                     returning["local"] = True
                     returning["single"] = True
@@ -607,6 +676,15 @@ class Query:
                 returning["single"] = True
         return returning
 
+    @property
+    def lavalink_query(self) -> str:
+        """The identifier to load from Lavalink, worked out the first time it is needed."""
+        try:
+            return self._lavalink_query
+        except AttributeError:
+            self._lavalink_query = self._get_query()
+            return self._lavalink_query
+
     def _get_query(self):
         if self.is_local:
             return self.local_track_path.to_string()
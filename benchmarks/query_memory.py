@@ -0,0 +1,82 @@
+"""Measure how much memory each Query and LocalPath object holds, with tracemalloc.
+
+Usage, from the root of this checkout with Red installed::
+
+    python benchmarks/query_memory.py [--count 100000]
+
+Every object is kept alive until its batch is measured, so the figures are
+the retained size per object, including the strings and paths it references.
+"""
+
+import argparse
+import gc
+import importlib.util
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from redbot.core import data_manager
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _import_audio():
+    # The cog resolves its data path at import time
+    data_manager.basic_config = {
+        **data_manager.basic_config_default,
+        "DATA_PATH": tempfile.mkdtemp(),
+        "STORAGE_TYPE": "JSON",
+        "STORAGE_DETAILS": {},
+    }
+    spec = importlib.util.spec_from_file_location(
+        "audio", _ROOT / "__init__.py", submodule_search_locations=[str(_ROOT)]
+    )
+    sys.modules["audio"] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sys.modules["audio"])
+    return importlib.import_module("audio.audio_dataclasses")
+
+
+def measure(make: Callable[[int], object], count: int) -> float:
+    """Return the bytes retained per object built by ``make``."""
+    gc.collect()
+    tracemalloc.start()
+    objects = [make(i) for i in range(count)]
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="objects per measurement")
+    args = parser.parse_args()
+
+    dataclasses = _import_audio()
+    Query, LocalPath = dataclasses.Query, dataclasses.LocalPath
+    folder = Path(tempfile.mkdtemp())
+    (folder / "localtracks").mkdir()
+
+    results = {
+        "Query (URL)": measure(
+            lambda i: Query(f"https://www.youtube.com/watch?v={i:011d}", folder), args.count
+        ),
+        "Query (local)": measure(
+            lambda i: Query(
+                LocalPath(folder / "localtracks" / "album" / f"{i}.mp3", folder), folder
+            ),
+            args.count,
+        ),
+        "LocalPath": measure(
+            lambda i: LocalPath(folder / "localtracks" / "album" / f"{i}.mp3", folder),
+            args.count,
+        ),
+    }
+    for name, size in results.items():
+        print(f"{name:<15}{size:>8.0f} B/object")
+
+
+if __name__ == "__main__":
+    main()
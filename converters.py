@@ -142,7 +142,10 @@ async def global_unique_user_finder(
 
 class PlaylistConverter(commands.Converter):
     async def convert(self, ctx: commands.Context, arg: str) -> MutableMapping:
-        """Get playlist for all scopes that match the argument user provided"""
+        """Get playlist for all scopes that match the argument user provided.
+
+        Tracks are only read for the playlist `get_playlist_match` settles on.
+        """
         cog = ctx.cog
         user_matches = []
         guild_matches = []
@@ -155,6 +158,7 @@ class PlaylistConverter(commands.Converter):
                 arg,
                 guild=ctx.guild,
                 author=ctx.author,
+                include_tracks=False,
             )
             guild_matches = await get_all_playlist_converter(
                 PlaylistScope.GUILD.value,
@@ -163,6 +167,7 @@ class PlaylistConverter(commands.Converter):
                 arg,
                 guild=ctx.guild,
                 author=ctx.author,
+                include_tracks=False,
             )
             user_matches = await get_all_playlist_converter(
                 PlaylistScope.USER.value,
@@ -171,6 +176,7 @@ class PlaylistConverter(commands.Converter):
                 arg,
                 guild=ctx.guild,
                 author=ctx.author,
+                include_tracks=False,
             )
         if not user_matches and not guild_matches and not global_matches:
             raise commands.BadArgument(_("Could not match '{}' to a playlist.").format(arg))
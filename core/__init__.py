@@ -50,6 +50,7 @@ class Audio(
         self.playlist_api = None
         self.local_folder_current_path = None
         self.db_conn = None
+        self.db_executor = None
 
         self._error_counter = Counter()
         self._error_timer = {}
@@ -59,12 +60,21 @@ class Audio(
         self._persist_queue_cache = {}
         self._dj_status_cache = {}
         self._dj_role_cache = {}
+        self._settings_cache = {}
+        self._settings_cache_generation = Counter()
         self.skip_votes = {}
         self.play_lock = {}
+        self._spotify_enqueue_tasks = {}
+        self._empty_channel_since = {}
+        self._empty_channel_deadlines = {}
+        self._empty_channel_timers = []
+        self._empty_channel_wakeup = asyncio.Event()
+        self._maintenance_wakeup = asyncio.Event()
 
         self.lavalink_connect_task = None
         self._restore_task = None
         self.player_automated_timer_task = None
+        self.database_maintenance_task = None
         self.cog_cleaned_up = False
         self.lavalink_connection_aborted = False
         self.permission_cache = discord.Permissions(
@@ -97,9 +107,12 @@ class Audio(
             owner_notification=0,
             cache_level=CacheLevel.all().value,
             cache_age=365,
+            cache_compression=True,
+            maintenance_interval=3600,
             daily_playlists=False,
             global_db_enabled=False,
             global_db_get_timeout=5,
+            spotify_resolve_concurrency=4,
             status=False,
             use_external_lavalink=False,
             restrict=True,
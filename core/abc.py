@@ -6,6 +6,7 @@ import datetime
 from abc import ABC, abstractmethod
 from collections import Counter, defaultdict
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Set, TYPE_CHECKING, Any, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 import aiohttp
@@ -18,6 +19,7 @@ from redbot.core.commands import Context
 from redbot.core.utils.dbtools import APSWConnectionWrapper
 
 if TYPE_CHECKING:
+    from ..apis.db_executor import DatabaseExecutor
     from ..apis.interface import AudioAPIInterface
     from ..apis.playlist_interface import Playlist
     from ..apis.playlist_wrapper import PlaylistWrapper
@@ -39,15 +41,24 @@ class MixinMeta(ABC):
     playlist_api: Optional["PlaylistWrapper"]
     local_folder_current_path: Optional[Path]
     db_conn: Optional[APSWConnectionWrapper]
+    db_executor: Optional["DatabaseExecutor"]
     session: aiohttp.ClientSession
 
     skip_votes: MutableMapping[int, Set[int]]
     play_lock: MutableMapping[int, bool]
+    _spotify_enqueue_tasks: MutableMapping[int, asyncio.Task]
+    _empty_channel_since: MutableMapping[int, float]
+    _empty_channel_deadlines: MutableMapping[int, float]
+    _empty_channel_timers: List[Tuple[float, int]]
+    _empty_channel_wakeup: asyncio.Event
+    _maintenance_wakeup: asyncio.Event
     _daily_playlist_cache: MutableMapping[int, bool]
     _daily_global_playlist_cache: MutableMapping[int, bool]
     _persist_queue_cache: MutableMapping[int, bool]
     _dj_status_cache: MutableMapping[int, Optional[bool]]
     _dj_role_cache: MutableMapping[int, Optional[int]]
+    _settings_cache: MutableMapping[Optional[int], SimpleNamespace]
+    _settings_cache_generation: Counter
     _error_timer: MutableMapping[int, float]
     _disconnected_players: MutableMapping[int, bool]
     global_api_user: MutableMapping[str, Any]
@@ -60,6 +71,7 @@ class MixinMeta(ABC):
     lavalink_connect_task: Optional[asyncio.Task]
     _restore_task: Optional[asyncio.Task]
     player_automated_timer_task: Optional[asyncio.Task]
+    database_maintenance_task: Optional[asyncio.Task]
     cog_init_task: Optional[asyncio.Task]
     cog_ready_event: asyncio.Event
     _ws_resume: defaultdict[Any, asyncio.Event]
@@ -103,6 +115,10 @@ class MixinMeta(ABC):
     def update_player_lock(self, ctx: commands.Context, true_or_false: bool) -> None:
         raise NotImplementedError()
 
+    @abstractmethod
+    def cancel_spotify_enqueue(self, guild_id: int) -> None:
+        raise NotImplementedError()
+
     @abstractmethod
     async def initialize(self) -> None:
         raise NotImplementedError()
@@ -123,6 +139,22 @@ class MixinMeta(ABC):
     async def player_automated_timer(self) -> None:
         raise NotImplementedError()
 
+    @abstractmethod
+    async def database_maintenance_timer(self) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def run_database_maintenance(self) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def update_empty_channel_state(self, guild: discord.Guild) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def reschedule_empty_channel_timer(self, guild_id: int) -> None:
+        raise NotImplementedError()
+
     @abstractmethod
     async def lavalink_event_handler(
         self, player: lavalink.Player, event_type: lavalink.LavalinkEvents, extra
@@ -281,6 +313,7 @@ class MixinMeta(ABC):
         author: discord.User,
         guild: discord.Guild,
         specified_user: bool = False,
+        include_tracks: bool = True,
     ) -> Tuple[Optional["Playlist"], str, str]:
         raise NotImplementedError()
 
@@ -448,6 +481,10 @@ class MixinMeta(ABC):
     ) -> List[str]:
         raise NotImplementedError()
 
+    @abstractmethod
+    async def _search_local_library(self, search_words: str) -> Optional[List[str]]:
+        raise NotImplementedError()
+
     @abstractmethod
     async def command_stop(self, ctx: commands.Context):
         raise NotImplementedError()
@@ -533,6 +570,18 @@ class MixinMeta(ABC):
     async def get_lyrics_status(self, ctx: Context) -> bool:
         raise NotImplementedError()
 
+    @abstractmethod
+    async def get_global_settings(self) -> SimpleNamespace:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_guild_settings(self, guild_id: int) -> SimpleNamespace:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def invalidate_settings_cache(self, guild_id: Optional[int] = None) -> None:
+        raise NotImplementedError()
+
     @abstractmethod
     async def restore_players(self) -> bool:
         raise NotImplementedError()
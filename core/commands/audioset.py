@@ -66,6 +66,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 exists = True
             else:
                 whitelist.append(keyword)
+        self.invalidate_settings_cache()
         if exists:
             return await self.send_embed_msg(ctx, title=_("Keyword already in the whitelist."))
         else:
@@ -111,6 +112,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         if not whitelist:
             return await self.send_embed_msg(ctx, title=_("Nothing in the whitelist."))
         await self.config.url_keyword_whitelist.clear()
+        self.invalidate_settings_cache()
         return await self.send_embed_msg(
             ctx,
             title=_("Whitelist Modified"),
@@ -131,6 +133,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 exists = False
             else:
                 whitelist.remove(keyword)
+        self.invalidate_settings_cache()
         if not exists:
             return await self.send_embed_msg(ctx, title=_("Keyword already in the whitelist."))
         else:
@@ -160,6 +163,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 exists = True
             else:
                 blacklist.append(keyword)
+        self.invalidate_settings_cache()
         if exists:
             return await self.send_embed_msg(ctx, title=_("Keyword already in the blacklist."))
         else:
@@ -205,6 +209,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         if not blacklist:
             return await self.send_embed_msg(ctx, title=_("Nothing in the blacklist."))
         await self.config.url_keyword_blacklist.clear()
+        self.invalidate_settings_cache()
         return await self.send_embed_msg(
             ctx,
             title=_("Blacklist Modified"),
@@ -225,6 +230,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 exists = False
             else:
                 blacklist.remove(keyword)
+        self.invalidate_settings_cache()
         if not exists:
             return await self.send_embed_msg(ctx, title=_("Keyword is not in the blacklist."))
         else:
@@ -256,6 +262,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 exists = True
             else:
                 whitelist.append(keyword)
+        self.invalidate_settings_cache(ctx.guild.id)
         if exists:
             return await self.send_embed_msg(ctx, title=_("Keyword already in the whitelist."))
         else:
@@ -301,6 +308,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         if not whitelist:
             return await self.send_embed_msg(ctx, title=_("Nothing in the whitelist."))
         await self.config.guild(ctx.guild).url_keyword_whitelist.clear()
+        self.invalidate_settings_cache(ctx.guild.id)
         return await self.send_embed_msg(
             ctx,
             title=_("Whitelist Modified"),
@@ -321,6 +329,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 exists = False
             else:
                 whitelist.remove(keyword)
+        self.invalidate_settings_cache(ctx.guild.id)
         if not exists:
             return await self.send_embed_msg(ctx, title=_("Keyword already in the whitelist."))
         else:
@@ -349,6 +358,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 exists = True
             else:
                 blacklist.append(keyword)
+        self.invalidate_settings_cache(ctx.guild.id)
         if exists:
             return await self.send_embed_msg(ctx, title=_("Keyword already in the blacklist."))
         else:
@@ -394,6 +404,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         if not blacklist:
             return await self.send_embed_msg(ctx, title=_("Nothing in the blacklist."))
         await self.config.guild(ctx.guild).url_keyword_blacklist.clear()
+        self.invalidate_settings_cache(ctx.guild.id)
         return await self.send_embed_msg(
             ctx,
             title=_("Blacklist Modified"),
@@ -414,6 +425,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 exists = False
             else:
                 blacklist.remove(keyword)
+        self.invalidate_settings_cache(ctx.guild.id)
         if not exists:
             return await self.send_embed_msg(ctx, title=_("Keyword is not in the blacklist."))
         else:
@@ -441,12 +453,15 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
             true_or_false=_("Enabled") if not autoplay else _("Disabled")
         )
         await self.config.guild(ctx.guild).auto_play.set(not autoplay)
+        self.invalidate_settings_cache(ctx.guild.id)
         if autoplay is not True and repeat is True:
             msg += _("\nRepeat has been disabled.")
             await self.config.guild(ctx.guild).repeat.set(False)
+            self.invalidate_settings_cache(ctx.guild.id)
         if autoplay is not True and disconnect is True:
             msg += _("\nAuto-disconnecting at queue end has been disabled.")
             await self.config.guild(ctx.guild).disconnect.set(False)
+            self.invalidate_settings_cache(ctx.guild.id)
 
         await self.send_embed_msg(ctx, title=_("Setting Changed"), description=msg)
         if self._player_check(ctx):
@@ -526,6 +541,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 )
             playlist_data = dict(enabled=True, id=playlist.id, name=playlist.name, scope=scope)
             await self.config.guild(ctx.guild).autoplaylist.set(playlist_data)
+            self.invalidate_settings_cache(ctx.guild.id)
         except RuntimeError:
             return await self.send_embed_msg(
                 ctx,
@@ -566,6 +582,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         )
 
         await self.config.guild(ctx.guild).autoplaylist.set(playlist_data)
+        self.invalidate_settings_cache(ctx.guild.id)
         return await self.send_embed_msg(
             ctx,
             title=_("Setting Changed"),
@@ -583,6 +600,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
             self.bot.user.id, await self.config.daily_playlists()
         )
         await self.config.daily_playlists.set(not daily_playlists)
+        self.invalidate_settings_cache()
         self._daily_global_playlist_cache[self.bot.user.id] = not daily_playlists
         await self.send_embed_msg(
             ctx,
@@ -604,6 +622,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
             ctx.guild.id, await self.config.guild(ctx.guild).daily_playlists()
         )
         await self.config.guild(ctx.guild).daily_playlists.set(not daily_playlists)
+        self.invalidate_settings_cache(ctx.guild.id)
         self._daily_playlist_cache[ctx.guild.id] = not daily_playlists
         await self.send_embed_msg(
             ctx,
@@ -631,8 +650,10 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         if disconnect is not True and autoplay is True:
             msg += _("\nAuto-play has been disabled.")
             await self.config.guild(ctx.guild).auto_play.set(False)
+            self.invalidate_settings_cache(ctx.guild.id)
 
         await self.config.guild(ctx.guild).disconnect.set(not disconnect)
+        self.invalidate_settings_cache(ctx.guild.id)
 
         await self.send_embed_msg(ctx, title=_("Setting Changed"), description=msg)
 
@@ -669,6 +690,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
             ctx.guild.id, await self.config.guild(ctx.guild).dj_enabled()
         )
         await self.config.guild(ctx.guild).dj_enabled.set(not dj_enabled)
+        self.invalidate_settings_cache(ctx.guild.id)
         self._dj_status_cache[ctx.guild.id] = not dj_enabled
         await self.send_embed_msg(
             ctx,
@@ -709,6 +731,8 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
 
         await self.config.guild(ctx.guild).emptydc_timer.set(seconds)
         await self.config.guild(ctx.guild).emptydc_enabled.set(enabled)
+        self.invalidate_settings_cache(ctx.guild.id)
+        await self.reschedule_empty_channel_timer(ctx.guild.id)
 
     @command_audioset.command(name="emptypause")
     @commands.guild_only()
@@ -737,6 +761,8 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
             )
         await self.config.guild(ctx.guild).emptypause_timer.set(seconds)
         await self.config.guild(ctx.guild).emptypause_enabled.set(enabled)
+        self.invalidate_settings_cache(ctx.guild.id)
+        await self.reschedule_empty_channel_timer(ctx.guild.id)
 
     @command_audioset.command(name="lyrics")
     @commands.guild_only()
@@ -745,6 +771,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         """優先處理有歌詞的曲目。"""
         prefer_lyrics = await self.config.guild(ctx.guild).prefer_lyrics()
         await self.config.guild(ctx.guild).prefer_lyrics.set(not prefer_lyrics)
+        self.invalidate_settings_cache(ctx.guild.id)
         await self.send_embed_msg(
             ctx,
             title=_("Setting Changed"),
@@ -779,6 +806,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
 
         await self.config.guild(ctx.guild).jukebox_price.set(price)
         await self.config.guild(ctx.guild).jukebox.set(jukebox)
+        self.invalidate_settings_cache(ctx.guild.id)
 
     @command_audioset.command(name="localpath")
     @commands.is_owner()
@@ -791,6 +819,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
 
         if not local_path:
             await self.config.localpath.set(str(cog_data_path(raw_name="Audio")))
+            self.invalidate_settings_cache()
             self.local_folder_current_path = cog_data_path(raw_name="Audio")
             return await self.send_embed_msg(
                 ctx,
@@ -848,6 +877,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
             await self.send_embed_msg(ctx, title=_("Invalid Environment"), description=warn_msg)
         local_path = str(temp.localtrack_folder.absolute())
         await self.config.localpath.set(local_path)
+        self.invalidate_settings_cache()
         self.local_folder_current_path = temp.localtrack_folder.absolute()
         return await self.send_embed_msg(
             ctx,
@@ -885,6 +915,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 ),
             )
         await self.config.guild(ctx.guild).maxlength.set(seconds)
+        self.invalidate_settings_cache(ctx.guild.id)
 
     @command_audioset.command(name="notify")
     @commands.guild_only()
@@ -893,6 +924,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         """切換 顯示曲目 和 其他機器人訊息。"""
         notify = await self.config.guild(ctx.guild).notify()
         await self.config.guild(ctx.guild).notify.set(not notify)
+        self.invalidate_settings_cache(ctx.guild.id)
         await self.send_embed_msg(
             ctx,
             title=_("Setting Changed"),
@@ -908,6 +940,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         """切換是否在加入語音頻道後自動使機器人拒聽。"""
         auto_deafen = await self.config.guild(ctx.guild).auto_deafen()
         await self.config.guild(ctx.guild).auto_deafen.set(not auto_deafen)
+        self.invalidate_settings_cache(ctx.guild.id)
         await self.send_embed_msg(
             ctx,
             title=_("Setting Changed"),
@@ -928,6 +961,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         """
         restrict = await self.config.restrict()
         await self.config.restrict.set(not restrict)
+        self.invalidate_settings_cache()
         await self.send_embed_msg(
             ctx,
             title=_("Setting Changed"),
@@ -942,6 +976,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
     async def command_audioset_role(self, ctx: commands.Context, *, role_name: discord.Role):
         """設定DJ身份組來使用DJ模式"""
         await self.config.guild(ctx.guild).dj_role.set(role_name.id)
+        self.invalidate_settings_cache(ctx.guild.id)
         self._dj_role_cache[ctx.guild.id] = role_name.id
         dj_role = self._dj_role_cache.setdefault(
             ctx.guild.id, await self.config.guild(ctx.guild).dj_role()
@@ -1186,6 +1221,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         """啟用/停用歌曲標題作為狀態。"""
         status = await self.config.status()
         await self.config.status.set(not status)
+        self.invalidate_settings_cache()
         await self.send_embed_msg(
             ctx,
             title=_("Setting Changed"),
@@ -1201,6 +1237,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         """切換在音樂資訊上顯示縮圖。"""
         thumbnail = await self.config.guild(ctx.guild).thumbnail()
         await self.config.guild(ctx.guild).thumbnail.set(not thumbnail)
+        self.invalidate_settings_cache(ctx.guild.id)
         await self.send_embed_msg(
             ctx,
             title=_("Setting Changed"),
@@ -1237,6 +1274,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
 
         await self.config.guild(ctx.guild).vote_percent.set(percent)
         await self.config.guild(ctx.guild).vote_enabled.set(enabled)
+        self.invalidate_settings_cache(ctx.guild.id)
 
     @command_audioset.command(name="youtubeapi")
     @commands.is_owner()
@@ -1296,6 +1334,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         )
 
         await self.config.guild(ctx.guild).country_code.set(country)
+        self.invalidate_settings_cache(ctx.guild.id)
 
     @command_audioset.command(name="mycountrycode")
     @commands.guild_only()
@@ -1319,7 +1358,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
 
         await self.config.user(ctx.author).country_code.set(country)
 
-    @command_audioset.command(name="cache")
+    @command_audioset.group(name="cache", invoke_without_command=True)
     @commands.is_owner()
     async def command_audioset_cache(self, ctx: commands.Context, *, level: int = None):
         """設定快取等級。
@@ -1354,6 +1393,20 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
                 youtube_status=_("Enabled") if has_youtube_cache else _("Disabled"),
                 lavalink_status=_("Enabled") if has_lavalink_cache else _("Disabled"),
             )
+            if self.api_interface is not None:
+                front_caches = self.api_interface.local_cache_api.front_cache_stats()
+                msg += "\n"
+                for table, front_cache in front_caches.items():
+                    msg += _(
+                        "{table} memory cache: [{ratio:.1%} hit ratio, {entries} entries]\n"
+                    ).format(
+                        table=table.capitalize(),
+                        ratio=front_cache.hit_ratio,
+                        entries=len(front_cache),
+                    )
+                msg += _("Coalesced lookups: [{count}]\n").format(
+                    count=self.api_interface.coalesced_loads
+                )
             await self.send_embed_msg(
                 ctx, title=_("Cache Settings"), description=box(msg, lang="ini")
             )
@@ -1403,6 +1456,25 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         await self.send_embed_msg(ctx, title=_("Cache Settings"), description=box(msg, lang="ini"))
 
         await self.config.cache_level.set(newcache.value)
+        self.invalidate_settings_cache()
+        if self.api_interface is not None:
+            self.api_interface.local_cache_api.clear_front_cache()
+
+    @command_audioset_cache.command(name="purgefailed")
+    async def command_audioset_cache_purgefailed(self, ctx: commands.Context):
+        """Forget every recently failed or empty lookup.
+
+        Failed searches are remembered for a short while so they are not retried
+        against Lavalink or the YouTube Data API on every request.
+        """
+        count = 0
+        if self.api_interface is not None:
+            count = await self.api_interface.local_cache_api.negative.purge()
+        await self.send_embed_msg(
+            ctx,
+            title=_("Setting Changed"),
+            description=_("Forgot {num} failed lookups.").format(num=count),
+        )
 
     @command_audioset.command(name="cacheage")
     @commands.is_owner()
@@ -1421,8 +1493,74 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
             age = 7
         msg += _("I've set the cache age to {age} days").format(age=age)
         await self.config.cache_age.set(age)
+        self.invalidate_settings_cache()
+        await self.send_embed_msg(ctx, title=_("Setting Changed"), description=msg)
+
+    @command_audioset.command(name="cachecompression")
+    @commands.is_owner()
+    async def command_audioset_cache_compression(self, ctx: commands.Context):
+        """Toggle compression of the Lavalink cache.
+
+        When enabled, new entries are stored compressed and existing entries
+        are recompressed in the background.
+        """
+        compression = not await self.config.cache_compression()
+        await self.config.cache_compression.set(compression)
+        self.invalidate_settings_cache()
+        if self.api_interface is not None:
+            self.api_interface.local_cache_api.lavalink.compression = compression
+            if compression:
+                self.api_interface.local_cache_api.lavalink.start_compression_migration()
+        await self.send_embed_msg(
+            ctx,
+            title=_("Setting Changed"),
+            description=_("Lavalink cache compression: {true_or_false}.").format(
+                true_or_false=_("Enabled") if compression else _("Disabled")
+            ),
+        )
+
+    @command_audioset.command(name="maintenance")
+    @commands.is_owner()
+    async def command_audioset_maintenance(self, ctx: commands.Context, minutes: int):
+        """Set how often the database housekeeping runs, in minutes.
+
+        Each run deletes expired cache entries, deleted playlists and played queue tracks,
+        then checkpoints the database.
+        """
+        msg = ""
+        if minutes < 5:
+            msg = _("Maintenance cannot run more often than every 5 minutes.\n")
+            minutes = 5
+        msg += _("Database maintenance will run every {minutes} minutes.").format(minutes=minutes)
+        await self.config.maintenance_interval.set(minutes * 60)
+        self.invalidate_settings_cache()
+        self._maintenance_wakeup.set()
         await self.send_embed_msg(ctx, title=_("Setting Changed"), description=msg)
 
+    @command_audioset.command(name="spotifyconcurrency")
+    @commands.is_owner()
+    async def command_audioset_spotify_concurrency(self, ctx: commands.Context, limit: int):
+        """Set how many Spotify tracks are matched at once while loading playlists.
+
+        Tracks are still added to the queue in playlist order.
+        Must be between 1 and 16, defaults to 4.
+        """
+        if not 1 <= limit <= 16:
+            return await self.send_embed_msg(
+                ctx,
+                title=_("Invalid Value"),
+                description=_("The limit must be between 1 and 16."),
+            )
+        await self.config.spotify_resolve_concurrency.set(limit)
+        self.invalidate_settings_cache()
+        await self.send_embed_msg(
+            ctx,
+            title=_("Setting Changed"),
+            description=_("Spotify tracks will now be matched {limit} at a time.").format(
+                limit=limit
+            ),
+        )
+
     @command_audioset.command(name="persistqueue")
     @commands.admin()
     async def command_audioset_persist_queue(self, ctx: commands.Context):
@@ -1434,6 +1572,7 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
             ctx.guild.id, await self.config.guild(ctx.guild).persist_queue()
         )
         await self.config.guild(ctx.guild).persist_queue.set(not persist_cache)
+        self.invalidate_settings_cache(ctx.guild.id)
         self._persist_queue_cache[ctx.guild.id] = not persist_cache
         await self.send_embed_msg(
             ctx,
@@ -1493,9 +1632,11 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
         current_volume = await self.config.guild(ctx.guild).volume()
         if current_volume > max_volume:
             await self.config.guild(ctx.guild).volume.set(max_volume)
+            self.invalidate_settings_cache(ctx.guild.id)
             if self._player_check(ctx):
                 player = lavalink.get_player(ctx.guild.id)
                 await player.set_volume(max_volume)
                 player.store("notify_channel", ctx.channel.id)
 
         await self.config.guild(ctx.guild).max_volume.set(max_volume)
+        self.invalidate_settings_cache(ctx.guild.id)
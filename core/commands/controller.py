@@ -64,6 +64,7 @@ class PlayerControllerCommands(MixinMeta, metaclass=CompositeMetaClass):
 
             await self.send_embed_msg(ctx, title=_("Disconnecting..."))
             self.bot.dispatch("red_audio_audio_disconnect", ctx.guild)
+            self.cancel_spotify_enqueue(ctx.guild.id)
             self.update_player_lock(ctx, False)
             eq = player.fetch("eq")
             player.queue = []
@@ -76,6 +77,7 @@ class PlayerControllerCommands(MixinMeta, metaclass=CompositeMetaClass):
             await self.config.guild_from_id(guild_id=ctx.guild.id).currently_auto_playing_in.set(
                 []
             )
+            self.invalidate_settings_cache(ctx.guild.id)
             self._ll_guild_updates.discard(ctx.guild.id)
             await self.api_interface.persistent_queue_api.drop(ctx.guild.id)
 
@@ -414,6 +416,7 @@ class PlayerControllerCommands(MixinMeta, metaclass=CompositeMetaClass):
 
             shuffle = await self.config.guild(ctx.guild).shuffle()
             await self.config.guild(ctx.guild).shuffle.set(not shuffle)
+            self.invalidate_settings_cache(ctx.guild.id)
             await self.send_embed_msg(
                 ctx,
                 title=_("Setting Changed"),
@@ -458,6 +461,7 @@ class PlayerControllerCommands(MixinMeta, metaclass=CompositeMetaClass):
 
         bumped = await self.config.guild(ctx.guild).shuffle_bumped()
         await self.config.guild(ctx.guild).shuffle_bumped.set(not bumped)
+        self.invalidate_settings_cache(ctx.guild.id)
         await self.send_embed_msg(
             ctx,
             title=_("Setting Changed"),
@@ -591,6 +595,7 @@ class PlayerControllerCommands(MixinMeta, metaclass=CompositeMetaClass):
                 description=_("You need the DJ role to stop the music."),
             )
         player.store("notify_channel", ctx.channel.id)
+        self.cancel_spotify_enqueue(ctx.guild.id)
         if (
             player.is_playing
             or (not player.is_playing and player.paused)
@@ -610,6 +615,7 @@ class PlayerControllerCommands(MixinMeta, metaclass=CompositeMetaClass):
             await self.config.guild_from_id(guild_id=ctx.guild.id).currently_auto_playing_in.set(
                 []
             )
+            self.invalidate_settings_cache(ctx.guild.id)
             await self.send_embed_msg(ctx, title=_("Stopping..."))
             await self.api_interface.persistent_queue_api.drop(ctx.guild.id)
 
@@ -729,6 +735,7 @@ class PlayerControllerCommands(MixinMeta, metaclass=CompositeMetaClass):
 
         vol = max(0, min(vol, max_volume))
         await self.config.guild(ctx.guild).volume.set(vol)
+        self.invalidate_settings_cache(ctx.guild.id)
         if self._player_check(ctx):
             player = lavalink.get_player(ctx.guild.id)
             await player.set_volume(vol)
@@ -774,9 +781,11 @@ class PlayerControllerCommands(MixinMeta, metaclass=CompositeMetaClass):
             true_or_false=_("Enabled") if not repeat else _("Disabled")
         )
         await self.config.guild(ctx.guild).repeat.set(not repeat)
+        self.invalidate_settings_cache(ctx.guild.id)
         if repeat is not True and autoplay is True:
             msg += _("\nAuto-play has been disabled.")
             await self.config.guild(ctx.guild).auto_play.set(False)
+            self.invalidate_settings_cache(ctx.guild.id)
 
         embed = discord.Embed(title=_("Setting Changed"), description=msg)
         await self.send_embed_msg(ctx, embed=embed)
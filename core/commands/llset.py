@@ -39,6 +39,7 @@ class LavalinkSetupCommands(MixinMeta, metaclass=CompositeMetaClass):
             )
         if java_path is None:
             await self.config.java_exc_path.clear()
+            self.invalidate_settings_cache()
             await self.send_embed_msg(
                 ctx,
                 title=_("Java Executable Reset"),
@@ -56,6 +57,7 @@ class LavalinkSetupCommands(MixinMeta, metaclass=CompositeMetaClass):
                     ),
                 )
             await self.config.java_exc_path.set(str(exc_absolute))
+            self.invalidate_settings_cache()
             await self.send_embed_msg(
                 ctx,
                 title=_("Java Executable Changed"),
@@ -93,6 +95,7 @@ class LavalinkSetupCommands(MixinMeta, metaclass=CompositeMetaClass):
         """Toggle using external Lavalink servers."""
         external = await self.config.use_external_lavalink()
         await self.config.use_external_lavalink.set(not external)
+        self.invalidate_settings_cache()
 
         if external:
             embed = discord.Embed(
@@ -142,6 +145,7 @@ class LavalinkSetupCommands(MixinMeta, metaclass=CompositeMetaClass):
     async def command_llsetup_host(self, ctx: commands.Context, host: str):
         """Set the Lavalink server host."""
         await self.config.host.set(host)
+        self.invalidate_settings_cache()
         footer = None
         if await self.update_external_status():
             footer = _("External Lavalink server set to True.")
@@ -166,6 +170,7 @@ class LavalinkSetupCommands(MixinMeta, metaclass=CompositeMetaClass):
     async def command_llsetup_password(self, ctx: commands.Context, password: str):
         """Set the Lavalink server password."""
         await self.config.password.set(str(password))
+        self.invalidate_settings_cache()
         footer = None
         if await self.update_external_status():
             footer = _("External Lavalink server set to True.")
@@ -191,6 +196,7 @@ class LavalinkSetupCommands(MixinMeta, metaclass=CompositeMetaClass):
     async def command_llsetup_wsport(self, ctx: commands.Context, ws_port: int):
         """Set the Lavalink websocket server port."""
         await self.config.ws_port.set(ws_port)
+        self.invalidate_settings_cache()
         footer = None
         if await self.update_external_status():
             footer = _("External Lavalink server set to True.")
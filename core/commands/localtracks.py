@@ -121,20 +121,23 @@ class LocalTrackCommands(MixinMeta, metaclass=CompositeMetaClass):
         """Search for songs across all localtracks folders."""
         if not await self.localtracks_folder_exists(ctx):
             return
-        all_tracks = await self.get_localtrack_folder_list(
-            ctx,
-            (
-                Query.process_input(
-                    Path(await self.config.localpath()).absolute(),
-                    self.local_folder_current_path,
-                    search_subfolders=True,
-                )
-            ),
-        )
-        if not all_tracks:
-            return await self.send_embed_msg(ctx, title=_("No album folders found."))
         async with ctx.typing():
-            search_list = await self._build_local_search_list(all_tracks, search_words)
+            search_list = await self._search_local_library(search_words)
+        if search_list is None:
+            all_tracks = await self.get_localtrack_folder_list(
+                ctx,
+                (
+                    Query.process_input(
+                        Path(await self.config.localpath()).absolute(),
+                        self.local_folder_current_path,
+                        search_subfolders=True,
+                    )
+                ),
+            )
+            if not all_tracks:
+                return await self.send_embed_msg(ctx, title=_("No album folders found."))
+            async with ctx.typing():
+                search_list = await self._build_local_search_list(all_tracks, search_words)
         if not search_list:
             return await self.send_embed_msg(ctx, title=_("No matches."))
         return await ctx.invoke(self.command_search, query=search_list)
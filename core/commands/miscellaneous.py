@@ -14,6 +14,7 @@ from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import humanize_number, pagify
 from redbot.core.utils.menus import DEFAULT_CONTROLS, menu
 
+from ...utils import get_track_queue
 from ..abc import MixinMeta
 from ..cog_utils import CompositeMetaClass
 
@@ -101,21 +102,20 @@ class MiscellaneousCommands(MixinMeta, metaclass=CompositeMetaClass):
         if not self._player_check(ctx):
             return await self.send_embed_msg(ctx, title=_("Nothing playing."))
         player = lavalink.get_player(ctx.guild.id)
-        queue_tracks = player.queue
         requesters = {"total": 0, "users": {}}
 
-        async def _usercount(req_username):
+        async def _usercount(req_username, songcount=1):
             if req_username in requesters["users"]:
-                requesters["users"][req_username]["songcount"] += 1
-                requesters["total"] += 1
+                requesters["users"][req_username]["songcount"] += songcount
+                requesters["total"] += songcount
             else:
                 requesters["users"][req_username] = {}
-                requesters["users"][req_username]["songcount"] = 1
-                requesters["total"] += 1
+                requesters["users"][req_username]["songcount"] = songcount
+                requesters["total"] += songcount
 
-        async for track in AsyncIter(queue_tracks):
-            req_username = "{}#{}".format(track.requester.name, track.requester.discriminator)
-            await _usercount(req_username)
+        for requester, songcount in get_track_queue(player).requesters.items():
+            req_username = "{}#{}".format(requester.name, requester.discriminator)
+            await _usercount(req_username, songcount)
 
         try:
             req_username = "{}#{}".format(
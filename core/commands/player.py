@@ -808,6 +808,7 @@ class PlayerCommands(MixinMeta, metaclass=CompositeMetaClass):
                     )
                 track_len = 0
                 empty_queue = not player.queue
+                enqueued_tracks = []
                 async for track in AsyncIter(tracks):
                     if len(player.queue) >= 10000:
                         continue
@@ -831,9 +832,11 @@ class PlayerCommands(MixinMeta, metaclass=CompositeMetaClass):
                                     "enqueue_time": int(time.time()),
                                     "vc": player.channel.id,
                                     "requester": ctx.author.id,
+                                    "persist_in_bulk": True,
                                 }
                             )
                             player.add(ctx.author, track)
+                            enqueued_tracks.append(track)
                             self.bot.dispatch(
                                 "red_audio_track_enqueue", player.guild, track, ctx.author
                             )
@@ -844,14 +847,29 @@ class PlayerCommands(MixinMeta, metaclass=CompositeMetaClass):
                                 "enqueue_time": int(time.time()),
                                 "vc": player.channel.id,
                                 "requester": ctx.author.id,
+                                "persist_in_bulk": True,
                             }
                         )
                         player.add(ctx.author, track)
+                        enqueued_tracks.append(track)
                         self.bot.dispatch(
                             "red_audio_track_enqueue", player.guild, track, ctx.author
                         )
                     if not player.current:
+                        # Persist the track before it starts, or it is never marked played
+                        if enqueued_tracks:
+                            self.bot.dispatch(
+                                "red_audio_tracks_enqueue",
+                                player.guild,
+                                enqueued_tracks,
+                                ctx.author,
+                            )
+                            enqueued_tracks = []
                         await player.play()
+                if enqueued_tracks:
+                    self.bot.dispatch(
+                        "red_audio_tracks_enqueue", player.guild, enqueued_tracks, ctx.author
+                    )
                 player.maybe_shuffle(0 if empty_queue else 1)
                 if len(tracks) > track_len:
                     maxlength_msg = _(" {bad_tracks} tracks cannot be queued.").format(
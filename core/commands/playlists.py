@@ -113,7 +113,13 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
         async with ctx.typing():
             try:
                 (playlist, playlist_arg, scope) = await self.get_playlist_match(
-                    ctx, playlist_matches, scope, author, guild, specified_user
+                    ctx,
+                    playlist_matches,
+                    scope,
+                    author,
+                    guild,
+                    specified_user,
+                    include_tracks=False,
                 )
             except TooManyMatches as e:
                 return await self.send_embed_msg(ctx, title=str(e))
@@ -139,15 +145,14 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
                 return await self.send_embed_msg(
                     ctx, title=_("Could not find a track matching your query.")
                 )
-            track_list = playlist.tracks
-            current_count = len(track_list)
+            current_count = await playlist.count_tracks()
             to_append_count = len(to_append)
-            tracks_obj_list = playlist.tracks_obj
             not_added = 0
             if current_count + to_append_count > 10000:
                 to_append = to_append[: 10000 - current_count]
                 not_added = to_append_count - len(to_append)
                 to_append_count = len(to_append)
+            existing = await playlist.existing_identifiers(t.get("track") for t in to_append)
             scope_name = self.humanize_scope(
                 scope, ctx=guild if scope == PlaylistScope.GUILD.value else author
             )
@@ -155,7 +160,7 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
 
             if to_append and to_append_count == 1:
                 to = lavalink.Track(to_append[0])
-                if to in tracks_obj_list:
+                if to.track_identifier in existing:
                     return await self.send_embed_msg(
                         ctx,
                         title=_("Skipping track"),
@@ -177,14 +182,14 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
                 to_append_temp = []
                 async for t in AsyncIter(to_append):
                     to = lavalink.Track(t)
-                    if to not in tracks_obj_list:
+                    if to.track_identifier not in existing:
                         appended += 1
                         to_append_temp.append(t)
                 to_append = to_append_temp
             if appended > 0:
-                track_list.extend(to_append)
-                update = {"tracks": track_list, "url": None}
-                await playlist.edit(update)
+                await playlist.append_tracks(to_append)
+                if playlist.url is not None:
+                    await playlist.edit({"url": None})
 
             if to_append_count == 1 and appended == 1:
                 track_title = to_append[0]["info"]["title"]
@@ -595,32 +600,9 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
                 ctx.command.reset_cooldown(ctx)
                 return
 
-            track_objects = playlist.tracks_obj
-            original_count = len(track_objects)
-            unique_tracks = set()
-            unique_tracks_add = unique_tracks.add
-            track_objects = [
-                x for x in track_objects if not (x in unique_tracks or unique_tracks_add(x))
-            ]
-
-            tracklist = []
-            async for track in AsyncIter(track_objects):
-                track_keys = track._info.keys()
-                track_values = track._info.values()
-                track_id = track.track_identifier
-                track_info = {}
-                for k, v in zip(track_keys, track_values):
-                    track_info[k] = v
-                keys = ["track", "info"]
-                values = [track_id, track_info]
-                track_obj = {}
-                for key, value in zip(keys, values):
-                    track_obj[key] = value
-                tracklist.append(track_obj)
+            removed = await playlist.remove_duplicates()
 
-        final_count = len(tracklist)
-        if original_count - final_count != 0:
-            await playlist.edit({"tracks": tracklist})
+        if removed:
             await self.send_embed_msg(
                 ctx,
                 title=_("Playlist Modified"),
@@ -630,7 +612,7 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
                 ).format(
                     name=playlist.name,
                     id=playlist.id,
-                    track_diff=original_count - final_count,
+                    track_diff=removed,
                     scope=scope_name,
                 ),
             )
@@ -1230,7 +1212,13 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
         async with ctx.typing():
             try:
                 playlist, playlist_arg, scope = await self.get_playlist_match(
-                    ctx, playlist_matches, scope, author, guild, specified_user
+                    ctx,
+                    playlist_matches,
+                    scope,
+                    author,
+                    guild,
+                    specified_user,
+                    include_tracks=False,
                 )
             except TooManyMatches as e:
                 return await self.send_embed_msg(ctx, title=str(e))
@@ -1248,12 +1236,10 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
             if not await self.can_manage_playlist(scope, playlist, ctx, author, guild):
                 return
 
-            track_list = playlist.tracks
-            clean_list = [track for track in track_list if url != track["info"]["uri"]]
-            if len(track_list) == len(clean_list):
+            del_count = await playlist.remove_uri(url)
+            if not del_count:
                 return await self.send_embed_msg(ctx, title=_("URL not in playlist."))
-            del_count = len(track_list) - len(clean_list)
-            if not clean_list:
+            if not await playlist.count_tracks():
                 await delete_playlist(
                     playlist_api=self.playlist_api,
                     bot=self.bot,
@@ -1265,8 +1251,8 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
                 return await self.send_embed_msg(
                     ctx, title=_("No tracks left, removing playlist.")
                 )
-            update = {"tracks": clean_list, "url": None}
-            await playlist.edit(update)
+            if playlist.url is not None:
+                await playlist.edit({"url": None})
             if del_count > 1:
                 await self.send_embed_msg(
                     ctx,
@@ -1514,6 +1500,7 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
                 player = lavalink.get_player(ctx.guild.id)
                 tracks = playlist.tracks_obj
                 empty_queue = not player.queue
+                enqueued_tracks = []
                 async for track in AsyncIter(tracks):
                     if len(player.queue) >= 10000:
                         continue
@@ -1543,11 +1530,17 @@ class PlaylistCommands(MixinMeta, metaclass=CompositeMetaClass):
                             "enqueue_time": int(time.time()),
                             "vc": player.channel.id,
                             "requester": ctx.author.id,
+                            "persist_in_bulk": True,
                         }
                     )
                     player.add(author_obj, track)
+                    enqueued_tracks.append(track)
                     self.bot.dispatch("red_audio_track_enqueue", player.guild, track, ctx.author)
                     track_len += 1
+                if enqueued_tracks:
+                    self.bot.dispatch(
+                        "red_audio_tracks_enqueue", player.guild, enqueued_tracks, ctx.author
+                    )
                 player.maybe_shuffle(0 if empty_queue else 1)
                 if len(tracks) > track_len:
                     maxlength_msg = _(" {bad_tracks} tracks cannot be queued.").format(
@@ -23,6 +23,7 @@ from redbot.core.utils.menus import (
 )
 from redbot.core.utils.predicates import ReactionPredicate
 
+from ...utils import get_track_queue
 from ..abc import MixinMeta
 from ..cog_utils import CompositeMetaClass
 
@@ -290,7 +291,7 @@ class QueueCommands(MixinMeta, metaclass=CompositeMetaClass):
         if not self._player_check(ctx) or not player.queue:
             return await self.send_embed_msg(ctx, title=_("There's nothing in the queue."))
 
-        search_list = await self._build_queue_search_list(player.queue, search_words)
+        search_list = await self._build_queue_search_list(get_track_queue(player), search_words)
         if not search_list:
             return await self.send_embed_msg(ctx, title=_("No matches."))
 
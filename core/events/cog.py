@@ -4,7 +4,7 @@ import logging
 import time
 from pathlib import Path
 
-from typing import Optional
+from typing import List, Optional
 
 import discord
 import lavalink
@@ -36,6 +36,7 @@ class AudioEvents(MixinMeta, metaclass=CompositeMetaClass):
             await player.stop()
             await player.disconnect()
             await self.config.guild_from_id(guild_id=guild.id).currently_auto_playing_in.set([])
+            self.invalidate_settings_cache(guild.id)
             return
 
         track_identifier = track.track_identifier
@@ -61,14 +62,13 @@ class AudioEvents(MixinMeta, metaclass=CompositeMetaClass):
                         bot=self.bot,
                         guild=guild,
                         author=self.bot.user,
+                        include_tracks=False,
                     )
                 except RuntimeError:
                     playlist = None
 
                 if playlist:
-                    tracks = playlist.tracks
-                    tracks.append(track)
-                    await playlist.edit({"tracks": tracks})
+                    await playlist.append_tracks([track])
                 else:
                     playlist = Playlist(
                         bot=self.bot,
@@ -92,13 +92,12 @@ class AudioEvents(MixinMeta, metaclass=CompositeMetaClass):
                         guild=guild,
                         author=self.bot.user,
                         playlist_api=self.playlist_api,
+                        include_tracks=False,
                     )
                 except RuntimeError:
                     playlist = None
                 if playlist:
-                    tracks = playlist.tracks
-                    tracks.append(track)
-                    await playlist.edit({"tracks": tracks})
+                    await playlist.append_tracks([track])
                 else:
                     playlist = Playlist(
                         bot=self.bot,
@@ -152,13 +151,9 @@ class AudioEvents(MixinMeta, metaclass=CompositeMetaClass):
     ):
         if not (track and guild):
             return
-        if self.api_interface is not None and self.playlist_api is not None:
-            await self.api_interface.local_cache_api.youtube.clean_up_old_entries()
-            await asyncio.sleep(5)
-            await self.playlist_api.delete_scheduled()
+        # Played rows are removed by the database maintenance task
+        if self.api_interface is not None:
             await self.api_interface.persistent_queue_api.drop(guild.id)
-            await asyncio.sleep(5)
-            await self.api_interface.persistent_queue_api.delete_scheduled()
 
     @commands.Cog.listener()
     async def on_red_audio_track_enqueue(
@@ -166,6 +161,9 @@ class AudioEvents(MixinMeta, metaclass=CompositeMetaClass):
     ):
         if not (track and guild):
             return
+        if track.extras.pop("persist_in_bulk", False):
+            # Persisted by the red_audio_tracks_enqueue event of the same load
+            return
         persist_cache = self._persist_queue_cache.setdefault(
             guild.id, await self.config.guild(guild).persist_queue()
         )
@@ -174,19 +172,29 @@ class AudioEvents(MixinMeta, metaclass=CompositeMetaClass):
                 guild_id=guild.id, room_id=track.extras["vc"], track=track
             )
 
+    @commands.Cog.listener()
+    async def on_red_audio_tracks_enqueue(
+        self, guild: discord.Guild, tracks: List[lavalink.Track], requester: discord.Member
+    ):
+        if not (tracks and guild):
+            return
+        persist_cache = self._persist_queue_cache.setdefault(
+            guild.id, await self.config.guild(guild).persist_queue()
+        )
+        if persist_cache:
+            await self.api_interface.persistent_queue_api.enqueued_many(
+                guild_id=guild.id, tracks=tracks
+            )
+
     @commands.Cog.listener()
     async def on_red_audio_track_end(
         self, guild: discord.Guild, track: lavalink.Track, requester: discord.Member
     ):
         if not (track and guild):
             return
-        if self.api_interface is not None and self.playlist_api is not None:
-            await self.api_interface.local_cache_api.youtube.clean_up_old_entries()
-            await asyncio.sleep(5)
-            await self.playlist_api.delete_scheduled()
+        # Played rows are removed by the database maintenance task
+        if self.api_interface is not None:
             await self.api_interface.persistent_queue_api.drop(guild.id)
-            await asyncio.sleep(5)
-            await self.api_interface.persistent_queue_api.delete_scheduled()
 
     @commands.Cog.listener()
     async def on_red_audio_track_auto_play(
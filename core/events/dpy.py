@@ -120,6 +120,7 @@ class DpyEvents(MixinMeta, metaclass=CompositeMetaClass):
                 await self.config.guild(ctx.guild).dj_enabled.set(None)
                 self._dj_status_cache[ctx.guild.id] = None
                 await self.config.guild(ctx.guild).dj_role.set(None)
+                self.invalidate_settings_cache(ctx.guild.id)
                 self._dj_role_cache[ctx.guild.id] = None
                 await self.send_embed_msg(ctx, title=_("No DJ role found. Disabling DJ mode."))
 
@@ -233,6 +234,9 @@ class DpyEvents(MixinMeta, metaclass=CompositeMetaClass):
             if self.player_automated_timer_task:
                 self.player_automated_timer_task.cancel()
 
+            if self.database_maintenance_task:
+                self.database_maintenance_task.cancel()
+
             if self.lavalink_connect_task:
                 self.lavalink_connect_task.cancel()
 
@@ -242,6 +246,9 @@ class DpyEvents(MixinMeta, metaclass=CompositeMetaClass):
             if self._restore_task:
                 self._restore_task.cancel()
 
+            for task in self._spotify_enqueue_tasks.values():
+                task.cancel()
+
             lavalink.unregister_event_listener(self.lavalink_event_handler)
             lavalink.unregister_update_listener(self.lavalink_update_handler)
             self.bot.loop.create_task(lavalink.close(self.bot))
@@ -262,6 +269,7 @@ class DpyEvents(MixinMeta, metaclass=CompositeMetaClass):
                 self.skip_votes[before.channel.guild.id].discard(member.id)
             except (ValueError, KeyError, AttributeError):
                 pass
+            await self.update_empty_channel_state(member.guild)
 
         channel = self.rgetattr(member, "voice.channel", None)
         bot_voice_state = self.rgetattr(member, "guild.me.voice.self_deaf", None)
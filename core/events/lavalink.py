@@ -46,19 +46,20 @@ class LavalinkEvents(MixinMeta, metaclass=CompositeMetaClass):
                 await self.config.guild_from_id(guild_id=guild.id).currently_auto_playing_in.set(
                     []
                 )
+                self.invalidate_settings_cache(guild.id)
             return
         guild_id = self.rgetattr(guild, "id", None)
         if not guild:
             return
-        guild_data = await self.config.guild(guild).all()
-        disconnect = guild_data["disconnect"]
+        guild_data = await self.get_guild_settings(guild.id)
+        disconnect = guild_data.disconnect
         if event_type == lavalink.LavalinkEvents.FORCED_DISCONNECT:
             self.bot.dispatch("red_audio_audio_disconnect", guild)
             self._ll_guild_updates.discard(guild.id)
             return
 
         if event_type == lavalink.LavalinkEvents.WEBSOCKET_CLOSED:
-            deafen = guild_data["auto_deafen"]
+            deafen = guild_data.auto_deafen
             event_channel_id = extra.get("channelID")
             _error_code = extra.get("code")
             if _error_code in [1000] or not guild:
@@ -95,13 +96,13 @@ class LavalinkEvents(MixinMeta, metaclass=CompositeMetaClass):
         current_thumbnail = self.rgetattr(current_track, "thumbnail", None)
         current_id = self.rgetattr(current_track, "_info", {}).get("identifier")
 
-        repeat = guild_data["repeat"]
-        notify = guild_data["notify"]
-        autoplay = guild_data["auto_play"]
+        repeat = guild_data.repeat
+        notify = guild_data.notify
+        autoplay = guild_data.auto_play
         description = await self.get_track_description(
             current_track, self.local_folder_current_path
         )
-        status = await self.config.status()
+        status = (await self.get_global_settings()).status
         log.debug("Received a new lavalink event for %d: %s: %r", guild_id, event_type, extra)
         prev_song: lavalink.Track = player.fetch("prev_song")
         await self.maybe_reset_error_counter(player)
@@ -115,6 +116,8 @@ class LavalinkEvents(MixinMeta, metaclass=CompositeMetaClass):
             player.store("playing_song", current_track)
             player.store("requester", current_requester)
             self.bot.dispatch("red_audio_track_start", guild, current_track, current_requester)
+            # The player may have joined before it was registered with lavalink
+            await self.update_empty_channel_state(guild)
             if guild_id and current_track:
                 await self.api_interface.persistent_queue_api.played(
                     guild_id=guild_id, track_id=current_track.track_identifier
@@ -124,10 +127,12 @@ class LavalinkEvents(MixinMeta, metaclass=CompositeMetaClass):
                 await self.config.guild_from_id(guild_id=guild_id).currently_auto_playing_in.set(
                     [notify_channel, player.channel.id]
                 )
+                self.invalidate_settings_cache(guild_id)
             else:
                 await self.config.guild_from_id(guild_id=guild_id).currently_auto_playing_in.set(
                     []
                 )
+                self.invalidate_settings_cache(guild_id)
         if event_type == lavalink.LavalinkEvents.TRACK_END:
             prev_requester = player.fetch("prev_requester")
             self.bot.dispatch("red_audio_track_end", guild, prev_song, prev_requester)
@@ -181,7 +186,7 @@ class LavalinkEvents(MixinMeta, metaclass=CompositeMetaClass):
                     dur = self.format_time(current_length)
 
                 thumb = None
-                if await self.config.guild(guild).thumbnail() and current_thumbnail:
+                if guild_data.thumbnail and current_thumbnail:
                     thumb = current_thumbnail
 
                 notify_message = await self.send_embed_msg(
@@ -215,6 +220,7 @@ class LavalinkEvents(MixinMeta, metaclass=CompositeMetaClass):
                     await self.config.guild_from_id(
                         guild_id=guild_id
                     ).currently_auto_playing_in.set([])
+                    self.invalidate_settings_cache(guild_id)
                     # let audio buffer run out on slower machines (GH-5158)
                     await asyncio.sleep(2)
                     await player.disconnect()
@@ -256,6 +262,7 @@ class LavalinkEvents(MixinMeta, metaclass=CompositeMetaClass):
                 await self.config.guild_from_id(guild_id=guild_id).currently_auto_playing_in.set(
                     []
                 )
+                self.invalidate_settings_cache(guild_id)
                 self._ll_guild_updates.discard(guild_id)
                 self.bot.dispatch("red_audio_audio_disconnect", guild)
             if message_channel:
@@ -429,6 +436,7 @@ class LavalinkEvents(MixinMeta, metaclass=CompositeMetaClass):
                     await self.config.guild_from_id(
                         guild_id=guild_id
                     ).currently_auto_playing_in.set([])
+                    self.invalidate_settings_cache(guild_id)
                 else:
                     self.bot.dispatch("red_audio_audio_disconnect", guild)
                     ws_audio_log.info(
@@ -443,6 +451,7 @@ class LavalinkEvents(MixinMeta, metaclass=CompositeMetaClass):
                     await self.config.guild_from_id(
                         guild_id=guild_id
                     ).currently_auto_playing_in.set([])
+                    self.invalidate_settings_cache(guild_id)
             elif code in (42069,) and has_perm and player.current and player.is_playing:
                 player.store("resumes", player.fetch("resumes", 0) + 1)
                 await player.connect(deafen=deafen)
@@ -509,6 +518,7 @@ class LavalinkEvents(MixinMeta, metaclass=CompositeMetaClass):
                     await self.config.guild_from_id(
                         guild_id=guild_id
                     ).currently_auto_playing_in.set([])
+                    self.invalidate_settings_cache(guild_id)
             else:
                 if not player.paused and player.current:
                     player.store("resumes", player.fetch("resumes", 0) + 1)
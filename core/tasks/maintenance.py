@@ -0,0 +1,58 @@
+import asyncio
+import contextlib
+import logging
+import time
+from pathlib import Path
+
+from redbot.core.i18n import Translator
+
+from ...audio_logging import debug_exc_log
+from ..abc import MixinMeta
+from ..cog_utils import CompositeMetaClass
+
+log = logging.getLogger("red.cogs.Audio.cog.Tasks.maintenance")
+_ = Translator("Audio", Path(__file__))
+
+
+class MaintenanceTasks(MixinMeta, metaclass=CompositeMetaClass):
+    async def database_maintenance_timer(self) -> None:
+        """Run the database housekeeping every ``maintenance_interval`` seconds.
+
+        `_maintenance_wakeup` is set when the interval changes so the new cadence applies at once.
+        """
+        last_run = time.monotonic()
+        while True:
+            self._maintenance_wakeup.clear()
+            interval = (await self.get_global_settings()).maintenance_interval
+            timeout = last_run + interval - time.monotonic()
+            if timeout <= 0:
+                await self.run_database_maintenance()
+                last_run = time.monotonic()
+                continue
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._maintenance_wakeup.wait(), timeout=timeout)
+
+    async def run_database_maintenance(self) -> None:
+        """Delete expired cache entries, deleted playlists and played queue tracks, then checkpoint."""
+        if self.api_interface is None or self.playlist_api is None or self.db_executor is None:
+            return
+        start = time.monotonic()
+        reclaimed = dict.fromkeys(("cache", "playlists", "queue"), 0)
+        try:
+            reclaimed["cache"] = (
+                await self.api_interface.local_cache_api.youtube.clean_up_old_entries()
+            )
+            reclaimed["playlists"] = await self.playlist_api.delete_scheduled()
+            reclaimed["queue"] = await self.api_interface.persistent_queue_api.delete_scheduled()
+            await self.db_executor.checkpoint()
+        except Exception as exc:
+            debug_exc_log(log, exc, "Failed to complete database maintenance")
+        log.log(
+            logging.INFO if any(reclaimed.values()) else logging.DEBUG,
+            "Database maintenance reclaimed %d cache entries, %d playlists and %d queued tracks"
+            " in %.2fs",
+            reclaimed["cache"],
+            reclaimed["playlists"],
+            reclaimed["queue"],
+            time.monotonic() - start,
+        )
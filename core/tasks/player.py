@@ -1,10 +1,11 @@
 import asyncio
+import contextlib
+import heapq
 import logging
 import time
 from pathlib import Path
 
-from typing import Dict
-
+import discord
 import lavalink
 
 from redbot.core.i18n import Translator
@@ -20,76 +21,88 @@ _ = Translator("Audio", Path(__file__))
 
 class PlayerTasks(MixinMeta, metaclass=CompositeMetaClass):
     async def player_automated_timer(self) -> None:
-        stop_times: Dict = {}
-        pause_times: Dict = {}
+        """Run the empty channel disconnect and pause timers as they come due.
+
+        Channels are only checked when a voice state changes, see `update_empty_channel_state`.
+        """
+        async for player in AsyncIter(lavalink.all_players()):
+            await self.update_empty_channel_state(player.guild)
         while True:
-            async for p in AsyncIter(lavalink.all_players()):
-                server = p.guild
-                if await self.bot.cog_disabled_in_guild(self, server):
+            self._empty_channel_wakeup.clear()
+            now = time.time()
+            while self._empty_channel_timers and self._empty_channel_timers[0][0] <= now:
+                (deadline, guild_id) = heapq.heappop(self._empty_channel_timers)
+                # Timers are never removed from the heap, only superseded
+                if self._empty_channel_deadlines.get(guild_id) != deadline:
                     continue
+                del self._empty_channel_deadlines[guild_id]
+                try:
+                    await self._empty_channel_timeout(guild_id)
+                except Exception as err:
+                    debug_exc_log(
+                        log, err, "Exception raised in Audio's emptydc_timer for %s.", guild_id
+                    )
+            timeout = None
+            if self._empty_channel_timers:
+                timeout = max(self._empty_channel_timers[0][0] - time.time(), 0)
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._empty_channel_wakeup.wait(), timeout=timeout)
+
+    async def update_empty_channel_state(self, guild: discord.Guild) -> None:
+        """Start or stop the empty channel timers of a guild after its voice channel changed."""
+        try:
+            player = lavalink.get_player(guild.id)
+        except (KeyError, AttributeError):
+            player = None
+        members = self.rgetattr(player, "channel.members", None)
+        if members and all(m.bot for m in members):
+            if guild.id not in self._empty_channel_since:
+                self._empty_channel_since[guild.id] = time.time()
+                await self.reschedule_empty_channel_timer(guild.id)
+            return
+        if self._empty_channel_since.pop(guild.id, None) is None:
+            return
+        self._empty_channel_deadlines.pop(guild.id, None)
+        if player is not None and player.paused:
+            try:
+                await player.pause(False)
+            except Exception as err:
+                debug_exc_log(log, err, "Exception raised in Audio's unpausing %r.", player)
 
-                if p.channel.members and all(m.bot for m in p.channel.members):
-                    stop_times.setdefault(server.id, time.time())
-                    pause_times.setdefault(server.id, time.time())
-                else:
-                    stop_times.pop(server.id, None)
-                    if p.paused and server.id in pause_times:
-                        try:
-                            await p.pause(False)
-                        except Exception as err:
-                            debug_exc_log(log, err, "Exception raised in Audio's unpausing %r.", p)
-                    pause_times.pop(server.id, None)
-            servers = stop_times.copy()
-            servers.update(pause_times)
-            async for sid in AsyncIter(servers, steps=5):
-                server_obj = self.bot.get_guild(sid)
-                if not server_obj:
-                    stop_times.pop(sid, None)
-                    pause_times.pop(sid, None)
-                    try:
-                        player = lavalink.get_player(sid)
-                        await self.api_interface.persistent_queue_api.drop(sid)
-                        player.store("autoplay_notified", False)
-                        await player.stop()
-                        await player.disconnect()
-                        await self.config.guild_from_id(
-                            guild_id=sid
-                        ).currently_auto_playing_in.set([])
-                    except Exception as err:
-                        debug_exc_log(
-                            log, err, "Exception raised in Audio's emptydc_timer for %s.", sid
-                        )
+    async def reschedule_empty_channel_timer(self, guild_id: int) -> None:
+        """(Re)compute when an empty channel should be disconnected from or paused."""
+        since = self._empty_channel_since.get(guild_id)
+        if since is None:
+            return
+        guild_data = await self.get_guild_settings(guild_id)
+        if guild_data.emptydc_enabled:
+            delay = guild_data.emptydc_timer
+        elif guild_data.emptypause_enabled:
+            delay = guild_data.emptypause_timer
+        else:
+            self._empty_channel_deadlines.pop(guild_id, None)
+            return
+        deadline = since + delay
+        self._empty_channel_deadlines[guild_id] = deadline
+        heapq.heappush(self._empty_channel_timers, (deadline, guild_id))
+        self._empty_channel_wakeup.set()
 
-                elif sid in stop_times and await self.config.guild(server_obj).emptydc_enabled():
-                    emptydc_timer = await self.config.guild(server_obj).emptydc_timer()
-                    if (time.time() - stop_times[sid]) >= emptydc_timer:
-                        stop_times.pop(sid)
-                        try:
-                            player = lavalink.get_player(sid)
-                            await self.api_interface.persistent_queue_api.drop(sid)
-                            player.store("autoplay_notified", False)
-                            await player.stop()
-                            await player.disconnect()
-                            await self.config.guild_from_id(
-                                guild_id=sid
-                            ).currently_auto_playing_in.set([])
-                        except Exception as err:
-                            if "No such player for that guild" in str(err):
-                                stop_times.pop(sid, None)
-                            debug_exc_log(
-                                log, err, "Exception raised in Audio's emptydc_timer for %s.", sid
-                            )
-                elif (
-                    sid in pause_times and await self.config.guild(server_obj).emptypause_enabled()
-                ):
-                    emptypause_timer = await self.config.guild(server_obj).emptypause_timer()
-                    if (time.time() - pause_times.get(sid, 0)) >= emptypause_timer:
-                        try:
-                            await lavalink.get_player(sid).pause()
-                        except Exception as err:
-                            if "No such player for that guild" in str(err):
-                                pause_times.pop(sid, None)
-                            debug_exc_log(
-                                log, err, "Exception raised in Audio's pausing for %s.", sid
-                            )
-            await asyncio.sleep(5)
+    async def _empty_channel_timeout(self, guild_id: int) -> None:
+        server_obj = self.bot.get_guild(guild_id)
+        if server_obj is not None:
+            if await self.bot.cog_disabled_in_guild(self, server_obj):
+                self._empty_channel_since.pop(guild_id, None)
+                return
+            guild_data = await self.get_guild_settings(guild_id)
+            if not guild_data.emptydc_enabled:
+                if guild_data.emptypause_enabled:
+                    await lavalink.get_player(guild_id).pause()
+                return
+        self._empty_channel_since.pop(guild_id, None)
+        player = lavalink.get_player(guild_id)
+        await self.api_interface.persistent_queue_api.drop(guild_id)
+        player.store("autoplay_notified", False)
+        await player.stop()
+        await player.disconnect()
+        await self.config.guild_from_id(guild_id=guild_id).currently_auto_playing_in.set([])
+        self.invalidate_settings_cache(guild_id)
@@ -1,19 +1,25 @@
 import asyncio
 import datetime
-import itertools
 import logging
+import time
 from pathlib import Path
 
-from typing import Optional
+from types import SimpleNamespace
+from typing import Dict, List, MutableMapping, Optional, Tuple
 
+import discord
 import lavalink
 
+from discord.backoff import ExponentialBackoff
+
 from redbot.core.data_manager import cog_data_path
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
 from redbot.core.utils._internal_utils import send_to_owners_with_prefix_replaced
 from redbot.core.utils.dbtools import APSWConnectionWrapper
 
+from ...apis.api_utils import QueueFetchResult
+from ...apis.db_executor import DatabaseExecutor
 from ...apis.interface import AudioAPIInterface
 from ...apis.playlist_wrapper import PlaylistWrapper
 from ...audio_logging import debug_exc_log
@@ -25,6 +31,14 @@ from ..cog_utils import _OWNER_NOTIFICATION, _SCHEMA_VERSION, CompositeMetaClass
 log = logging.getLogger("red.cogs.Audio.cog.Tasks.startup")
 _ = Translator("Audio", Path(__file__))
 
+# Guilds whose player is restored at the same time on startup
+_RESTORE_WORKERS = 8
+# Seconds between two voice connections on the same shard while restoring
+_RESTORE_CONNECT_INTERVAL = 1.0
+_RESTORE_CONNECT_ATTEMPTS = 5
+# Seconds between two progress reports while restoring
+_RESTORE_PROGRESS_INTERVAL = 30
+
 
 class StartUpTasks(MixinMeta, metaclass=CompositeMetaClass):
     def start_up_task(self):
@@ -42,10 +56,11 @@ class StartUpTasks(MixinMeta, metaclass=CompositeMetaClass):
             self.db_conn = APSWConnectionWrapper(
                 str(cog_data_path(self.bot.get_cog("Audio")) / "Audio.db")
             )
+            self.db_executor = DatabaseExecutor(self.db_conn)
             self.api_interface = AudioAPIInterface(
-                self.bot, self.config, self.session, self.db_conn, self.bot.get_cog("Audio")
+                self.bot, self.config, self.session, self.db_executor, self.bot.get_cog("Audio")
             )
-            self.playlist_api = PlaylistWrapper(self.bot, self.config, self.db_conn)
+            self.playlist_api = PlaylistWrapper(self.bot, self.config, self.db_executor)
             await self.playlist_api.init()
             await self.api_interface.initialize()
             self.global_api_user = await self.api_interface.global_cache_api.get_perms()
@@ -60,6 +75,10 @@ class StartUpTasks(MixinMeta, metaclass=CompositeMetaClass):
                 self.player_automated_timer()
             )
             self.player_automated_timer_task.add_done_callback(task_callback)
+            self.database_maintenance_task = self.bot.loop.create_task(
+                self.database_maintenance_timer()
+            )
+            self.database_maintenance_task.add_done_callback(task_callback)
         except Exception as err:
             log.exception("Audio failed to start up, please report this issue.", exc_info=err)
             raise err
@@ -68,7 +87,7 @@ class StartUpTasks(MixinMeta, metaclass=CompositeMetaClass):
 
     async def restore_players(self):
         tries = 0
-        tracks_to_restore = await self.api_interface.persistent_queue_api.fetch_all()
+        queued_guild_ids = await self.api_interface.persistent_queue_api.fetch_guild_ids()
         while not lavalink.node._nodes:
             await asyncio.sleep(1)
             tries += 1
@@ -83,165 +102,173 @@ class StartUpTasks(MixinMeta, metaclass=CompositeMetaClass):
                     notify_channel, vc_id = guild_data["currently_auto_playing_in"]
                     metadata[guild_id] = (notify_channel, vc_id)
 
-        for guild_id, track_data in itertools.groupby(tracks_to_restore, key=lambda x: x.guild_id):
-            await asyncio.sleep(0)
-            tries = 0
+        # Guilds with a persisted queue, then the ones that were only auto playing.
+        # A queue is only read from the database once a worker picks its guild up.
+        to_restore = [
+            (guild_id, True, metadata.pop(guild_id, None)) for guild_id in queued_guild_ids
+        ]
+        to_restore.extend((guild_id, False, channels) for guild_id, channels in metadata.items())
+        del queued_guild_ids
+        del metadata
+        if not to_restore:
+            return
+
+        pending = iter(to_restore)
+        next_connect: Dict[int, float] = {}
+        progress = SimpleNamespace(done=0, restored=0, started=time.monotonic())
+        progress.next_report = progress.started + _RESTORE_PROGRESS_INTERVAL
+
+        async def worker() -> None:
+            for guild_id, queued, channels in pending:
+                track_data = []
+                try:
+                    if queued:
+                        track_data = await self.api_interface.persistent_queue_api.fetch_guild(
+                            guild_id
+                        )
+                    restored = await self._restore_player(
+                        guild_id, track_data, channels, all_guilds.get(guild_id), next_connect
+                    )
+                except Exception as err:
+                    restored = False
+                    debug_exc_log(log, err, "Error restoring player in %d", guild_id)
+                    if track_data:
+                        await self.api_interface.persistent_queue_api.drop(guild_id)
+                progress.done += 1
+                progress.restored += restored
+                now = time.monotonic()
+                if now >= progress.next_report and progress.done < len(to_restore):
+                    progress.next_report = now + _RESTORE_PROGRESS_INTERVAL
+                    elapsed = now - progress.started
+                    log.info(
+                        "Restoring players: %d/%d guilds done, about %ds left",
+                        progress.done,
+                        len(to_restore),
+                        elapsed / progress.done * (len(to_restore) - progress.done),
+                    )
+
+        await asyncio.gather(*(worker() for _ in range(min(_RESTORE_WORKERS, len(to_restore)))))
+        log.info(
+            "Restored %d players out of %d guilds in %.1fs",
+            progress.restored,
+            len(to_restore),
+            time.monotonic() - progress.started,
+        )
+
+    async def _restore_player(
+        self,
+        guild_id: int,
+        track_data: List[QueueFetchResult],
+        channels: Optional[Tuple[Optional[int], int]],
+        guild_data: Optional[MutableMapping],
+        next_connect: Dict[int, float],
+    ) -> bool:
+        """Restore the persisted queue of a guild, or resume auto play if it has none."""
+        guild = self.bot.get_guild(guild_id)
+        if not guild or not (track_data or channels):
+            return False
+        if guild_data is None:
+            guild_data = await self.config.guild_from_id(guild_id).all()
+        if track_data:
+            persist_cache = self._persist_queue_cache.setdefault(
+                guild_id, guild_data["persist_queue"]
+            )
+            if not persist_cache:
+                await self.api_interface.persistent_queue_api.drop(guild_id)
+                return False
+        player: Optional[lavalink.Player] = None
+        if not self.lavalink_connection_aborted:
             try:
-                player: Optional[lavalink.Player] = None
-                track_data = list(track_data)
-                guild = self.bot.get_guild(guild_id)
-                if not guild:
-                    continue
-                persist_cache = self._persist_queue_cache.setdefault(
-                    guild_id, await self.config.guild(guild).persist_queue()
-                )
-                if not persist_cache:
-                    await self.api_interface.persistent_queue_api.drop(guild_id)
-                    continue
-                if self.lavalink_connection_aborted:
-                    player = None
-                else:
-                    try:
-                        player = lavalink.get_player(guild_id)
-                    except IndexError:
-                        player = None
-                    except KeyError:
-                        player = None
-                vc = 0
-                guild_data = await self.config.guild_from_id(guild.id).all()
-                shuffle = guild_data["shuffle"]
-                repeat = guild_data["repeat"]
-                volume = guild_data["volume"]
-                shuffle_bumped = guild_data["shuffle_bumped"]
-                auto_deafen = guild_data["auto_deafen"]
-
-                if player is None:
-                    while tries < 5 and vc is not None:
-                        try:
-                            notify_channel_id, vc_id = metadata.pop(
-                                guild_id, (None, track_data[-1].room_id)
-                            )
-                            vc = guild.get_channel(vc_id)
-                            if not vc:
-                                break
-                            perms = vc.permissions_for(guild.me)
-                            if not (perms.connect and perms.speak):
-                                vc = None
-                                break
-                            player = await lavalink.connect(vc, deafen=auto_deafen)
-                            player.store("notify_channel", notify_channel_id)
-                            break
-                        except IndexError:
-                            await asyncio.sleep(5)
-                            tries += 1
-                        except Exception as exc:
-                            tries += 1
-                            debug_exc_log(
-                                log, exc, "Failed to restore music voice channel %s", vc_id
-                            )
-                            if vc is None:
-                                break
-                            else:
-                                await asyncio.sleep(1)
-
-                if tries >= 5 or guild is None or vc is None or player is None:
+                player = lavalink.get_player(guild_id)
+            except (IndexError, KeyError):
+                player = None
+        if player is None:
+            notify_channel_id, vc_id = channels or (None, track_data[-1].room_id)
+            player = await self._connect_restored_player(
+                guild, vc_id, notify_channel_id, guild_data["auto_deafen"], next_connect
+            )
+            if player is None:
+                if track_data:
                     await self.api_interface.persistent_queue_api.drop(guild_id)
-                    continue
-
-                player.repeat = repeat
-                player.shuffle = shuffle
-                player.shuffle_bumped = shuffle_bumped
-                if player.volume != volume:
-                    await player.set_volume(volume)
-                for track in track_data:
-                    track = track.track_object
-                    player.add(guild.get_member(track.extras.get("requester")) or guild.me, track)
-                player.maybe_shuffle()
-                if not player.is_playing:
-                    await player.play()
-                log.info("Restored %r", player)
-            except Exception as err:
-                debug_exc_log(log, err, "Error restoring player in %d", guild_id)
-                await self.api_interface.persistent_queue_api.drop(guild_id)
+                return False
+        elif not track_data:
+            return False
 
-        for guild_id, (notify_channel_id, vc_id) in metadata.items():
-            guild = self.bot.get_guild(guild_id)
-            player: Optional[lavalink.Player] = None
-            vc = 0
-            tries = 0
-            if not guild:
+        player.repeat = guild_data["repeat"]
+        player.shuffle = guild_data["shuffle"]
+        player.shuffle_bumped = guild_data["shuffle_bumped"]
+        if player.volume != guild_data["volume"]:
+            await player.set_volume(guild_data["volume"])
+        for track in track_data:
+            try:
+                track = track.track_object
+            except Exception as exc:
+                debug_exc_log(log, exc, "Failed to decode a persisted track in %d", guild_id)
                 continue
-            if self.lavalink_connection_aborted:
-                player = None
+            player.add(guild.get_member(track.extras.get("requester")) or guild.me, track)
+        player.maybe_shuffle()
+        if track_data:
+            if not player.is_playing:
+                await player.play()
+            log.info("Restored %r", player)
+            return True
+
+        log.info("Restored %r", player)
+        if not player.is_playing:
+            notify_channel = player.fetch("notify_channel")
+            try:
+                await self.api_interface.autoplay(player, self.playlist_api)
+            except DatabaseError:
+                notify_channel = self.bot.get_channel(notify_channel)
+                if notify_channel:
+                    await self.send_embed_msg(
+                        notify_channel, title=_("Couldn't get a valid track.")
+                    )
+            except TrackEnqueueError:
+                notify_channel = self.bot.get_channel(notify_channel)
+                if notify_channel:
+                    await self.send_embed_msg(
+                        notify_channel,
+                        title=_("Unable to Get Track"),
+                        description=_(
+                            "I'm unable to get a track from Lavalink at the moment, "
+                            "try again in a few minutes."
+                        ),
+                    )
+        return True
+
+    async def _connect_restored_player(
+        self,
+        guild: discord.Guild,
+        vc_id: int,
+        notify_channel_id: Optional[int],
+        auto_deafen: bool,
+        next_connect: Dict[int, float],
+    ) -> Optional[lavalink.Player]:
+        backoff = ExponentialBackoff(base=1)
+        for attempt in range(_RESTORE_CONNECT_ATTEMPTS):
+            vc = guild.get_channel(vc_id)
+            if not vc:
+                return None
+            perms = vc.permissions_for(guild.me)
+            if not (perms.connect and perms.speak):
+                return None
+            # Voice state updates share the gateway rate limit of their shard
+            now = time.monotonic()
+            slot = max(now, next_connect.get(guild.shard_id, now))
+            next_connect[guild.shard_id] = slot + _RESTORE_CONNECT_INTERVAL
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            try:
+                player = await lavalink.connect(vc, deafen=auto_deafen)
+            except IndexError:
+                # No Lavalink node is available yet
+                pass
+            except Exception as exc:
+                debug_exc_log(log, exc, "Failed to restore music voice channel %s", vc_id)
             else:
-                try:
-                    player = lavalink.get_player(guild_id)
-                except IndexError:
-                    player = None
-                except KeyError:
-                    player = None
-            if player is None:
-                guild_data = await self.config.guild_from_id(guild.id).all()
-                shuffle = guild_data["shuffle"]
-                repeat = guild_data["repeat"]
-                volume = guild_data["volume"]
-                shuffle_bumped = guild_data["shuffle_bumped"]
-                auto_deafen = guild_data["auto_deafen"]
-
-                while tries < 5 and vc is not None:
-                    try:
-                        vc = guild.get_channel(vc_id)
-                        if not vc:
-                            break
-                        perms = vc.permissions_for(guild.me)
-                        if not (perms.connect and perms.speak):
-                            vc = None
-                            break
-                        player = await lavalink.connect(vc, deafen=auto_deafen)
-                        player.store("notify_channel", notify_channel_id)
-                        break
-                    except IndexError:
-                        await asyncio.sleep(5)
-                        tries += 1
-                    except Exception as exc:
-                        tries += 1
-                        debug_exc_log(log, exc, "Failed to restore music voice channel %s", vc_id)
-                        if vc is None:
-                            break
-                        else:
-                            await asyncio.sleep(1)
-                if tries >= 5 or guild is None or vc is None or player is None:
-                    continue
-
-                player.repeat = repeat
-                player.shuffle = shuffle
-                player.shuffle_bumped = shuffle_bumped
-                if player.volume != volume:
-                    await player.set_volume(volume)
-                player.maybe_shuffle()
-                log.info("Restored %r", player)
-                if not player.is_playing:
-                    notify_channel = player.fetch("notify_channel")
-                    try:
-                        await self.api_interface.autoplay(player, self.playlist_api)
-                    except DatabaseError:
-                        notify_channel = self.bot.get_channel(notify_channel)
-                        if notify_channel:
-                            await self.send_embed_msg(
-                                notify_channel, title=_("Couldn't get a valid track.")
-                            )
-                        return
-                    except TrackEnqueueError:
-                        notify_channel = self.bot.get_channel(notify_channel)
-                        if notify_channel:
-                            await self.send_embed_msg(
-                                notify_channel,
-                                title=_("Unable to Get Track"),
-                                description=_(
-                                    "I'm unable to get a track from Lavalink at the moment, "
-                                    "try again in a few minutes."
-                                ),
-                            )
-                        return
-        del metadata
-        del all_guilds
+                player.store("notify_channel", notify_channel_id)
+                return player
+            if attempt < _RESTORE_CONNECT_ATTEMPTS - 1:
+                await asyncio.sleep(backoff.delay())
+        return None
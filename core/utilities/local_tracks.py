@@ -2,18 +2,18 @@ import contextlib
 import logging
 
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Union
 
 import discord
 import lavalink
 
-from fuzzywuzzy import process
 from redbot.core import commands
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
 
 from ...audio_dataclasses import LocalPath, Query
 from ...errors import TrackEnqueueError
+from ...utils import SearchIndex
 from ..abc import MixinMeta
 from ..cog_utils import CompositeMetaClass
 
@@ -29,11 +29,19 @@ class LocalTrackUtilities(MixinMeta, metaclass=CompositeMetaClass):
         if not await self.localtracks_folder_exists(ctx):
             return []
 
-        return (
-            await audio_data.subfolders_in_tree()
-            if search_subfolders
-            else await audio_data.subfolders()
-        )
+        paths = None
+        if self.api_interface is not None:
+            paths = await self.api_interface.local_library_api.folders(
+                audio_data.to_string(), recursive=search_subfolders
+            )
+        if paths is None:
+            return (
+                await audio_data.subfolders_in_tree()
+                if search_subfolders
+                else await audio_data.subfolders()
+            )
+        folders = [LocalPath(path, self.local_folder_current_path) for path in paths]
+        return sorted(folders, key=lambda x: x.to_string_user().lower())
 
     async def get_localtrack_folder_list(self, ctx: commands.Context, query: Query) -> List[Query]:
         """Return a list of folders per the provided query."""
@@ -44,11 +52,7 @@ class LocalTrackUtilities(MixinMeta, metaclass=CompositeMetaClass):
             return []
         if not query.local_track_path.exists():
             return []
-        return (
-            await query.local_track_path.tracks_in_tree()
-            if query.search_subfolders
-            else await query.local_track_path.tracks_in_folder()
-        )
+        return await self._get_indexed_local_tracks(query)
 
     async def get_localtrack_folder_tracks(
         self, ctx, player: lavalink.player_manager.Player, query: Query
@@ -92,11 +96,28 @@ class LocalTrackUtilities(MixinMeta, metaclass=CompositeMetaClass):
     ) -> List[Query]:
         if not await self.localtracks_folder_exists(ctx) or query.local_track_path is None:
             return []
-        return (
-            await query.local_track_path.tracks_in_tree()
-            if query.search_subfolders
-            else await query.local_track_path.tracks_in_folder()
-        )
+        return await self._get_indexed_local_tracks(query)
+
+    async def _get_indexed_local_tracks(self, query: Query) -> List[Query]:
+        """Return the tracks in the folder of the query from the local library index.
+
+        Folders that are not indexed yet are walked instead.
+        """
+        paths = None
+        if self.api_interface is not None:
+            paths = await self.api_interface.local_library_api.tracks(
+                query.local_track_path.to_string(), recursive=query.search_subfolders
+            )
+        if paths is None:
+            return (
+                await query.local_track_path.tracks_in_tree()
+                if query.search_subfolders
+                else await query.local_track_path.tracks_in_folder()
+            )
+        tracks = []
+        async for path in AsyncIter(paths, steps=100):
+            tracks.append(Query.process_input(path, self.local_folder_current_path))
+        return sorted(tracks, key=lambda x: x.to_string_user().lower())
 
     async def localtracks_folder_exists(self, ctx: commands.Context) -> bool:
         folder = LocalPath(None, self.local_folder_current_path)
@@ -113,19 +134,35 @@ class LocalTrackUtilities(MixinMeta, metaclass=CompositeMetaClass):
     async def _build_local_search_list(
         self, to_search: List[Query], search_words: str
     ) -> List[str]:
-        to_search_string = {
-            i.local_track_path.name for i in to_search if i.local_track_path is not None
-        }
-        search_results = process.extract(search_words, to_search_string, limit=50)
-        search_list = []
-        async for track_match, percent_match in AsyncIter(search_results):
-            if percent_match > 85:
-                search_list.extend(
-                    [
-                        discord.utils.escape_markdown(i.to_string_user())
-                        for i in to_search
-                        if i.local_track_path is not None
-                        and i.local_track_path.name == track_match
-                    ]
-                )
-        return search_list
+        search_index = SearchIndex()
+        async for track in AsyncIter(to_search, steps=500):
+            if track.local_track_path is not None:
+                search_index.add(track.to_string_user(), track.local_track_path.name)
+        search_results = await search_index.search(search_words, limit=50, score_cutoff=86)
+        return [
+            discord.utils.escape_markdown(track_location)
+            for (track_location, name, percent_match) in search_results
+        ]
+
+    async def _search_local_library(self, search_words: str) -> Optional[List[str]]:
+        """Search the track names of the local library index.
+
+        Returns ``None`` if the localtracks folder is not indexed.
+        """
+        if self.api_interface is None:
+            return None
+        audio_data = LocalPath(None, self.local_folder_current_path)
+        search_results = await self.api_interface.local_library_api.search(
+            str(audio_data.localtrack_folder.absolute()),
+            search_words,
+            limit=50,
+            score_cutoff=86,
+        )
+        if search_results is None:
+            return None
+        return [
+            discord.utils.escape_markdown(
+                LocalPath(path, self.local_folder_current_path).to_string_user()
+            )
+            for path in search_results
+        ]
@@ -7,7 +7,8 @@ import logging
 import re
 import struct
 from pathlib import Path
-from typing import Any, Final, Mapping, MutableMapping, Pattern, Union, cast
+from types import SimpleNamespace
+from typing import Any, Final, Mapping, MutableMapping, Optional, Pattern, Union, cast
 
 import discord
 import lavalink
@@ -20,14 +21,13 @@ from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import humanize_number
 
 from ...apis.playlist_interface import get_all_playlist_for_migration23
-from ...utils import PlaylistScope, task_callback
+from ...utils import PlaylistScope, get_track_queue, task_callback
 from ..abc import MixinMeta
 from ..cog_utils import CompositeMetaClass, DataReader
 
 log = logging.getLogger("red.cogs.Audio.cog.Utilities.miscellaneous")
 _ = Translator("Audio", Path(__file__))
 _RE_TIME_CONVERTER: Final[Pattern] = re.compile(r"(?:(\d+):)?([0-5]?[0-9]):([0-5][0-9])")
-_prefer_lyrics_cache = {}
 
 
 class MiscellaneousUtilities(MixinMeta, metaclass=CompositeMetaClass):
@@ -114,7 +114,9 @@ class MiscellaneousUtilities(MixinMeta, metaclass=CompositeMetaClass):
     async def _close_database(self) -> None:
         if self.api_interface is not None:
             await self.api_interface.run_all_pending_tasks()
-            self.api_interface.close()
+            await self.api_interface.close()
+        if self.db_executor is not None:
+            await self.db_executor.close()
 
     async def _check_api_tokens(self) -> MutableMapping:
         spotify = await self.bot.get_shared_api_tokens("spotify")
@@ -131,6 +133,7 @@ class MiscellaneousUtilities(MixinMeta, metaclass=CompositeMetaClass):
             if self.player_manager is not None:
                 await self.player_manager.shutdown()
             await self.config.use_external_lavalink.set(True)
+            self.invalidate_settings_cache()
             return True
         else:
             return False
@@ -213,13 +216,7 @@ class MiscellaneousUtilities(MixinMeta, metaclass=CompositeMetaClass):
 
     async def queue_duration(self, ctx: commands.Context) -> int:
         player = lavalink.get_player(ctx.guild.id)
-        dur = [
-            i.length
-            async for i in AsyncIter(player.queue, steps=50).filter(lambda x: not x.is_stream)
-        ]
-        queue_dur = sum(dur)
-        if not player.queue:
-            queue_dur = 0
+        queue_dur = get_track_queue(player).duration
         try:
             if not player.current.is_stream:
                 remain = player.current.length - player.position
@@ -277,11 +274,32 @@ class MiscellaneousUtilities(MixinMeta, metaclass=CompositeMetaClass):
         return f"{day}{hour}{minutes}{sec}"
 
     async def get_lyrics_status(self, ctx: Context) -> bool:
-        global _prefer_lyrics_cache
-        prefer_lyrics = _prefer_lyrics_cache.setdefault(
-            ctx.guild.id, await self.config.guild(ctx.guild).prefer_lyrics()
-        )
-        return prefer_lyrics
+        return (await self.get_guild_settings(ctx.guild.id)).prefer_lyrics
+
+    async def get_global_settings(self) -> SimpleNamespace:
+        """Snapshot of the global settings, kept in memory until a setting is changed."""
+        return await self._get_settings_snapshot(None)
+
+    async def get_guild_settings(self, guild_id: int) -> SimpleNamespace:
+        """Snapshot of a guild's settings, kept in memory until one of them is changed."""
+        return await self._get_settings_snapshot(guild_id)
+
+    async def _get_settings_snapshot(self, guild_id: Optional[int]) -> SimpleNamespace:
+        settings = self._settings_cache.get(guild_id)
+        if settings is not None:
+            return settings
+        generation = self._settings_cache_generation[guild_id]
+        group = self.config if guild_id is None else self.config.guild_from_id(guild_id)
+        settings = SimpleNamespace(**await group.all())
+        # A setting changed while it was being read, keep the snapshot out of the cache
+        if self._settings_cache_generation[guild_id] == generation:
+            self._settings_cache[guild_id] = settings
+        return settings
+
+    def invalidate_settings_cache(self, guild_id: Optional[int] = None) -> None:
+        """Drop the settings snapshot of a guild, or the global one, after writing to Config."""
+        self._settings_cache.pop(guild_id, None)
+        self._settings_cache_generation[guild_id] += 1
 
     async def data_schema_migration(self, from_version: int, to_version: int) -> None:
         database_entries = []
@@ -327,6 +345,7 @@ class MiscellaneousUtilities(MixinMeta, metaclass=CompositeMetaClass):
             await self.config.custom(PlaylistScope.GUILD.value).set(all_playlist)
             # new schema is now in place
             await self.config.schema_version.set(2)
+            self.invalidate_settings_cache()
 
             # migration done, now let's delete all the old stuff
             async for guild_id in AsyncIter(all_guild_data):
@@ -342,6 +361,7 @@ class MiscellaneousUtilities(MixinMeta, metaclass=CompositeMetaClass):
                     await p.save()
                 await self.config.custom(scope).clear()
             await self.config.schema_version.set(3)
+            self.invalidate_settings_cache()
 
         if database_entries:
             await self.api_interface.local_cache_api.lavalink.insert(database_entries)
@@ -373,7 +393,7 @@ class MiscellaneousUtilities(MixinMeta, metaclass=CompositeMetaClass):
         is_stream = reader.read_boolean()
         uri = reader.read_utf().decode() if reader.read_boolean() else None
         source = reader.read_utf().decode()
-        position = reader.read_long()  # noqa: F841 pylint: disable=unused-variable
+        position = reader.read_long()
 
         track_object = {
             "track": track,
@@ -385,6 +405,8 @@ class MiscellaneousUtilities(MixinMeta, metaclass=CompositeMetaClass):
                 "isStream": is_stream,
                 "uri": uri,
                 "isSeekable": not is_stream,
+                "sourceName": source,
+                "position": position,
             },
         }
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 from pathlib import Path
@@ -17,7 +18,7 @@ from redbot.core.utils.chat_formatting import bold, escape
 from ...audio_dataclasses import _PARTIALLY_SUPPORTED_MUSIC_EXT, Query
 from ...audio_logging import IS_DEBUG, debug_exc_log
 from ...errors import QueryUnauthorized, SpotifyFetchError, TrackEnqueueError
-from ...utils import Notifier
+from ...utils import Notifier, task_callback
 from ..abc import MixinMeta
 from ..cog_utils import CompositeMetaClass
 
@@ -334,6 +335,12 @@ class PlayerUtilities(MixinMeta, metaclass=CompositeMetaClass):
                 self.update_player_lock(ctx, False)
                 raise e
         elif query.is_album or query.is_playlist:
+            if enqueue_tracks:
+                # The lock is released by the background task once the playlist is loaded.
+                self.update_player_lock(ctx, True)
+                return await self.stream_spotify_playlist(
+                    ctx, "album" if query.is_album else "playlist", query, forced=forced
+                )
             try:
                 self.update_player_lock(ctx, True)
                 track_list = await self.fetch_spotify_playlist(
@@ -441,6 +448,7 @@ class PlayerUtilities(MixinMeta, metaclass=CompositeMetaClass):
                 return await self.send_embed_msg(ctx, title=_("Queue size limit reached."))
             track_len = 0
             empty_queue = not player.queue
+            enqueued_tracks = []
             async for track in AsyncIter(tracks):
                 if len(player.queue) >= 10000:
                     continue
@@ -462,9 +470,11 @@ class PlayerUtilities(MixinMeta, metaclass=CompositeMetaClass):
                                 "enqueue_time": int(time.time()),
                                 "vc": player.channel.id,
                                 "requester": ctx.author.id,
+                                "persist_in_bulk": True,
                             }
                         )
                         player.add(ctx.author, track)
+                        enqueued_tracks.append(track)
                         self.bot.dispatch(
                             "red_audio_track_enqueue", player.guild, track, ctx.author
                         )
@@ -476,10 +486,16 @@ class PlayerUtilities(MixinMeta, metaclass=CompositeMetaClass):
                             "enqueue_time": int(time.time()),
                             "vc": player.channel.id,
                             "requester": ctx.author.id,
+                            "persist_in_bulk": True,
                         }
                     )
                     player.add(ctx.author, track)
+                    enqueued_tracks.append(track)
                     self.bot.dispatch("red_audio_track_enqueue", player.guild, track, ctx.author)
+            if enqueued_tracks:
+                self.bot.dispatch(
+                    "red_audio_tracks_enqueue", player.guild, enqueued_tracks, ctx.author
+                )
             player.maybe_shuffle(0 if empty_queue else 1)
 
             if len(tracks) > track_len:
@@ -617,6 +633,7 @@ class PlayerUtilities(MixinMeta, metaclass=CompositeMetaClass):
         query: Query,
         enqueue: bool = False,
         forced: bool = False,
+        first_track: Optional[asyncio.Event] = None,
     ):
         player = lavalink.get_player(ctx.guild.id)
         try:
@@ -642,6 +659,7 @@ class PlayerUtilities(MixinMeta, metaclass=CompositeMetaClass):
                 notifier=notifier,
                 forced=forced,
                 query_global=self.global_api_user.get("can_read"),
+                first_track=first_track,
             )
         except SpotifyFetchError as error:
             self.update_player_lock(ctx, False)
@@ -675,6 +693,44 @@ class PlayerUtilities(MixinMeta, metaclass=CompositeMetaClass):
             self.update_player_lock(ctx, False)
         return track_list
 
+    async def stream_spotify_playlist(
+        self, ctx: commands.Context, stype: str, query: Query, forced: bool = False
+    ) -> None:
+        """Enqueue a Spotify album or playlist in the background.
+
+        Returns as soon as the first track is enqueued while the rest of the playlist keeps
+        loading in order, until it is done or :meth:`cancel_spotify_enqueue` is called.
+        """
+        first_track = asyncio.Event()
+
+        async def load_playlist() -> None:
+            try:
+                await self.fetch_spotify_playlist(
+                    ctx, stype, query, enqueue=True, forced=forced, first_track=first_track
+                )
+            finally:
+                await self.maybe_run_pending_db_tasks(ctx)
+
+        def forget_task(task: asyncio.Task) -> None:
+            if self._spotify_enqueue_tasks.get(ctx.guild.id) is task:
+                del self._spotify_enqueue_tasks[ctx.guild.id]
+
+        self.cancel_spotify_enqueue(ctx.guild.id)
+        task = asyncio.create_task(load_playlist())
+        task.add_done_callback(task_callback)
+        task.add_done_callback(forget_task)
+        self._spotify_enqueue_tasks[ctx.guild.id] = task
+        waiter = asyncio.create_task(first_track.wait())
+        try:
+            await asyncio.wait((task, waiter), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+
+    def cancel_spotify_enqueue(self, guild_id: int) -> None:
+        """Stop a Spotify playlist which is still being enqueued in the background."""
+        if task := self._spotify_enqueue_tasks.pop(guild_id, None):
+            task.cancel()
+
     async def set_player_settings(self, ctx: commands.Context) -> None:
         player = lavalink.get_player(ctx.guild.id)
         shuffle = await self.config.guild(ctx.guild).shuffle()
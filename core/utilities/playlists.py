@@ -126,6 +126,7 @@ class PlaylistUtilities(MixinMeta, metaclass=CompositeMetaClass):
         author: discord.User,
         guild: discord.Guild,
         specified_user: bool = False,
+        include_tracks: bool = True,
     ) -> Tuple[Optional[Playlist], str, str]:
         """
         Parameters
@@ -142,6 +143,8 @@ class PlaylistUtilities(MixinMeta, metaclass=CompositeMetaClass):
             The guild.
         specified_user: bool
             Whether or not a user ID was specified via argparse.
+        include_tracks: bool
+            Whether to read the tracks of the matched playlist.
         Returns
         -------
         Tuple[Optional[Playlist], str, str]
@@ -228,6 +231,8 @@ class PlaylistUtilities(MixinMeta, metaclass=CompositeMetaClass):
                     ).format(match_count=match_count, original_input=original_input)
                 )
         elif match_count == 1:
+            if include_tracks:
+                await correct_scope_matches[0].load_tracks()
             return correct_scope_matches[0], original_input, correct_scope_matches[0].scope
         elif match_count == 0:
             return None, original_input, scope or PlaylistScope.GUILD.value
@@ -250,7 +255,7 @@ class PlaylistUtilities(MixinMeta, metaclass=CompositeMetaClass):
                 number=number,
                 playlist=playlist,
                 scope=self.humanize_scope(playlist.scope),
-                tracks=len(playlist.tracks),
+                tracks=await playlist.count_tracks(),
                 author=author,
             )
             playlists += line
@@ -285,6 +290,8 @@ class PlaylistUtilities(MixinMeta, metaclass=CompositeMetaClass):
             )
         with contextlib.suppress(discord.HTTPException):
             await msg.delete()
+        if include_tracks:
+            await correct_scope_matches[pred.result].load_tracks()
         return (
             correct_scope_matches[pred.result],
             original_input,
@@ -730,4 +737,5 @@ class PlaylistUtilities(MixinMeta, metaclass=CompositeMetaClass):
         )
         await playlist.save()
         await self.config.bundled_playlist_version.set(web_version)
+        self.invalidate_settings_cache()
         log.info("Curated playlist has been updated.")
@@ -2,18 +2,18 @@ import logging
 import math
 from pathlib import Path
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import discord
 import lavalink
 
-from fuzzywuzzy import process
 from redbot.core import commands
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import humanize_number
 
 from ...audio_dataclasses import LocalPath, Query
+from ...utils import TrackQueue
 from ..abc import MixinMeta
 from ..cog_utils import CompositeMetaClass
 
@@ -116,31 +116,27 @@ class QueueUtilities(MixinMeta, metaclass=CompositeMetaClass):
     async def _build_queue_search_list(
         self, queue_list: List[lavalink.Track], search_words: str
     ) -> List[Tuple[int, str]]:
-        track_list = []
-        async for queue_idx, track in AsyncIter(queue_list).enumerate(start=1):
-            if not self.match_url(track.uri):
-                query = Query.process_input(track, self.local_folder_current_path)
-                if (
-                    query.is_local
-                    and query.local_track_path is not None
-                    and track.title == "Unknown title"
-                ):
-                    track_title = query.local_track_path.to_string_user()
-                else:
-                    track_title = "{} - {}".format(track.author, track.title)
-            else:
-                track_title = track.title
-
-            song_info = {str(queue_idx): track_title}
-            track_list.append(song_info)
-        search_results = process.extract(search_words, track_list, limit=50)
+        if not isinstance(queue_list, TrackQueue):
+            queue_list = TrackQueue(queue_list)
+        search_index = queue_list.get_search_index(self._get_queue_search_title)
+        search_results = await search_index.search(search_words, limit=50, score_cutoff=90)
+        if not search_results:
+            return []
+        positions: Dict[int, List[int]] = {}
+        async for queue_idx, track in AsyncIter(queue_list, steps=500).enumerate(start=1):
+            positions.setdefault(id(track), []).append(queue_idx)
         search_list = []
-        async for search, percent_match in AsyncIter(search_results):
-            async for queue_position, title in AsyncIter(search.items()):
-                if percent_match > 89:
-                    search_list.append((queue_position, title))
+        for track_id, title, percent_match in search_results:
+            search_list.extend((queue_idx, title) for queue_idx in positions.get(track_id, ()))
         return search_list
 
+    def _get_queue_search_title(self, track: lavalink.Track) -> str:
+        if self.match_url(track.uri):
+            return track.title
+        if track.title == "Unknown title":
+            return LocalPath(track.uri, self.local_folder_current_path).to_string_user()
+        return "{} - {}".format(track.author, track.title)
+
     async def _build_queue_search_page(
         self, ctx: commands.Context, page_num: int, search_list: List[Tuple[int, str]]
     ) -> discord.Embed:
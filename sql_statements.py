@@ -10,6 +10,7 @@ __all__ = [
     "PRAGMA_SET_read_uncommitted",
     "PRAGMA_FETCH_user_version",
     "PRAGMA_SET_user_version",
+    "PRAGMA_WAL_CHECKPOINT",
     # Data Deletion statement
     "HANDLE_DISCORD_DATA_DELETION_QUERY",
     # Playlist table statements
@@ -23,6 +24,21 @@ __all__ = [
     "PLAYLIST_FETCH",
     "PLAYLIST_UPSERT",
     "PLAYLIST_CREATE_INDEX",
+    "PLAYLIST_FETCH_JSON_TRACKS",
+    "PLAYLIST_CLEAR_JSON_TRACKS",
+    # Playlist tracks table statements
+    "PLAYLIST_TRACKS_CREATE_TABLE",
+    "PLAYLIST_TRACKS_CREATE_INDEX",
+    "PLAYLIST_TRACKS_CREATE_CLEANUP_TRIGGER",
+    "PLAYLIST_TRACKS_INSERT",
+    "PLAYLIST_TRACKS_NEXT_POSITION",
+    "PLAYLIST_TRACKS_FETCH",
+    "PLAYLIST_TRACKS_COUNT",
+    "PLAYLIST_TRACKS_FETCH_EXISTING_IDENTIFIERS",
+    "PLAYLIST_TRACKS_DELETE_ALL",
+    "PLAYLIST_TRACKS_DELETE_AT",
+    "PLAYLIST_TRACKS_DELETE_URI",
+    "PLAYLIST_TRACKS_DELETE_DUPLICATES",
     # YouTube table statements
     "YOUTUBE_DROP_TABLE",
     "YOUTUBE_CREATE_TABLE",
@@ -31,8 +47,12 @@ __all__ = [
     "YOUTUBE_UPDATE",
     "YOUTUBE_QUERY",
     "YOUTUBE_QUERY_ALL",
+    "YOUTUBE_QUERY_MANY",
     "YOUTUBE_DELETE_OLD_ENTRIES",
     "YOUTUBE_QUERY_LAST_FETCHED_RANDOM",
+    "YOUTUBE_QUERY_LAST_FETCHED_RANDOM_FALLBACK",
+    "YOUTUBE_QUERY_ROWID_BOUNDS",
+    "YOUTUBE_CREATE_TIME_INDEXES",
     # Spotify table statements
     "SPOTIFY_DROP_TABLE",
     "SPOTIFY_CREATE_INDEX",
@@ -40,9 +60,14 @@ __all__ = [
     "SPOTIFY_UPSERT",
     "SPOTIFY_QUERY",
     "SPOTIFY_QUERY_ALL",
+    "SPOTIFY_QUERY_MANY",
     "SPOTIFY_UPDATE",
     "SPOTIFY_DELETE_OLD_ENTRIES",
     "SPOTIFY_QUERY_LAST_FETCHED_RANDOM",
+    "SPOTIFY_QUERY_LAST_FETCHED_RANDOM_FALLBACK",
+    "SPOTIFY_QUERY_ROWID_BOUNDS",
+    "SPOTIFY_CREATE_TIME_INDEXES",
+    "SPOTIFY_CREATE_URI_INDEX",
     # Lavalink table statements
     "LAVALINK_DROP_TABLE",
     "LAVALINK_CREATE_TABLE",
@@ -51,9 +76,37 @@ __all__ = [
     "LAVALINK_UPDATE",
     "LAVALINK_QUERY",
     "LAVALINK_QUERY_ALL",
+    "LAVALINK_QUERY_MANY",
     "LAVALINK_QUERY_LAST_FETCHED_RANDOM",
+    "LAVALINK_QUERY_LAST_FETCHED_RANDOM_FALLBACK",
+    "LAVALINK_QUERY_ROWID_BOUNDS",
+    "LAVALINK_CREATE_TIME_INDEXES",
     "LAVALINK_DELETE_OLD_ENTRIES",
     "LAVALINK_FETCH_ALL_ENTRIES_GLOBAL",
+    "LAVALINK_FETCH_UNCOMPRESSED",
+    "LAVALINK_UPDATE_DATA",
+    # Spotify playlist table statements
+    "SPOTIFY_PLAYLIST_CREATE_TABLE",
+    "SPOTIFY_PLAYLIST_UPSERT",
+    "SPOTIFY_PLAYLIST_UPDATE",
+    "SPOTIFY_PLAYLIST_QUERY",
+    "SPOTIFY_PLAYLIST_DELETE_OLD_ENTRIES",
+    # Negative cache statements
+    "NEGATIVE_CACHE_CREATE_TABLE",
+    "NEGATIVE_CACHE_UPSERT",
+    "NEGATIVE_CACHE_QUERY_ALL",
+    "NEGATIVE_CACHE_DELETE",
+    "NEGATIVE_CACHE_DELETE_EXPIRED",
+    "NEGATIVE_CACHE_DELETE_ALL",
+    # Local library index statements
+    "LOCAL_LIBRARY_CREATE_FOLDERS_TABLE",
+    "LOCAL_LIBRARY_CREATE_TRACKS_TABLE",
+    "LOCAL_LIBRARY_FOLDERS_UPSERT",
+    "LOCAL_LIBRARY_FOLDERS_DELETE",
+    "LOCAL_LIBRARY_FOLDERS_QUERY_ALL",
+    "LOCAL_LIBRARY_TRACKS_INSERT",
+    "LOCAL_LIBRARY_TRACKS_DELETE_FOLDER",
+    "LOCAL_LIBRARY_TRACKS_QUERY_ALL",
     # Persisting Queue statements
     "PERSIST_QUEUE_DROP_TABLE",
     "PERSIST_QUEUE_CREATE_TABLE",
@@ -61,6 +114,10 @@ __all__ = [
     "PERSIST_QUEUE_PLAYED",
     "PERSIST_QUEUE_DELETE_SCHEDULED",
     "PERSIST_QUEUE_FETCH_ALL",
+    "PERSIST_QUEUE_FETCH_GUILD_IDS",
+    "PERSIST_QUEUE_FETCH_GUILD",
+    "PERSIST_QUEUE_FETCH_JSON_ROWS",
+    "PERSIST_QUEUE_UPDATE_TRACK",
     "PERSIST_QUEUE_UPSERT",
     "PERSIST_QUEUE_BULK_PLAYED",
 ]
@@ -82,6 +139,11 @@ PRAGMA_SET_read_uncommitted: Final[
 ] = """
 PRAGMA read_uncommitted = 1;
 """
+PRAGMA_WAL_CHECKPOINT: Final[
+    str
+] = """
+PRAGMA wal_checkpoint(TRUNCATE);
+"""
 PRAGMA_FETCH_user_version: Final[
     str
 ] = """
@@ -165,8 +227,12 @@ PLAYLIST_DELETE_SCHEDULED: Final[
 DELETE
 FROM
     playlists
-WHERE
-    deleted = true;
+WHERE rowid IN (
+    SELECT rowid FROM playlists
+    WHERE
+        deleted = true
+    LIMIT :limit
+);
 """
 PLAYLIST_FETCH_ALL: Final[
     str
@@ -257,17 +323,16 @@ PLAYLIST_UPSERT: Final[
     str
 ] = """
 INSERT INTO
-    playlists ( scope_type, playlist_id, playlist_name, scope_id, author_id, playlist_url, tracks )
+    playlists ( scope_type, playlist_id, playlist_name, scope_id, author_id, playlist_url )
 VALUES
     (
-        :scope_type, :playlist_id, :playlist_name, :scope_id, :author_id, :playlist_url, :tracks
+        :scope_type, :playlist_id, :playlist_name, :scope_id, :author_id, :playlist_url
     )
     ON CONFLICT (scope_type, playlist_id, scope_id) DO
     UPDATE
     SET
         playlist_name = excluded.playlist_name,
-        playlist_url = excluded.playlist_url,
-        tracks = excluded.tracks;
+        playlist_url = excluded.playlist_url;
 """
 PLAYLIST_CREATE_INDEX: Final[
     str
@@ -276,6 +341,215 @@ CREATE INDEX IF NOT EXISTS name_index ON playlists (
 scope_type, playlist_id, playlist_name, scope_id
 );
 """
+PLAYLIST_FETCH_JSON_TRACKS: Final[
+    str
+] = """
+SELECT
+    rowid, scope_type, playlist_id, scope_id, tracks
+FROM
+    playlists
+WHERE
+    (
+        rowid > :rowid
+        AND tracks IS NOT NULL
+    )
+ORDER BY rowid ASC
+LIMIT :limit;
+"""
+PLAYLIST_CLEAR_JSON_TRACKS: Final[
+    str
+] = """
+UPDATE playlists
+    SET
+        tracks = NULL
+WHERE
+    (
+        scope_type = :scope_type
+        AND playlist_id = :playlist_id
+        AND scope_id = :scope_id
+    )
+;
+"""
+
+# Playlist tracks table statements
+PLAYLIST_TRACKS_CREATE_TABLE: Final[
+    str
+] = """
+CREATE TABLE IF NOT EXISTS playlist_tracks (
+    scope_type INTEGER NOT NULL,
+    playlist_id INTEGER NOT NULL,
+    scope_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    identifier TEXT NOT NULL,
+    uri TEXT,
+    data JSON NOT NULL,
+    PRIMARY KEY (scope_type, playlist_id, scope_id, position)
+);
+"""
+PLAYLIST_TRACKS_CREATE_INDEX: Final[
+    str
+] = """
+CREATE INDEX IF NOT EXISTS playlist_tracks_identifier_index ON playlist_tracks (
+scope_type, playlist_id, scope_id, identifier
+);
+"""
+PLAYLIST_TRACKS_CREATE_CLEANUP_TRIGGER: Final[
+    str
+] = """
+CREATE TRIGGER IF NOT EXISTS playlist_tracks_cleanup
+AFTER DELETE ON playlists
+BEGIN
+    DELETE FROM playlist_tracks
+    WHERE
+        scope_type = OLD.scope_type
+        AND playlist_id = OLD.playlist_id
+        AND scope_id = OLD.scope_id;
+END;
+"""
+PLAYLIST_TRACKS_INSERT: Final[
+    str
+] = """
+INSERT INTO
+    playlist_tracks ( scope_type, playlist_id, scope_id, position, identifier, uri, data )
+VALUES
+    (
+        :scope_type, :playlist_id, :scope_id, :position, :identifier, :uri, :data
+    )
+;
+"""
+PLAYLIST_TRACKS_NEXT_POSITION: Final[
+    str
+] = """
+SELECT
+    COALESCE(MAX(position) + 1, 0)
+FROM
+    playlist_tracks
+WHERE
+    (
+        scope_type = :scope_type
+        AND playlist_id = :playlist_id
+        AND scope_id = :scope_id
+    )
+;
+"""
+PLAYLIST_TRACKS_FETCH: Final[
+    str
+] = """
+SELECT
+    identifier, data
+FROM
+    playlist_tracks
+WHERE
+    (
+        scope_type = :scope_type
+        AND playlist_id = :playlist_id
+        AND scope_id = :scope_id
+    )
+ORDER BY position ASC
+LIMIT :limit OFFSET :offset;
+"""
+PLAYLIST_TRACKS_COUNT: Final[
+    str
+] = """
+SELECT
+    COUNT(*)
+FROM
+    playlist_tracks
+WHERE
+    (
+        scope_type = :scope_type
+        AND playlist_id = :playlist_id
+        AND scope_id = :scope_id
+    )
+;
+"""
+PLAYLIST_TRACKS_FETCH_EXISTING_IDENTIFIERS: Final[
+    str
+] = """
+SELECT DISTINCT
+    identifier
+FROM
+    playlist_tracks
+WHERE
+    (
+        scope_type = :scope_type
+        AND playlist_id = :playlist_id
+        AND scope_id = :scope_id
+        AND identifier IN (SELECT value FROM json_each(:identifiers))
+    )
+;
+"""
+PLAYLIST_TRACKS_DELETE_ALL: Final[
+    str
+] = """
+DELETE
+FROM
+    playlist_tracks
+WHERE
+    (
+        scope_type = :scope_type
+        AND playlist_id = :playlist_id
+        AND scope_id = :scope_id
+    )
+;
+"""
+PLAYLIST_TRACKS_DELETE_AT: Final[
+    str
+] = """
+DELETE
+FROM
+    playlist_tracks
+WHERE rowid = (
+    SELECT rowid FROM playlist_tracks
+    WHERE
+        (
+            scope_type = :scope_type
+            AND playlist_id = :playlist_id
+            AND scope_id = :scope_id
+        )
+    ORDER BY position ASC
+    LIMIT 1 OFFSET :index
+);
+"""
+PLAYLIST_TRACKS_DELETE_URI: Final[
+    str
+] = """
+DELETE
+FROM
+    playlist_tracks
+WHERE
+    (
+        scope_type = :scope_type
+        AND playlist_id = :playlist_id
+        AND scope_id = :scope_id
+        AND uri = :uri
+    )
+;
+"""
+PLAYLIST_TRACKS_DELETE_DUPLICATES: Final[
+    str
+] = """
+DELETE
+FROM
+    playlist_tracks
+WHERE
+    (
+        scope_type = :scope_type
+        AND playlist_id = :playlist_id
+        AND scope_id = :scope_id
+        AND position NOT IN (
+            SELECT MIN(position) FROM playlist_tracks
+            WHERE
+                (
+                    scope_type = :scope_type
+                    AND playlist_id = :playlist_id
+                    AND scope_id = :scope_id
+                )
+            GROUP BY identifier
+        )
+    )
+;
+"""
 
 # YouTube table statements
 YOUTUBE_DROP_TABLE: Final[
@@ -300,6 +574,14 @@ YOUTUBE_CREATE_INDEX: Final[
 CREATE UNIQUE INDEX IF NOT EXISTS idx_youtube_url
 ON youtube (track_info, youtube_url);
 """
+YOUTUBE_CREATE_TIME_INDEXES: Final[
+    str
+] = """
+CREATE INDEX IF NOT EXISTS idx_youtube_last_fetched
+ON youtube (last_fetched);
+CREATE INDEX IF NOT EXISTS idx_youtube_last_updated
+ON youtube (last_updated);
+"""
 YOUTUBE_UPSERT: Final[
     str
 ] = """INSERT INTO
@@ -344,6 +626,16 @@ WHERE
     AND last_updated > :maxage
 LIMIT 1;
 """
+YOUTUBE_QUERY_MANY: Final[
+    str
+] = """
+SELECT track_info, youtube_url, last_updated
+FROM youtube
+WHERE
+    track_info IN (SELECT value FROM json_each(:keys))
+    AND last_updated > :maxage
+;
+"""
 YOUTUBE_QUERY_ALL: Final[
     str
 ] = """
@@ -354,9 +646,13 @@ YOUTUBE_DELETE_OLD_ENTRIES: Final[
     str
 ] = """
 DELETE FROM youtube
-WHERE
-    last_updated < :maxage
-    ;
+WHERE rowid IN (
+    SELECT rowid FROM youtube
+    WHERE
+        last_updated < :maxage
+    LIMIT :limit
+)
+;
 """
 YOUTUBE_QUERY_LAST_FETCHED_RANDOM: Final[
     str
@@ -364,9 +660,35 @@ YOUTUBE_QUERY_LAST_FETCHED_RANDOM: Final[
 SELECT youtube_url, last_updated
 FROM youtube
 WHERE
-    last_fetched > :day
+    rowid >= :rowid
+    AND rowid < :rowid + :window
+    AND last_fetched > :day
     AND last_updated > :maxage
-LIMIT 100
+;
+"""
+YOUTUBE_QUERY_LAST_FETCHED_RANDOM_FALLBACK: Final[
+    str
+] = """
+SELECT youtube_url, last_updated
+FROM youtube
+WHERE
+    last_fetched > :day
+    AND +last_updated > :maxage
+ORDER BY last_fetched
+LIMIT 1 OFFSET (
+    SELECT abs(random()) % max(count(*), 1)
+    FROM youtube
+    WHERE
+        last_fetched > :day
+        AND +last_updated > :maxage
+)
+;
+"""
+YOUTUBE_QUERY_ROWID_BOUNDS: Final[
+    str
+] = """
+SELECT min(rowid), max(rowid)
+FROM youtube
 ;
 """
 
@@ -397,6 +719,20 @@ SPOTIFY_CREATE_INDEX: Final[
 CREATE UNIQUE INDEX IF NOT EXISTS idx_spotify_uri
 ON spotify (id, type, uri);
 """
+SPOTIFY_CREATE_URI_INDEX: Final[
+    str
+] = """
+CREATE INDEX IF NOT EXISTS idx_spotify_lookup_uri
+ON spotify (uri);
+"""
+SPOTIFY_CREATE_TIME_INDEXES: Final[
+    str
+] = """
+CREATE INDEX IF NOT EXISTS idx_spotify_last_fetched
+ON spotify (last_fetched);
+CREATE INDEX IF NOT EXISTS idx_spotify_last_updated
+ON spotify (last_updated);
+"""
 SPOTIFY_UPSERT: Final[
     str
 ] = """INSERT INTO
@@ -441,6 +777,16 @@ WHERE
     AND last_updated > :maxage
 LIMIT 1;
 """
+SPOTIFY_QUERY_MANY: Final[
+    str
+] = """
+SELECT uri, track_info, last_updated
+FROM spotify
+WHERE
+    uri IN (SELECT value FROM json_each(:keys))
+    AND last_updated > :maxage
+;
+"""
 SPOTIFY_QUERY_ALL: Final[
     str
 ] = """
@@ -451,9 +797,13 @@ SPOTIFY_DELETE_OLD_ENTRIES: Final[
     str
 ] = """
 DELETE FROM spotify
-WHERE
-    last_updated < :maxage
-    ;
+WHERE rowid IN (
+    SELECT rowid FROM spotify
+    WHERE
+        last_updated < :maxage
+    LIMIT :limit
+)
+;
 """
 SPOTIFY_QUERY_LAST_FETCHED_RANDOM: Final[
     str
@@ -461,9 +811,35 @@ SPOTIFY_QUERY_LAST_FETCHED_RANDOM: Final[
 SELECT track_info, last_updated
 FROM spotify
 WHERE
-    last_fetched > :day
+    rowid >= :rowid
+    AND rowid < :rowid + :window
+    AND last_fetched > :day
     AND last_updated > :maxage
-LIMIT 100
+;
+"""
+SPOTIFY_QUERY_LAST_FETCHED_RANDOM_FALLBACK: Final[
+    str
+] = """
+SELECT track_info, last_updated
+FROM spotify
+WHERE
+    last_fetched > :day
+    AND +last_updated > :maxage
+ORDER BY last_fetched
+LIMIT 1 OFFSET (
+    SELECT abs(random()) % max(count(*), 1)
+    FROM spotify
+    WHERE
+        last_fetched > :day
+        AND +last_updated > :maxage
+)
+;
+"""
+SPOTIFY_QUERY_ROWID_BOUNDS: Final[
+    str
+] = """
+SELECT min(rowid), max(rowid)
+FROM spotify
 ;
 """
 
@@ -490,6 +866,14 @@ LAVALINK_CREATE_INDEX: Final[
 CREATE UNIQUE INDEX IF NOT EXISTS idx_lavalink_query
 ON lavalink (query);
 """
+LAVALINK_CREATE_TIME_INDEXES: Final[
+    str
+] = """
+CREATE INDEX IF NOT EXISTS idx_lavalink_last_fetched
+ON lavalink (last_fetched);
+CREATE INDEX IF NOT EXISTS idx_lavalink_last_updated
+ON lavalink (last_updated);
+"""
 LAVALINK_UPSERT: Final[
     str
 ] = """INSERT INTO
@@ -533,6 +917,16 @@ WHERE
     AND last_updated > :maxage
 LIMIT 1;
 """
+LAVALINK_QUERY_MANY: Final[
+    str
+] = """
+SELECT query, data, last_updated
+FROM lavalink
+WHERE
+    query IN (SELECT value FROM json_each(:keys))
+    AND last_updated > :maxage
+;
+"""
 LAVALINK_QUERY_ALL: Final[
     str
 ] = """
@@ -545,18 +939,48 @@ LAVALINK_QUERY_LAST_FETCHED_RANDOM: Final[
 SELECT data, last_updated
 FROM lavalink
 WHERE
-    last_fetched > :day
+    rowid >= :rowid
+    AND rowid < :rowid + :window
+    AND last_fetched > :day
     AND last_updated > :maxage
-LIMIT 100
+;
+"""
+LAVALINK_QUERY_LAST_FETCHED_RANDOM_FALLBACK: Final[
+    str
+] = """
+SELECT data, last_updated
+FROM lavalink
+WHERE
+    last_fetched > :day
+    AND +last_updated > :maxage
+ORDER BY last_fetched
+LIMIT 1 OFFSET (
+    SELECT abs(random()) % max(count(*), 1)
+    FROM lavalink
+    WHERE
+        last_fetched > :day
+        AND +last_updated > :maxage
+)
+;
+"""
+LAVALINK_QUERY_ROWID_BOUNDS: Final[
+    str
+] = """
+SELECT min(rowid), max(rowid)
+FROM lavalink
 ;
 """
 LAVALINK_DELETE_OLD_ENTRIES: Final[
     str
 ] = """
 DELETE FROM lavalink
-WHERE
-    last_updated < :maxage
-    ;
+WHERE rowid IN (
+    SELECT rowid FROM lavalink
+    WHERE
+        last_updated < :maxage
+    LIMIT :limit
+)
+;
 """
 LAVALINK_FETCH_ALL_ENTRIES_GLOBAL: Final[
     str
@@ -564,6 +988,218 @@ LAVALINK_FETCH_ALL_ENTRIES_GLOBAL: Final[
 SELECT query, data 
 FROM lavalink
 """
+LAVALINK_FETCH_UNCOMPRESSED: Final[
+    str
+] = """
+SELECT rowid, data
+FROM lavalink
+WHERE
+    rowid > :rowid
+    AND typeof(data) = 'text'
+ORDER BY rowid
+LIMIT :limit
+;
+"""
+LAVALINK_UPDATE_DATA: Final[
+    str
+] = """
+UPDATE lavalink
+SET data=:data
+WHERE rowid=:rowid;
+"""
+
+# Spotify playlist table statements
+SPOTIFY_PLAYLIST_CREATE_TABLE: Final[
+    str
+] = """
+CREATE TABLE IF NOT EXISTS spotify_playlist(
+    uri TEXT PRIMARY KEY,
+    snapshot_id TEXT,
+    tracks BLOB,
+    last_updated INTEGER,
+    last_fetched INTEGER
+);
+"""
+SPOTIFY_PLAYLIST_UPSERT: Final[
+    str
+] = """INSERT INTO
+spotify_playlist
+  (
+    uri, snapshot_id, tracks, last_updated, last_fetched
+  )
+VALUES
+  (
+    :uri, :snapshot_id, :tracks, :last_updated, :last_fetched
+  )
+ON CONFLICT
+  (
+    uri
+  )
+DO UPDATE
+  SET
+    snapshot_id = excluded.snapshot_id,
+    tracks = excluded.tracks,
+    last_updated = excluded.last_updated;
+"""
+SPOTIFY_PLAYLIST_UPDATE: Final[
+    str
+] = """
+UPDATE spotify_playlist
+SET last_fetched=:last_fetched
+WHERE uri=:uri;
+"""
+SPOTIFY_PLAYLIST_QUERY: Final[
+    str
+] = """
+SELECT snapshot_id, tracks, last_updated
+FROM spotify_playlist
+WHERE
+    uri=:uri
+    AND last_updated > :maxage
+LIMIT 1;
+"""
+SPOTIFY_PLAYLIST_DELETE_OLD_ENTRIES: Final[
+    str
+] = """
+DELETE FROM spotify_playlist
+WHERE rowid IN (
+    SELECT rowid FROM spotify_playlist
+    WHERE
+        last_updated < :maxage
+    LIMIT :limit
+)
+;
+"""
+
+# Negative cache statements
+NEGATIVE_CACHE_CREATE_TABLE: Final[
+    str
+] = """
+CREATE TABLE IF NOT EXISTS negative_cache(
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    expires_at INTEGER NOT NULL,
+    PRIMARY KEY (source, query)
+);
+"""
+NEGATIVE_CACHE_UPSERT: Final[
+    str
+] = """
+INSERT INTO
+    negative_cache (source, query, reason, expires_at)
+VALUES
+    (:source, :query, :reason, :expires_at)
+ON CONFLICT (source, query) DO
+UPDATE
+    SET
+        reason = excluded.reason,
+        expires_at = excluded.expires_at;
+"""
+NEGATIVE_CACHE_QUERY_ALL: Final[
+    str
+] = """
+SELECT source, query, reason, expires_at
+FROM negative_cache
+WHERE expires_at > :now
+ORDER BY expires_at ASC
+;
+"""
+NEGATIVE_CACHE_DELETE: Final[
+    str
+] = """
+DELETE FROM negative_cache
+WHERE
+    source = :source
+    AND query = :query
+;
+"""
+NEGATIVE_CACHE_DELETE_EXPIRED: Final[
+    str
+] = """
+DELETE FROM negative_cache
+WHERE rowid IN (
+    SELECT rowid FROM negative_cache
+    WHERE expires_at < :now
+    LIMIT :limit
+)
+;
+"""
+NEGATIVE_CACHE_DELETE_ALL: Final[
+    str
+] = """
+DELETE FROM negative_cache
+;
+"""
+
+# Local library index statements
+LOCAL_LIBRARY_CREATE_FOLDERS_TABLE: Final[
+    str
+] = """
+CREATE TABLE IF NOT EXISTS local_library_folders(
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime INTEGER NOT NULL
+);
+"""
+LOCAL_LIBRARY_CREATE_TRACKS_TABLE: Final[
+    str
+] = """
+CREATE TABLE IF NOT EXISTS local_library_tracks(
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (folder, name)
+);
+"""
+LOCAL_LIBRARY_FOLDERS_UPSERT: Final[
+    str
+] = """
+INSERT INTO
+    local_library_folders (path, parent, mtime)
+VALUES
+    (:path, :parent, :mtime)
+ON CONFLICT (path) DO
+UPDATE
+    SET
+        parent = excluded.parent,
+        mtime = excluded.mtime;
+"""
+LOCAL_LIBRARY_FOLDERS_DELETE: Final[
+    str
+] = """
+DELETE FROM local_library_folders
+WHERE path = :path
+;
+"""
+LOCAL_LIBRARY_FOLDERS_QUERY_ALL: Final[
+    str
+] = """
+SELECT path, parent, mtime
+FROM local_library_folders
+;
+"""
+LOCAL_LIBRARY_TRACKS_INSERT: Final[
+    str
+] = """
+INSERT OR IGNORE INTO
+    local_library_tracks (folder, name)
+VALUES
+    (:folder, :name);
+"""
+LOCAL_LIBRARY_TRACKS_DELETE_FOLDER: Final[
+    str
+] = """
+DELETE FROM local_library_tracks
+WHERE folder = :folder
+;
+"""
+LOCAL_LIBRARY_TRACKS_QUERY_ALL: Final[
+    str
+] = """
+SELECT folder, name
+FROM local_library_tracks
+;
+"""
 
 # Persisting Queue statements
 PERSIST_QUEUE_DROP_TABLE: Final[
@@ -617,18 +1253,63 @@ PERSIST_QUEUE_DELETE_SCHEDULED: Final[
 DELETE
 FROM
     persist_queue
-WHERE
-    played = true;
+WHERE rowid IN (
+    SELECT rowid FROM persist_queue
+    WHERE
+        played = true
+    LIMIT :limit
+);
 """
 PERSIST_QUEUE_FETCH_ALL: Final[
     str
 ] = """
 SELECT
-    guild_id, room_id, track
+    guild_id, room_id, track, track_id, time
 FROM
     persist_queue
 WHERE played = false
-ORDER BY time ASC;
+ORDER BY guild_id ASC, time ASC, rowid ASC;
+"""
+PERSIST_QUEUE_FETCH_GUILD_IDS: Final[
+    str
+] = """
+SELECT DISTINCT
+    guild_id
+FROM
+    persist_queue
+WHERE played = false
+ORDER BY guild_id ASC;
+"""
+PERSIST_QUEUE_FETCH_GUILD: Final[
+    str
+] = """
+SELECT
+    guild_id, room_id, track, track_id, time
+FROM
+    persist_queue
+WHERE
+    guild_id = :guild_id
+    AND played = false
+ORDER BY time ASC, rowid ASC;
+"""
+PERSIST_QUEUE_FETCH_JSON_ROWS: Final[
+    str
+] = """
+SELECT
+    rowid, track
+FROM
+    persist_queue
+WHERE typeof(track) = 'text'
+LIMIT :limit;
+"""
+PERSIST_QUEUE_UPDATE_TRACK: Final[
+    str
+] = """
+UPDATE persist_queue
+    SET
+        track = :track
+WHERE rowid = :rowid
+;
 """
 PERSIST_QUEUE_UPSERT: Final[
     str
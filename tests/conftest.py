@@ -0,0 +1,24 @@
+import importlib.util
+import sys
+import tempfile
+from pathlib import Path
+
+from redbot.core import data_manager
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+# The cog resolves its data path at import time
+data_manager.basic_config = {
+    **data_manager.basic_config_default,
+    "DATA_PATH": tempfile.mkdtemp(),
+    "STORAGE_TYPE": "JSON",
+    "STORAGE_DETAILS": {},
+}
+
+# Import this checkout as the ``audio`` package, whatever its directory is called
+if "audio" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "audio", _ROOT / "__init__.py", submodule_search_locations=[str(_ROOT)]
+    )
+    sys.modules["audio"] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules["audio"])
@@ -0,0 +1,60 @@
+import pytest
+import pytest_asyncio
+
+from redbot.core.utils.dbtools import APSWConnectionWrapper
+
+from audio.apis.db_executor import DatabaseExecutor
+from audio.apis.local_db import LocalCacheWrapper, YouTubeTableWrapper
+from audio.sql_statements import (
+    NEGATIVE_CACHE_CREATE_TABLE,
+    YOUTUBE_CREATE_TABLE,
+    YOUTUBE_CREATE_TIME_INDEXES,
+)
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path):
+    database = DatabaseExecutor(APSWConnectionWrapper(tmp_path / "Audio.db"))
+    yield database
+    await database.close()
+
+
+@pytest_asyncio.fixture
+async def youtube_api(tmp_path):
+    database = DatabaseExecutor(APSWConnectionWrapper(tmp_path / "Audio.db"))
+    await database.execute(YOUTUBE_CREATE_TABLE)
+    await database.execute(YOUTUBE_CREATE_TIME_INDEXES)
+    yield YouTubeTableWrapper(None, None, database, None)
+    await database.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_random_finds_a_sparse_recent_entry(youtube_api):
+    await youtube_api.database.executemany(
+        "INSERT INTO youtube (track_info, youtube_url, last_updated, last_fetched)"
+        " VALUES (?, ?, ?, ?)",
+        ((f"track {i}", f"url {i}", 100, 500 if i == 4321 else 1) for i in range(20000)),
+    )
+
+    for _ in range(5):
+        assert await youtube_api.fetch_random({"day": 10, "maxage": 50}) == "url 4321"
+    assert await youtube_api.fetch_random({"day": 1000, "maxage": 50}) is None
+
+
+@pytest.mark.asyncio
+async def test_negative_discard_drops_pending_and_evicted_entries(database):
+    await database.execute(NEGATIVE_CACHE_CREATE_TABLE)
+    negative = LocalCacheWrapper(None, None, database, None).negative
+
+    negative.add("lavalink", "pending", "NO_MATCHES")
+    negative.add("lavalink", "evicted", "NO_MATCHES")
+    await negative.write_queue.flush()
+    negative.front_cache.clear()
+    negative.add("lavalink", "pending", "NO_MATCHES")
+
+    await negative.discard("lavalink", "pending")
+    await negative.discard("lavalink", "evicted")
+    await negative.write_queue.flush()
+
+    assert negative.write_queue.pending == 0
+    assert await database.fetchall("SELECT query FROM negative_cache") == []
@@ -0,0 +1,96 @@
+import functools
+from base64 import b64encode
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import lavalink
+import pytest
+import pytest_asyncio
+
+from redbot.core.utils.dbtools import APSWConnectionWrapper
+
+from audio.apis.db_executor import DatabaseExecutor
+from audio.apis.persist_queue_wrapper import QueueInterface
+from audio.core.cog_utils import DataWriter
+from audio.core.events.cog import AudioEvents
+from audio.core.utilities.miscellaneous import MiscellaneousUtilities
+
+_GUILD_ID = 1
+_ROOM_ID = 2
+
+
+def _track(identifier: str) -> lavalink.Track:
+    track = lavalink.Track({"track": identifier, "info": {"title": identifier}})
+    track.extras = {"vc": _ROOM_ID, "requester": 3}
+    return track
+
+
+def _encoded_track(info: dict) -> str:
+    writer = DataWriter()
+    writer.write_byte(b"\x02")
+    writer.write_utf(info["title"])
+    writer.write_utf(info["author"])
+    writer.write_long(info["length"])
+    writer.write_utf(info["identifier"])
+    writer.write_boolean(info["isStream"])
+    writer.write_boolean(True)
+    writer.write_utf(info["uri"])
+    writer.write_utf(info["sourceName"])
+    writer.write_long(info["position"])
+    return b64encode(writer.finish()).decode()
+
+
+@pytest_asyncio.fixture
+async def queue_api(tmp_path):
+    database = DatabaseExecutor(APSWConnectionWrapper(tmp_path / "Audio.db"))
+    api = QueueInterface(
+        None,
+        None,
+        database,
+        SimpleNamespace(decode_track=functools.partial(MiscellaneousUtilities.decode_track, None)),
+    )
+    await api.init()
+    yield api
+    await database.close()
+
+
+@pytest.mark.asyncio
+async def test_tracks_enqueue_persists_every_track(queue_api):
+    cog = SimpleNamespace(
+        _persist_queue_cache={},
+        config=SimpleNamespace(
+            guild=lambda guild: SimpleNamespace(persist_queue=AsyncMock(return_value=True))
+        ),
+        api_interface=SimpleNamespace(persistent_queue_api=queue_api),
+    )
+    tracks = [_track("first"), _track("second")]
+
+    await AudioEvents.on_red_audio_tracks_enqueue(cog, SimpleNamespace(id=_GUILD_ID), tracks, None)
+
+    rows = await queue_api.fetch_guild(_GUILD_ID)
+    assert [row.track_id for row in rows] == ["first", "second"]
+    assert {row.room_id for row in rows} == {_ROOM_ID}
+
+
+@pytest.mark.asyncio
+async def test_restored_track_keeps_its_lavalink_info(queue_api):
+    info = {
+        "identifier": "dQw4w9WgXcQ",
+        "isSeekable": True,
+        "author": "Rick Astley",
+        "length": 212000,
+        "isStream": False,
+        "position": 0,
+        "title": "Never Gonna Give You Up",
+        "uri": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "sourceName": "youtube",
+    }
+    track = lavalink.Track({"track": _encoded_track(info), "info": info})
+    track.extras = {"vc": _ROOM_ID, "requester": 3}
+
+    await queue_api.enqueued_many(_GUILD_ID, [track])
+
+    (row,) = await queue_api.fetch_guild(_GUILD_ID)
+    assert row.track_object.track_identifier == track.track_identifier
+    assert row.track_object._info == info
+    assert row.track_object.extras["requester"] == 3
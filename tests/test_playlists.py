@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from redbot.core.utils.dbtools import APSWConnectionWrapper
+
+from audio.apis.db_executor import DatabaseExecutor
+from audio.apis.playlist_interface import create_playlist, get_all_playlist_converter
+from audio.apis.playlist_wrapper import PlaylistWrapper
+from audio.utils import PlaylistScope
+
+_GUILD_ID = 1
+
+
+def _track(identifier: str) -> dict:
+    return {"track": identifier, "info": {"title": identifier, "uri": f"https://{identifier}"}}
+
+
+_CONTEXT = SimpleNamespace(bot=None, guild=_GUILD_ID, message=SimpleNamespace(id=10))
+
+
+@pytest_asyncio.fixture
+async def playlist_api(tmp_path):
+    database = DatabaseExecutor(APSWConnectionWrapper(tmp_path / "Audio.db"))
+    api = PlaylistWrapper(None, None, database)
+    await api.init()
+    yield api
+    await database.close()
+
+
+@pytest.mark.asyncio
+async def test_matched_playlist_is_edited_without_reading_its_tracks(playlist_api):
+    await create_playlist(
+        _CONTEXT,
+        playlist_api,
+        PlaylistScope.GUILD.value,
+        "mix",
+        tracks=[_track("a"), _track("b"), _track("b")],
+        author=SimpleNamespace(id=2),
+        guild=_GUILD_ID,
+    )
+    (playlist,) = await get_all_playlist_converter(
+        PlaylistScope.GUILD.value, None, playlist_api, "mix", guild=_GUILD_ID, include_tracks=False
+    )
+
+    assert not playlist.tracks_loaded
+    assert await playlist.count_tracks() == 3
+    assert await playlist.existing_identifiers(["b", "c"]) == {"b"}
+    assert await playlist.remove_uri("https://b") == 2
+    assert await playlist.count_tracks() == 1
+
+    await playlist.load_tracks()
+    assert [track["track"] for track in playlist.tracks] == ["a"]
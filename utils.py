@@ -1,20 +1,46 @@
 import asyncio
 import contextlib
+import functools
 import logging
+import re
 import time
 
+from collections import Counter, OrderedDict, deque
 from enum import Enum, unique
 from pathlib import Path
-from typing import MutableMapping
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Final,
+    Hashable,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Union,
+)
 
 import discord
 
+from fuzzywuzzy import process
 from redbot.core import commands
 from redbot.core.i18n import Translator
 
 log = logging.getLogger("red.cogs.Audio.task.callback")
 _ = Translator("Audio", Path(__file__))
 
+_RE_SEARCH_TOKEN_SPLIT: Final[Pattern] = re.compile(r"[\W_]+")
+# Searches over more entries than this are scored in a worker thread.
+_SEARCH_OFFLOAD_THRESHOLD: Final[int] = 1000
+
 
 class CacheLevel:
     __slots__ = ("value",)
@@ -202,6 +228,285 @@ class Notifier:
             pass
 
 
+class LRUCache:
+    """A size-bounded least recently used mapping.
+
+    Entries are evicted once either ``max_entries`` or the approximate ``max_bytes``
+    given by the caller on :meth:`put` is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value stored for ``key`` and mark it as recently used."""
+        try:
+            value = self._data[key][0]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entries if needed."""
+        self.pop(key)
+        if self.max_bytes and size > self.max_bytes:
+            return
+        self._data[key] = (value, size)
+        self.size += size
+        while len(self._data) > self.max_entries or (
+            self.max_bytes and self.size > self.max_bytes
+        ):
+            self.size -= self._data.popitem(last=False)[1][1]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value."""
+        entry: Optional[Tuple[Any, int]] = self._data.pop(key, None)
+        if entry is None:
+            return default
+        self.size -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.size = 0
+
+
+def _trigrams(text: str) -> Set[str]:
+    grams = set()
+    for token in _RE_SEARCH_TOKEN_SPLIT.split(text.lower()):
+        if token:
+            token = f" {token} "
+            grams.update(token[i : i + 3] for i in range(len(token) - 2))
+    return grams
+
+
+class SearchIndex:
+    """A trigram inverted index for fuzzy searches.
+
+    Only the entries sharing a trigram with the query are scored, at most ``max_candidates``
+    of them, those sharing the most trigrams first.
+    A key added several times is kept until it has been discarded as many times.
+    """
+
+    def __init__(self, max_candidates: int = 500):
+        self.max_candidates = max_candidates
+        self._texts: Dict[Hashable, str] = {}
+        self._duplicates: Dict[Hashable, int] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._texts
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index ``text`` under ``key``."""
+        if key in self._texts:
+            self._duplicates[key] = self._duplicates.get(key, 0) + 1
+            return
+        self._texts[key] = text
+        for gram in _trigrams(text):
+            self._postings.setdefault(gram, set()).add(key)
+
+    def discard(self, key: Hashable) -> None:
+        """Remove ``key`` from the index if it is in it."""
+        if key in self._duplicates:
+            self._duplicates[key] -= 1
+            if not self._duplicates[key]:
+                del self._duplicates[key]
+            return
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        for gram in _trigrams(text):
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def clear(self) -> None:
+        self._texts.clear()
+        self._duplicates.clear()
+        self._postings.clear()
+
+    def candidates(self, query: str) -> List[Hashable]:
+        """The keys worth scoring for ``query``, most shared trigrams first."""
+        shared: Counter = Counter()
+        for gram in _trigrams(query):
+            # Copied first, the index can change while a search runs in a worker thread
+            shared.update(tuple(self._postings.get(gram, ())))
+        return [key for (key, count) in shared.most_common(self.max_candidates)]
+
+    def _search(
+        self, query: str, limit: int, score_cutoff: int
+    ) -> List[Tuple[Hashable, str, int]]:
+        choices = {}
+        for key in self.candidates(query):
+            text = self._texts.get(key)
+            if text is not None:
+                choices[key] = text
+        if not choices:
+            return []
+        results = process.extractBests(query, choices, score_cutoff=score_cutoff, limit=limit)
+        return [(key, text, score) for (text, score, key) in results]
+
+    async def search(
+        self, query: str, limit: int = 50, score_cutoff: int = 0
+    ) -> List[Tuple[Hashable, str, int]]:
+        """Return the key, text and score of the best matches for ``query``, best first."""
+        if len(self) <= _SEARCH_OFFLOAD_THRESHOLD:
+            return self._search(query, limit, score_cutoff)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self._search, query, limit, score_cutoff)
+        )
+
+
+class TrackQueue(list):
+    """A player queue that keeps running totals of the tracks in it.
+
+    ``duration`` is the total length of the non-stream tracks,
+    ``streams`` the number of streams and ``requesters`` the number of tracks per requester.
+    ``search_index`` is only built by the first search of the queue.
+    """
+
+    __slots__ = ("duration", "streams", "requesters", "search_index", "_describe")
+
+    def __init__(self, tracks: Iterable = ()):
+        super().__init__(tracks)
+        self.duration = 0
+        self.streams = 0
+        self.requesters: Counter = Counter()
+        self.search_index: Optional[SearchIndex] = None
+        self._describe: Optional[Callable[[Any], str]] = None
+        for track in self:
+            self._added(track)
+
+    def _added(self, track: Any) -> None:
+        if track.is_stream:
+            self.streams += 1
+        else:
+            self.duration += track.length
+        self.requesters[track.requester] += 1
+        if self.search_index is not None:
+            self.search_index.add(id(track), self._describe(track))
+
+    def _removed(self, track: Any) -> None:
+        if track.is_stream:
+            self.streams -= 1
+        else:
+            self.duration -= track.length
+        self.requesters[track.requester] -= 1
+        if self.requesters[track.requester] <= 0:
+            del self.requesters[track.requester]
+        if self.search_index is not None:
+            self.search_index.discard(id(track))
+
+    def get_search_index(self, describe: Callable[[Any], str]) -> SearchIndex:
+        """Return the search index of the queue, keyed by ``id(track)``.
+
+        It is built with ``describe`` the first time, then kept up to date as the queue changes.
+        """
+        if self.search_index is None:
+            self._describe = describe
+            self.search_index = SearchIndex()
+            for track in self:
+                self.search_index.add(id(track), describe(track))
+        return self.search_index
+
+    def append(self, track: Any) -> None:
+        super().append(track)
+        self._added(track)
+
+    def extend(self, tracks: Iterable) -> None:
+        tracks = list(tracks)
+        super().extend(tracks)
+        for track in tracks:
+            self._added(track)
+
+    def insert(self, index: int, track: Any) -> None:
+        super().insert(index, track)
+        self._added(track)
+
+    def pop(self, index: int = -1) -> Any:
+        track = super().pop(index)
+        self._removed(track)
+        return track
+
+    def remove(self, track: Any) -> None:
+        super().remove(track)
+        self._removed(track)
+
+    def clear(self) -> None:
+        super().clear()
+        self.duration = 0
+        self.streams = 0
+        self.requesters.clear()
+        if self.search_index is not None:
+            self.search_index.clear()
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            old = self[index]
+            value = list(value)
+        else:
+            old = [self[index]]
+        super().__setitem__(index, value)
+        for track in old:
+            self._removed(track)
+        for track in value if isinstance(index, slice) else [value]:
+            self._added(track)
+
+    def __delitem__(self, index) -> None:
+        old = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for track in old:
+            self._removed(track)
+
+    def __iadd__(self, tracks: Iterable) -> "TrackQueue":
+        self.extend(tracks)
+        return self
+
+    def __imul__(self, n: int) -> "TrackQueue":
+        if n <= 0:
+            self.clear()
+        else:
+            self.extend(list(self) * (n - 1))
+        return self
+
+
+def get_track_queue(player: Any) -> TrackQueue:
+    """Return the queue of ``player`` as a :class:`TrackQueue`.
+
+    Lavalink replaces the queue with a plain list when the player stops or shuffles,
+    in that case the totals are rebuilt once here.
+    """
+    if not isinstance(player.queue, TrackQueue):
+        player.queue = TrackQueue(player.queue)
+    return player.queue
+
+
 @unique
 class PlaylistScope(Enum):
     GLOBAL = "GLOBALPLAYLIST"
@@ -216,6 +521,47 @@ class PlaylistScope(Enum):
         return list(map(lambda c: c.value, PlaylistScope))
 
 
+async def ordered_map(
+    func: Callable[[Any], Awaitable[Any]], items: Union[Iterable, AsyncIterable], limit: int
+) -> AsyncIterator[Any]:
+    """Yield ``await func(item)`` for each item in order, running up to ``limit`` calls at once.
+
+    ``items`` may be an async iterable, it is only advanced when a call slot frees up.
+    Calls that are still pending are cancelled once the generator is closed.
+    """
+    if isinstance(items, AsyncIterable):
+        iterator = items.__aiter__()
+    else:
+        iterator = _aiter(items)
+    pending: Deque[asyncio.Task] = deque()
+
+    async def fill() -> None:
+        while len(pending) < max(1, limit):
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            pending.append(asyncio.create_task(func(item)))
+
+    try:
+        await fill()
+        while pending:
+            result = await pending.popleft()
+            await fill()
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
+async def _aiter(items: Iterable) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
 def task_callback(task: asyncio.Task) -> None:
     with contextlib.suppress(asyncio.CancelledError, asyncio.InvalidStateError):
         if exc := task.exception():